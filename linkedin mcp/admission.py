@@ -0,0 +1,156 @@
+"""
+Admission control for extractions started by the HTTP server.
+At most `max_concurrent` extractions run at once, whatever number of browser pages the
+extractor may open for them. Requests beyond that wait in a bounded FIFO queue. When the queue
+is full, or a request has waited too long, it is refused at once with ServerBusy and a hint
+of when to retry. A burst therefore can't start an unbounded number of Chromium fallbacks.
+"""
+
+import asyncio
+import collections
+import contextlib
+import logging
+import math
+import time
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Extractions running at once (each may use a browser page from the extractor's own pool)
+DEFAULT_MAX_CONCURRENT_EXTRACTIONS = 8
+
+# Requests waiting for a slot; further ones are refused straight away
+DEFAULT_MAX_QUEUED_EXTRACTIONS = 32
+
+# Longest a request waits for a slot before it is refused
+DEFAULT_QUEUE_WAIT = 10.0
+
+# JSON-RPC error code for a refused request (implementation-defined server error range)
+SERVER_BUSY = -32000
+
+# Assumed extraction time for the retry hint until real ones have been measured
+_INITIAL_HOLD_ESTIMATE = 5.0
+
+# Weight of the newest sample in the moving average of slot hold times
+_HOLD_SMOOTHING = 0.2
+
+
+class ServerBusy(Exception):
+    """Raised when a request is refused; `retry_after` is a suggested wait in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    A weighted semaphore with a bounded FIFO wait queue and load shedding.
+
+    A request holding `weight` slots counts as that many extractions (a batch tool call with
+    concurrency 4 takes 4). Waiters are served strictly in order, so a large request at the
+    head isn't starved by small ones behind it.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_EXTRACTIONS,
+        max_queued: int = DEFAULT_MAX_QUEUED_EXTRACTIONS,
+        queue_wait: float = DEFAULT_QUEUE_WAIT,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max(0, max_queued)
+        self.queue_wait = queue_wait
+        self.active = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = collections.deque()
+        self._hold_estimate = _INITIAL_HOLD_ESTIMATE
+        self.peak_queued = 0
+        self.stats = {"admitted": 0, "waited": 0, "rejected_queue_full": 0, "rejected_wait_timeout": 0}
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to be free, from the queue ahead and recent extraction times."""
+        rounds = (len(self._waiters) + 1) / self.max_concurrent
+        return max(1, math.ceil(self._hold_estimate * rounds))
+
+    def _reject(self, reason: str, message: str) -> ServerBusy:
+        self.stats[reason] += 1
+        retry_after = self.retry_after()
+        logger.warning(f"Refusing extraction ({message}); retry in {retry_after}s")
+        return ServerBusy(message, retry_after)
+
+    def _wake(self):
+        """Hand freed slots to waiters at the head of the queue, in order."""
+        while self._waiters and self.active + self._waiters[0][0] <= self.max_concurrent:
+            weight, future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.active += weight
+            future.set_result(None)
+
+    async def _acquire(self, weight: int, shed: bool, wait_limit: Optional[float]):
+        if not self._waiters and self.active + weight <= self.max_concurrent:
+            self.active += weight
+            return
+        if shed and len(self._waiters) >= self.max_queued:
+            raise self._reject(
+                "rejected_queue_full", f"{self.active} extractions running and {len(self._waiters)} waiting"
+            )
+
+        entry = (weight, asyncio.get_running_loop().create_future())
+        self._waiters.append(entry)
+        self.peak_queued = max(self.peak_queued, len(self._waiters))
+        self.stats["waited"] += 1
+        if shed:
+            wait_limit = self.queue_wait if wait_limit is None else min(wait_limit, self.queue_wait)
+        try:
+            await asyncio.wait_for(entry[1], wait_limit)
+        except BaseException as e:
+            if entry[1].done() and not entry[1].cancelled():
+                # The slot was granted just as the wait ended
+                self._release(weight)
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                # Whoever queued behind this request may fit now
+                self._wake()
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("rejected_wait_timeout", f"no extraction slot free within {wait_limit:g}s")
+            raise
+
+    def _release(self, weight: int):
+        self.active -= weight
+        self._wake()
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, weight: int = 1, shed: bool = True, wait_limit: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold `weight` extraction slots for the duration of the block.
+
+        With `shed` (the default), raise ServerBusy instead of queueing behind `max_queued`
+        waiters or waiting longer than `queue_wait` (or `wait_limit`, if shorter). Without
+        it, wait as long as it takes; background jobs use this, as they are already bounded
+        by their own queue.
+        """
+        weight = min(max(1, weight), self.max_concurrent)
+        await self._acquire(weight, shed, wait_limit)
+        self.stats["admitted"] += 1
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._hold_estimate += _HOLD_SMOOTHING * (time.monotonic() - started - self._hold_estimate)
+            self._release(weight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return slot usage, queue depth and rejection counters for monitoring."""
+        return {
+            **self.stats,
+            "rejected": self.stats["rejected_queue_full"] + self.stats["rejected_wait_timeout"],
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "active": self.active,
+            "queued": len(self._waiters),
+            "peak_queued": self.peak_queued,
+            "retry_after_s": self.retry_after(),
+        }
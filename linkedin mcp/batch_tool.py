@@ -0,0 +1,158 @@
+"""
+The get_linkedin_posts_batch MCP tool, shared by the HTTP and stdio servers.
+Extracts several posts concurrently, reports progress as each one finishes and returns one
+compact combined result in which a failing URL is just a failed entry.
+"""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from deadline import parse_timeout
+from linkedin_extractor import DEFAULT_BATCH_CONCURRENCY, LinkedInExtractor
+from serialization import parse_pretty
+
+logger = logging.getLogger(__name__)
+
+BATCH_TOOL_NAME = "get_linkedin_posts_batch"
+
+# Upper bounds on one tool call, so a single request can't queue an unbounded crawl
+MAX_BATCH_URLS = 50
+MAX_BATCH_CONCURRENCY = 8
+
+# Result fields worth returning per post; absent or null ones are left out
+_POST_FIELDS = ("url", "success", "text", "link", "link_img", "error", "timed_out")
+
+BATCH_TOOL_SCHEMA = {
+    "name": BATCH_TOOL_NAME,
+    "description": (
+        "Extract text content from several LinkedIn post URLs concurrently. Sends progress "
+        "notifications as each post finishes; a URL that fails is reported in its own entry "
+        "without failing the call"
+    ),
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "urls": {
+                "type": "array",
+                "items": {"type": "string"},
+                "minItems": 1,
+                "maxItems": MAX_BATCH_URLS,
+                "description": "LinkedIn post URLs to extract text from"
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1,
+                "maximum": MAX_BATCH_CONCURRENCY,
+                "description": f"Posts extracted at once (default {DEFAULT_BATCH_CONCURRENCY})"
+            },
+            "timeout": {
+                "type": "number",
+                "description": "Time budget in seconds for each post (default 50), counted from when its extraction starts"
+            },
+            "pretty": {
+                "type": "boolean",
+                "description": "Indent the JSON result (default false: compact)"
+            }
+        },
+        "required": ["urls"]
+    }
+}
+
+# Called with (completed, total, message) after each post finishes
+ProgressCallback = Callable[[int, int, str], Awaitable[None]]
+
+# Sends a server-initiated message (e.g. a progress notification) to the client
+Notify = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def parse_batch_arguments(arguments: Dict[str, Any]) -> Tuple[List[str], int, Optional[float], bool]:
+    """
+    Validate the tool arguments.
+
+    Returns:
+        (urls, concurrency, timeout, pretty)
+
+    Raises:
+        ValueError: if an argument is missing or invalid
+    """
+    urls = arguments.get("urls")
+    if not isinstance(urls, list) or not urls or not all(isinstance(url, str) and url for url in urls):
+        raise ValueError("urls must be a non-empty list of URLs")
+    if len(urls) > MAX_BATCH_URLS:
+        raise ValueError(f"at most {MAX_BATCH_URLS} urls per call")
+
+    concurrency = arguments.get("concurrency", DEFAULT_BATCH_CONCURRENCY)
+    if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+        raise ValueError("concurrency must be a positive integer")
+
+    timeout = parse_timeout(arguments.get("timeout"))
+    pretty = parse_pretty(arguments.get("pretty"))
+    return urls, min(concurrency, MAX_BATCH_CONCURRENCY), timeout, pretty
+
+
+def compact_post(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the populated fields of one extraction result."""
+    return {
+        field: result[field] for field in _POST_FIELDS
+        if result.get(field) is not None and not (field == "timed_out" and not result[field])
+    }
+
+
+async def run_batch_tool(
+    extractor: LinkedInExtractor,
+    urls: List[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    timeout: Optional[float] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    Extract `urls` concurrently and combine the results.
+
+    Returns:
+        {"total", "succeeded", "failed", "posts"} where posts are in the order of `urls`
+    """
+    posts: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+    completed = 0
+    async for index, result in extractor.iter_extract_many(urls, concurrency, timeout):
+        posts[index] = compact_post(result)
+        completed += 1
+        if on_progress is not None:
+            status = "ok" if result.get("success") else "failed"
+            try:
+                await on_progress(completed, len(urls), f"{urls[index]}: {status}")
+            except Exception as e:
+                # A client that stopped listening shouldn't cost the remaining posts
+                logger.debug(f"Failed to send progress notification: {e}")
+
+    succeeded = sum(1 for post in posts if post.get("success"))
+    return {
+        "total": len(urls),
+        "succeeded": succeeded,
+        "failed": len(urls) - succeeded,
+        "posts": posts,
+    }
+
+
+def progress_notification(progress_token: Any, completed: int, total: int, message: str) -> Dict[str, Any]:
+    """Build an MCP notifications/progress message."""
+    return {
+        "jsonrpc": "2.0",
+        "method": "notifications/progress",
+        "params": {
+            "progressToken": progress_token,
+            "progress": completed,
+            "total": total,
+            "message": message
+        }
+    }
+
+
+def progress_reporter(progress_token: Any, notify: Optional[Notify]) -> Optional[ProgressCallback]:
+    """Return a callback that sends progress notifications, or None if the client didn't ask for them."""
+    if progress_token is None or notify is None:
+        return None
+
+    async def report(completed: int, total: int, message: str):
+        await notify(progress_notification(progress_token, completed, total, message))
+
+    return report
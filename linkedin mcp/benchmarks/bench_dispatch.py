@@ -0,0 +1,102 @@
+"""
+Benchmark: per-request dispatch overhead of the MCP server adapters.
+
+Sends `initialize`, `list_tools` and a `call_tool` for get_linkedin_post_text (against a stub
+extractor that answers instantly, so only protocol handling is measured) through:
+
+- stdio: LinkedInMCPStdioServer.handle_request, plus encoding of the response with its serializer
+- http:  POST /mcp on LinkedInMCPServer's FastAPI app over an in-process ASGI transport
+
+Reports the mean microseconds per request for each method and adapter.
+
+Usage:
+    python benchmarks/bench_dispatch.py [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import httpx  # noqa: E402
+
+from linkedin_extractor import LinkedInExtractor  # noqa: E402
+from mcp_server import LinkedInMCPServer  # noqa: E402
+from mcp_stdio_server import LinkedInMCPStdioServer  # noqa: E402
+
+POST_URL = "https://www.linkedin.com/posts/someone_activity-1234567890123456789-abcd"
+
+REQUESTS = {
+    "initialize": {"jsonrpc": "2.0", "id": 1, "method": "initialize"},
+    "list_tools": {"jsonrpc": "2.0", "id": 2, "method": "list_tools"},
+    "call_tool": {"jsonrpc": "2.0", "id": 3, "method": "call_tool",
+                  "params": {"name": "get_linkedin_post_text", "arguments": {"url": POST_URL}}},
+}
+
+
+async def stub_extract(url, timeout=None):
+    return {"url": url, "text": "Post text " * 50, "link": None, "image": None, "success": True}
+
+
+async def stub_server(server_class):
+    server = server_class()
+    await server.extractor.aclose()
+    server.extractor = LinkedInExtractor(cache_path=None)
+    server.extractor.extract_post_text = stub_extract
+    return server
+
+
+async def bench_stdio(server, request, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        server.core.serializer.dumps_bytes(await server.handle_request(request))
+    return (time.perf_counter() - start) / count
+
+
+async def bench_http(client, request, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        response = await client.post("/mcp", json=request)
+        response.raise_for_status()
+    return (time.perf_counter() - start) / count
+
+
+async def run(count: int):
+    stdio_server = await stub_server(LinkedInMCPStdioServer)
+    http_server = await stub_server(LinkedInMCPServer)
+    transport = httpx.ASGITransport(app=http_server.app)
+    rows = []
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, request in REQUESTS.items():
+                # Warm up both paths before timing
+                await bench_stdio(stdio_server, request, 50)
+                await bench_http(client, request, 50)
+                stdio = await bench_stdio(stdio_server, request, count)
+                http = await bench_http(client, request, max(1, count // 10))
+                rows.append((name, stdio * 1e6, http * 1e6))
+    finally:
+        await stdio_server.extractor.aclose()
+        await http_server.extractor.aclose()
+
+    print(f"{count} requests per method over stdio, {max(1, count // 10)} over HTTP")
+    print(f"{'method':<14}{'stdio us':>10}{'http us':>10}")
+    for name, stdio, http in rows:
+        print(f"{name:<14}{stdio:>10.1f}{http:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per method (HTTP sends a tenth)')
+    args = parser.parse_args()
+    # Per-request INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
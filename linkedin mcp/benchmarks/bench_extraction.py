@@ -0,0 +1,196 @@
+"""
+Benchmark: per-page parse + extract time, legacy soup.select sweeps vs the compiled single-pass plan.
+
+For every page, parses the HTML with BeautifulSoup('html.parser') and extracts the post
+text, link and image twice: once with the previous implementation (up to 7 soup.select
+calls per field, reproduced below) and once with extraction_plan.POST_PLAN. Results are
+checked for equality before timings are reported.
+
+Usage:
+    python benchmarks/bench_extraction.py [--pages DIR] [--repeat 5]
+
+DIR is a directory of saved LinkedIn post pages (*.html); synthetic pages are used if omitted.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from extraction_plan import POST_PLAN  # noqa: E402
+from linkedin_fixture import load_pages  # noqa: E402
+
+
+# --- Previous implementation (one soup.select sweep per selector) ---------------------
+
+def legacy_text(soup: BeautifulSoup) -> Optional[str]:
+    """Extract post text from BeautifulSoup object."""
+    # Common selectors for LinkedIn post content
+    selectors = [
+        '[data-test-id="main-feed-activity-card"] .feed-shared-text',
+        '.feed-shared-text',
+        '.feed-shared-update-v2__commentary',
+        '.attributed-text-segment-list__content',
+        '.break-words span[dir="ltr"]',
+        'div[data-test-id="main-feed-activity-card"] div.break-words',
+    ]
+
+    for selector in selectors:
+        elements = soup.select(selector)
+        if elements:
+            # Extract text from all matching elements and join
+            text_parts = []
+            for element in elements:
+                text = element.get_text(strip=True)
+                if text and len(text) > 10:  # Filter out very short text snippets
+                    text_parts.append(text)
+
+            if text_parts:
+                full_text = ' '.join(text_parts)
+                # Clean up extra whitespace
+                full_text = re.sub(r'\s+', ' ', full_text).strip()
+                return full_text
+
+    return None
+
+
+def legacy_image(soup: BeautifulSoup) -> Optional[str]:
+    """Extract the first image from LinkedIn post content."""
+    # Look for images in post content areas
+    image_selectors = [
+        '[data-test-id="main-feed-activity-card"] img[src]',
+        '.feed-shared-image img[src]',
+        '.feed-shared-update-v2__content img[src]',
+        '.attributed-text-segment-list__content img[src]',
+        'div.break-words img[src]',
+        'img[src*="media-exp"]',  # LinkedIn media images
+        'img[src*="licdn.com"]',  # LinkedIn CDN images
+    ]
+
+    for selector in image_selectors:
+        images = soup.select(selector)
+        for img in images:
+            src = img.get('src')
+            if src and src.startswith('http'):
+                # Skip profile pictures, icons, and very small images
+                skip_patterns = [
+                    'profile-displayphoto',
+                    'company-logo',
+                    'icon',
+                    'avatar',
+                    'emoji'
+                ]
+
+                if not any(pattern in src.lower() for pattern in skip_patterns):
+                    # Check if image has reasonable dimensions (avoid tiny icons)
+                    width = img.get('width')
+                    height = img.get('height')
+
+                    # Skip if we can determine it's too small
+                    if width and height:
+                        try:
+                            if int(width) < 100 or int(height) < 100:
+                                continue
+                        except (ValueError, TypeError):
+                            pass
+                    return src
+
+    return None
+
+
+def legacy_link(soup: BeautifulSoup) -> Optional[str]:
+    """Extract the first external link from BeautifulSoup object (unresolved)."""
+    found_links = []
+
+    # Look for links in post content areas
+    link_selectors = [
+        '[data-test-id="main-feed-activity-card"] a[href]',
+        '.feed-shared-text a[href]',
+        '.feed-shared-update-v2__commentary a[href]',
+        '.attributed-text-segment-list__content a[href]',
+        'div.break-words a[href]',
+        'a[href*="lnkd.in"]',  # LinkedIn shortened links (highest priority)
+        'a[href^="http"]',     # External links
+    ]
+
+    for selector in link_selectors:
+        links = soup.select(selector)
+        for link in links:
+            href = link.get('href')
+            if href:
+                # Clean up the link
+                href = href.strip()
+
+                # Skip LinkedIn internal links (profiles, companies, etc.)
+                skip_patterns = [
+                    '/in/', '/company/', '/school/',
+                    '/feed/', '/mynetwork/', '/jobs/',
+                    'linkedin.com/posts/', 'linkedin.com/pulse/',
+                    'linkedin.com/signup/', 'linkedin.com/login/',
+                    'linkedin.com/uas/', 'linkedin.com/reg/',
+                    'session_redirect', 'cold-join'
+                ]
+
+                # Prioritize LinkedIn shortened links (lnkd.in)
+                if 'lnkd.in' in href:
+                    return href
+
+                # Otherwise collect external links
+                if (href.startswith('http') and 
+                    not any(pattern in href for pattern in skip_patterns)):
+                    found_links.append(href)
+
+    # Return first external link if no lnkd.in link found
+    if found_links:
+        return found_links[0]
+
+    return None
+
+
+def legacy_extract(soup: BeautifulSoup):
+    return legacy_text(soup), legacy_link(soup), legacy_image(soup)
+
+
+# --- Benchmark ---------------------------------------------------------------------------
+
+def time_variant(html: bytes, extract, repeat: int):
+    """Return (median parse ms, median extract ms, result)."""
+    parse_times, extract_times = [], []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soup = BeautifulSoup(html, 'html.parser')
+        parsed = time.perf_counter()
+        result = extract(soup)
+        done = time.perf_counter()
+        parse_times.append((parsed - start) * 1000)
+        extract_times.append((done - parsed) * 1000)
+    return statistics.median(parse_times), statistics.median(extract_times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', help='Directory of saved LinkedIn post pages (*.html)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per page (median is reported)')
+    args = parser.parse_args()
+
+    print(f"{'page':<22}{'KB':>7}{'parse ms':>10}{'legacy extract ms':>19}{'plan extract ms':>17}{'speedup':>9}")
+    for name, html in load_pages(args.pages):
+        parse_ms, legacy_ms, legacy_result = time_variant(html, legacy_extract, args.repeat)
+        _, plan_ms, plan_result = time_variant(html, POST_PLAN.extract, args.repeat)
+        if legacy_result != plan_result:
+            print(f"{name}: RESULT MISMATCH legacy={legacy_result!r} plan={plan_result!r}")
+            sys.exit(1)
+        print(f"{name:<22}{len(html) / 1024:>7.0f}{parse_ms:>10.1f}{legacy_ms:>19.1f}{plan_ms:>17.1f}"
+              f"{legacy_ms / plan_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
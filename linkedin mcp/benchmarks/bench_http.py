@@ -0,0 +1,132 @@
+"""
+Benchmark: concurrent redirect resolution, blocking requests.Session vs the async HTTP client.
+
+Starts a local HTTP server whose /hop/<n> endpoint waits DELAY seconds and then
+redirects to /final, and resolves N such links concurrently on one event loop:
+
+- before: the previous implementation, a blocking requests.Session.head() call inside
+  an async function (every call stalls the loop, so the "concurrent" batch runs serially)
+- after:  LinkedInExtractor._resolve_linkedin_redirect() on the pooled async client
+
+Also reports the longest event-loop stall seen by a 10 ms heartbeat task.
+
+Usage:
+    python benchmarks/bench_http.py [--requests 20] [--delay 0.2]
+
+The "before" column needs the `requests` package (pip install requests).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linkedin_extractor import LinkedInExtractor  # noqa: E402
+
+
+class SlowRedirectHandler(BaseHTTPRequestHandler):
+    """Redirects /hop/* to /final after a fixed delay."""
+
+    delay = 0.2
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self, send_body: bool):
+        if self.path.startswith('/hop/'):
+            time.sleep(self.delay)
+            self.send_response(302)
+            self.send_header('Location', '/final')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            body = b'ok'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BenchServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog large enough for the concurrent burst."""
+
+    request_queue_size = 128
+    daemon_threads = True
+
+
+async def measure(resolve, urls):
+    """Resolve all URLs concurrently; return (elapsed seconds, max loop stall seconds)."""
+    max_stall = 0.0
+    done = False
+
+    async def heartbeat():
+        nonlocal max_stall
+        while not done:
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_stall = max(max_stall, time.perf_counter() - before - 0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*(resolve(url) for url in urls))
+    elapsed = time.perf_counter() - start
+    done = True
+    await beat
+    return elapsed, max_stall
+
+
+async def run(count: int, delay: float):
+    SlowRedirectHandler.delay = delay
+    server = BenchServer(('127.0.0.1', 0), SlowRedirectHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/hop/{i}" for i in range(count)]
+
+    rows = []
+    try:
+        import requests
+
+        session = requests.Session()
+
+        async def blocking_resolve(url):
+            return session.head(url, allow_redirects=True, timeout=15).url
+
+        rows.append(("before (requests.Session)",) + await measure(blocking_resolve, urls))
+    except ImportError:
+        print("requests is not installed; skipping the 'before' measurement")
+
+    # No persistent cache, so every run measures real resolutions
+    extractor = LinkedInExtractor(cache_path=None)
+    rows.append(("after (async client)",) + await measure(extractor._resolve_linkedin_redirect, urls))
+    await extractor.aclose()
+    server.shutdown()
+
+    print(f"{count} concurrent redirect resolutions, {delay * 1000:.0f} ms server delay each")
+    print(f"{'variant':<28}{'total s':>10}{'req/s':>10}{'max loop stall ms':>20}")
+    for name, elapsed, stall in rows:
+        print(f"{name:<28}{elapsed:>10.2f}{count / elapsed:>10.1f}{stall * 1000:>20.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20, help='Number of concurrent resolutions')
+    parser.add_argument('--delay', type=float, default=0.2, help='Server-side delay per request (seconds)')
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: parse time and peak memory per HTML parser backend.
+
+For every installed backend (html.parser, lxml, selectolax) parses each page both as a
+whole and restricted to the content region (strip_non_content), then runs the extraction
+plan. Reports median parse/extract time and the peak Python memory seen by tracemalloc
+while parsing, and flags pages where a backend extracts something different from
+html.parser on the full page.
+
+tracemalloc only sees Python allocations: selectolax keeps its tree in C memory, so its
+peak mostly reflects the decoded input string.
+
+Usage:
+    python benchmarks/bench_parsers.py [--pages DIR] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from extraction_plan import POST_PLAN  # noqa: E402
+from html_parsers import available_backends, parse_html, strip_non_content  # noqa: E402
+from linkedin_fixture import load_pages  # noqa: E402
+
+
+def measure(html: bytes, backend: str, repeat: int):
+    """Return (median parse ms, median extract ms, peak KB, extraction result)."""
+    parse_times, extract_times = [], []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        document, tree = parse_html(html, backend)
+        parsed = time.perf_counter()
+        result = POST_PLAN.extract(document, tree)
+        extract_times.append((time.perf_counter() - parsed) * 1000)
+        parse_times.append((parsed - start) * 1000)
+        del document
+
+    tracemalloc.start()
+    parse_html(html, backend)
+    peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return statistics.median(parse_times), statistics.median(extract_times), peak_kb, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', help='Directory of saved LinkedIn post pages (*.html)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per page (median is reported)')
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    backends = available_backends()
+    totals = {}
+    mismatches = []
+
+    for name, html in pages:
+        content = strip_non_content(html)
+        _, _, _, reference = measure(html, 'html.parser', 1)
+        for backend in backends:
+            for region, data in (('full page', html), ('content only', content)):
+                parse_ms, extract_ms, peak_kb, result = measure(data, backend, args.repeat)
+                row = totals.setdefault((backend, region), {'parse': [], 'extract': [], 'peak': [], 'kb': []})
+                row['parse'].append(parse_ms)
+                row['extract'].append(extract_ms)
+                row['peak'].append(peak_kb)
+                row['kb'].append(len(data) / 1024)
+                if result != reference:
+                    mismatches.append(f"{name} [{backend}, {region}]: {result!r} != {reference!r}")
+
+    print(f"{len(pages)} pages, median of {args.repeat} runs each")
+    print(f"{'backend':<13}{'input':<14}{'avg KB':>8}{'parse ms':>10}{'extract ms':>12}{'peak MB':>9}")
+    for (backend, region), row in totals.items():
+        print(f"{backend:<13}{region:<14}{statistics.mean(row['kb']):>8.0f}"
+              f"{statistics.mean(row['parse']):>10.1f}{statistics.mean(row['extract']):>12.1f}"
+              f"{max(row['peak']) / 1024:>9.1f}")
+
+    if mismatches:
+        print("\nResults that differ from html.parser on the full page:")
+        for line in mismatches:
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: cost of encoding a get_linkedin_post_text tool response with a long Hebrew post body.
+
+The post text in output.json is repeated to make bodies of increasing length. Each one is
+wrapped in a tools/call response and encoded the way a server writes it to the client:
+
+- before:  the result as indented JSON text, then the response with json.dumps defaults
+           (every non-ASCII character escaped as \\uXXXX, each one again inside the text)
+- json:    serialization.StdlibSerializer, compact UTF-8
+- orjson:  serialization.OrjsonSerializer, compact UTF-8 (skipped when orjson isn't installed)
+
+Reports microseconds per response and bytes written for each path.
+
+Usage:
+    python benchmarks/bench_serialization.py [--iterations 2000] [--repeats 1,4,16]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from serialization import OrjsonSerializer, StdlibSerializer  # noqa: E402
+
+
+def load_post() -> dict:
+    with open(os.path.join(ROOT, 'output.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def tool_response(text: str) -> dict:
+    return {"jsonrpc": "2.0", "id": 1, "result": {"content": [{"type": "text", "text": text}]}}
+
+
+def encode_before(result: dict) -> bytes:
+    return json.dumps(tool_response(json.dumps(result, indent=2))).encode('utf-8')
+
+
+def encoder_for(serializer):
+    def encode(result: dict) -> bytes:
+        return serializer.dumps_bytes(tool_response(serializer.dumps(result)))
+    return encode
+
+
+def time_encoder(encode, result: dict, iterations: int):
+    encode(result)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encoded = encode(result)
+    return (time.perf_counter() - start) / iterations, len(encoded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000, help='Encodings per body length and path')
+    parser.add_argument('--repeats', default='1,4,16', help='Comma-separated repetitions of the sample post text')
+    args = parser.parse_args()
+
+    encoders = {"before": encode_before, "json": encoder_for(StdlibSerializer())}
+    try:
+        encoders["orjson"] = encoder_for(OrjsonSerializer())
+    except ImportError:
+        print("orjson is not installed; skipping it")
+
+    post = load_post()
+    print(f"{args.iterations} encodings per row")
+    print(f"{'text chars':>10}  {'path':<8}{'us':>10}{'bytes':>10}")
+    for repeat in (int(r) for r in args.repeats.split(',')):
+        result = {**post, "text": "\n\n".join([post["text"]] * repeat)}
+        for name, encode in encoders.items():
+            seconds, size = time_encoder(encode, result, args.iterations)
+            print(f"{len(result['text']):>10}  {name:<8}{seconds * 1e6:>10.1f}{size:>10}")
+
+
+if __name__ == "__main__":
+    main()
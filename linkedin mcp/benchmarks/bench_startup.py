@@ -0,0 +1,91 @@
+"""
+Benchmark: cold start of the stdio MCP servers, measured as time to the first `initialize` response.
+
+Spawns each stdio entry point several times, sends `initialize` as soon as the process is
+started and times how long the response takes, the way an IDE does at the start of every
+session. Also lists which heavy dependencies the server had imported by then: none of them
+should be needed before the first extraction.
+
+With --max-ms the script exits with status 1 when an entry point's median start time is
+above the limit, so it can guard against regressions in CI.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--max-ms 500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+ENTRY_POINTS = ('mcp_stdio_server.py', 'mcp_server.py')
+
+# Imported on the first extraction (or HTTP request), never just to answer `initialize`
+HEAVY_MODULES = ('playwright', 'bs4', 'lxml', 'selectolax', 'httpx', 'fastapi', 'uvicorn', 'pydantic')
+
+INITIALIZE = json.dumps({"jsonrpc": "2.0", "id": 1, "method": "initialize"}) + '\n'
+
+# Prints the heavy modules loaded so far to stderr when the interpreter exits
+_MODULE_REPORT = (
+    "import atexit, sys; atexit.register(lambda: print('LOADED ' + ','.join("
+    f"m for m in {HEAVY_MODULES!r} if m in sys.modules), file=sys.stderr))"
+)
+
+
+def time_to_initialize(script: str):
+    """Start `script`, send initialize and return (ms until the response, heavy modules loaded)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-c', f"{_MODULE_REPORT}; import runpy; runpy.run_path({script!r}, run_name='__main__')"],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    proc.stdin.write(INITIALIZE)
+    proc.stdin.flush()
+    response = json.loads(proc.stdout.readline())
+    elapsed = (time.perf_counter() - start) * 1000
+    assert response.get("id") == 1 and "result" in response, response
+
+    # End of input shuts the server down, which triggers the module report
+    _, stderr = proc.communicate(timeout=30)
+    loaded = next(
+        (line[len('LOADED '):].split(',') for line in stderr.splitlines() if line.startswith('LOADED ')),
+        [],
+    )
+    return elapsed, [module for module in loaded if module]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Cold starts per entry point')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Fail when an entry point\'s median time to initialize exceeds this')
+    args = parser.parse_args()
+
+    print(f"{args.runs} cold starts per entry point")
+    print(f"{'entry point':<22}{'median ms':>10}{'min ms':>10}  heavy modules loaded")
+    failed = False
+    for script in ENTRY_POINTS:
+        times, loaded = [], set()
+        for _ in range(args.runs):
+            elapsed, modules = time_to_initialize(script)
+            times.append(elapsed)
+            loaded.update(modules)
+        median = statistics.median(times)
+        print(f"{script:<22}{median:>10.0f}{min(times):>10.0f}  {', '.join(sorted(loaded)) or '-'}")
+        if args.max_ms is not None and median > args.max_ms:
+            print(f"  FAIL: median {median:.0f} ms is above the {args.max_ms:.0f} ms limit")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: stdio transport throughput and latency for small control messages.
+
+Spawns mcp_stdio_server.py once per transport and talks to it over real pipes:
+
+- thread: the previous design, blocking stdin.readline() in a one-thread executor
+- pipes:  stdin/stdout attached to the event loop with connect_read_pipe/connect_write_pipe
+
+Two workloads of `tools/list` requests (no network access involved):
+
+- pipelined: all requests written up front, reports messages per second
+- ping-pong: one request at a time, reports median and p99 round-trip latency
+
+Usage:
+    python benchmarks/bench_stdio.py [--messages 2000] [--round-trips 500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'mcp_stdio_server.py')
+
+
+def request(request_id: int) -> bytes:
+    return (json.dumps({"jsonrpc": "2.0", "id": request_id, "method": "tools/list"}) + '\n').encode('utf-8')
+
+
+def start_server(transport: str) -> subprocess.Popen:
+    env = dict(os.environ, LINKEDIN_MCP_STDIO_TRANSPORT=transport)
+    return subprocess.Popen(
+        [sys.executable, SERVER],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+    )
+
+
+def round_trip(proc: subprocess.Popen, request_id: int) -> float:
+    start = time.perf_counter()
+    proc.stdin.write(request(request_id))
+    proc.stdin.flush()
+    response = json.loads(proc.stdout.readline())
+    elapsed = time.perf_counter() - start
+    assert response["id"] == request_id, response
+    return elapsed
+
+
+def pipelined(proc: subprocess.Popen, count: int, first_id: int) -> float:
+    """Write `count` requests from a thread while reading responses; return messages per second."""
+    def write_all():
+        proc.stdin.write(b''.join(request(first_id + i) for i in range(count)))
+        proc.stdin.flush()
+
+    start = time.perf_counter()
+    writer = threading.Thread(target=write_all)
+    writer.start()
+    for _ in range(count):
+        json.loads(proc.stdout.readline())
+    elapsed = time.perf_counter() - start
+    writer.join()
+    return count / elapsed
+
+
+def bench(transport: str, messages: int, round_trips: int):
+    proc = start_server(transport)
+    try:
+        # Warm up: server start-up and imports are not part of the measurement
+        for i in range(20):
+            round_trip(proc, i)
+        latencies = sorted(round_trip(proc, 100 + i) * 1000 for i in range(round_trips))
+        rate = pipelined(proc, messages, 100 + round_trips)
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=30)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return rate, statistics.median(latencies), p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=2000, help='Requests in the pipelined run')
+    parser.add_argument('--round-trips', type=int, default=500, help='Requests in the ping-pong run')
+    args = parser.parse_args()
+
+    print(f"{args.messages} pipelined / {args.round_trips} ping-pong tools/list requests")
+    print(f"{'transport':<12}{'msgs/s':>10}{'median ms':>12}{'p99 ms':>10}")
+    for transport in ('thread', 'pipes'):
+        rate, median, p99 = bench(transport, args.messages, args.round_trips)
+        print(f"{transport:<12}{rate:>10.0f}{median:>12.3f}{p99:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark: full download vs streaming fetch with early termination.
+
+Starts a local HTTP server that serves synthetic post pages (/posts/<n>) and lnkd.in-style
+interstitial pages (/short/<n>) in 8 KB writes at a throttled rate, then fetches each
+page twice:
+
+- before: read the complete body, then extract (the previous behaviour)
+- after:  LinkedInExtractor's streaming fetch, which closes the response as soon as the
+  <head> metadata is complete (post pages) or the first YouTube ID is seen (interstitials)
+
+Reports bytes read and median time-to-result per page type.
+
+Usage:
+    python benchmarks/bench_streaming.py [--pages 5] [--rate-kb 2000]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from linkedin_extractor import LinkedInExtractor  # noqa: E402
+from linkedin_fixture import make_post_page  # noqa: E402
+from page_metadata import HeadScanner  # noqa: E402
+
+WRITE_SIZE = 8192
+
+
+def make_interstitial(index: int) -> bytes:
+    """An lnkd.in-style page: the target URL near the top, followed by a large script bundle."""
+    bundle = ''.join(f'var m{i}="{"x" * 60}";' for i in range(4000))
+    return (
+        '<!DOCTYPE html><html><head><title>LinkedIn</title></head><body>'
+        f'<a class="artdeco-button" href="https://www.youtube.com/watch?v=vid{index:08d}">Continue</a>'
+        f'<script>{bundle}</script></body></html>'
+    ).encode('utf-8')
+
+
+class ThrottledHandler(BaseHTTPRequestHandler):
+    """Serves pre-built pages in fixed-size writes at a limited rate."""
+
+    pages = {}
+    rate = 2000 * 1024  # bytes per second
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = self.pages.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            for offset in range(0, len(body), WRITE_SIZE):
+                self.wfile.write(body[offset:offset + WRITE_SIZE])
+                self.wfile.flush()
+                time.sleep(WRITE_SIZE / self.rate)
+        except (BrokenPipeError, ConnectionResetError):
+            # The streaming client hung up early
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BenchServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+async def full_post(extractor, url):
+    response = await extractor.http.get(url, timeout=30)
+    return len(response.content), extractor._extract_from_page(response.content)
+
+
+async def streamed_post(extractor, url):
+    head = HeadScanner()
+    _, content = await extractor.http.get_until(url, timeout=30, done=head)
+    return len(content), extractor._extract_from_page(content, head)
+
+
+async def full_short(extractor, url):
+    response = await extractor.http.get(url, timeout=30)
+    return len(response.content), extractor._find_youtube_video_id(response.text)
+
+
+async def streamed_short(extractor, url):
+    before = extractor.http.stream_stats["bytes_read"]
+    video_id = await extractor._scan_lnkd_in_page(url)
+    return extractor.http.stream_stats["bytes_read"] - before, video_id
+
+
+async def run(count: int, rate_kb: int):
+    ThrottledHandler.rate = rate_kb * 1024
+    ThrottledHandler.pages = {}
+    for i in range(count):
+        ThrottledHandler.pages[f'/posts/{i}'] = make_post_page(i).encode('utf-8')
+        ThrottledHandler.pages[f'/short/{i}'] = make_interstitial(i)
+
+    server = BenchServer(('127.0.0.1', 0), ThrottledHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    extractor = LinkedInExtractor(cache_path=None)
+
+    rows = []
+    try:
+        for kind, variants in (
+            ('post page', (('before (full body)', full_post), ('after (streaming)', streamed_post))),
+            ('lnkd.in page', (('before (full body)', full_short), ('after (streaming)', streamed_short))),
+        ):
+            prefix = '/posts/' if kind == 'post page' else '/short/'
+            results = {}
+            for name, fetch in variants:
+                sizes, times = [], []
+                outputs = []
+                for i in range(count):
+                    start = time.perf_counter()
+                    size, output = await fetch(extractor, f"{base}{prefix}{i}")
+                    times.append((time.perf_counter() - start) * 1000)
+                    sizes.append(size)
+                    outputs.append(output)
+                results[name] = outputs
+                rows.append((kind, name, statistics.mean(sizes) / 1024, statistics.median(times)))
+            before, after = results.values()
+            if before != after:
+                print(f"WARNING: {kind} results differ between full and streaming fetch")
+    finally:
+        await extractor.aclose()
+        server.shutdown()
+
+    print(f"{count} pages of each type, served at {rate_kb} KB/s")
+    print(f"{'page':<14}{'variant':<22}{'KB read':>10}{'median ms':>12}")
+    for kind, name, kb, ms in rows:
+        print(f"{kind:<14}{name:<22}{kb:>10.0f}{ms:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=5, help='Pages of each type to fetch')
+    parser.add_argument('--rate-kb', type=int, default=2000, help='Server send rate in KB/s')
+    args = parser.parse_args()
+    asyncio.run(run(args.pages, args.rate_kb))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: HTTP throughput by number of worker processes, with one shared cache.
+
+Starts `uvicorn --factory --workers N` for each worker count and sends `call_tool` requests
+for distinct posts from concurrent clients. Page fetches are answered locally with a
+synthetic post page (linkedin.com isn't contacted), so each miss costs what the server itself
+spends on it: parsing and extraction with the chosen parser backend, then the cache write.
+
+- miss:  every post is new, so each request is a full parse in whichever worker gets it
+- hit:   the same posts again; every one must be served from the shared SQLite cache,
+         whichever worker extracted it (checked: the fetched page names its worker and fetch)
+
+Throughput can only scale up to the number of CPU cores, which is printed first.
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1,2,4] [--requests 400] [--concurrency 16]
+                                       [--parser html.parser] [--comments 400]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(BENCH_DIR, '..')
+sys.path.insert(0, ROOT)
+
+
+def create_bench_app():
+    """uvicorn factory run in each worker: the real server with page fetches answered locally."""
+    from linkedin_fixture import make_post_page
+    from mcp_server import LinkedInMCPServer
+
+    # Page without <head> metadata, so the body has to be parsed
+    page = make_post_page(0, comments=int(os.environ.get('BENCH_COMMENTS', '400')))
+    page = page[:page.index('<head>')] + page[page.index('</head>') + len('</head>'):]
+    page_bytes = page.encode('utf-8')
+    fetches = itertools.count(1)
+
+    async def get_until(url, timeout, done):
+        if 'lnkd.in' in url:
+            body = bytearray(b'<html><body>No video here</body></html>')
+        else:
+            marker = f'[worker {os.getpid()} fetch {next(fetches)}] Sub-agents'.encode('utf-8')
+            body = bytearray(page_bytes.replace(b'Sub-agents', marker, 1))
+        done(body, 0)
+        return None, bytes(body)
+
+    server = LinkedInMCPServer(share_jobs=True)
+    server.extractor.http.get_until = get_until
+    return server.app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, cache_dir: str, parser: str, comments: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        'LINKEDIN_MCP_CACHE_DIR': cache_dir,
+        'LINKEDIN_MCP_PARSER': parser,
+        'BENCH_COMMENTS': str(comments),
+    }
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'bench_workers:create_bench_app', '--factory',
+         '--workers', str(workers), '--host', '127.0.0.1', '--port', str(port),
+         '--app-dir', BENCH_DIR, '--log-level', 'warning'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_for_workers(base_url: str, workers: int):
+    """Wait until every worker process has answered /health."""
+    import httpx
+
+    pids = set()
+    deadline = time.monotonic() + 60
+    while len(pids) < workers:
+        if time.monotonic() > deadline:
+            raise SystemExit(f"Only {len(pids)} of {workers} workers answered")
+        try:
+            # A new connection each time, so the kernel spreads them over the workers
+            async with httpx.AsyncClient(base_url=base_url) as client:
+                pids.add((await client.get('/health')).json()['worker_pid'])
+        except httpx.TransportError:
+            await asyncio.sleep(0.2)
+
+
+def call(request_id: int, post: int) -> dict:
+    url = f"https://www.linkedin.com/posts/author_activity-7{post:018d}-abcd"
+    return {"jsonrpc": "2.0", "id": request_id, "method": "call_tool",
+            "params": {"name": "get_linkedin_post_text", "arguments": {"url": url}}}
+
+
+async def send_all(base_url: str, posts, concurrency: int):
+    """Request every post from `concurrency` clients; returns (seconds, {post: text})."""
+    import httpx
+
+    texts = {}
+    queue = asyncio.Queue()
+    for post in posts:
+        queue.put_nowait(post)
+
+    async def client_loop(client):
+        while not queue.empty():
+            post = queue.get_nowait()
+            response = (await client.post('/mcp', json=call(post, post))).json()
+            texts[post] = json.loads(response['result']['content'][0]['text'])['text']
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        return time.perf_counter() - started, texts
+
+
+async def bench(workers: int, args) -> tuple:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as cache_dir:
+        proc = start_server(workers, port, cache_dir, args.parser, args.comments)
+        try:
+            await wait_for_workers(base_url, workers)
+            # Warm every worker up (lazy imports, parser) on posts that aren't measured
+            await send_all(base_url, range(10**6, 10**6 + 4 * workers), args.concurrency)
+
+            posts = range(args.requests)
+            miss_seconds, first = await send_all(base_url, posts, args.concurrency)
+            hit_seconds, second = await send_all(base_url, posts, args.concurrency)
+            refetched = sum(1 for post in posts if first[post] != second[post])
+            return args.requests / miss_seconds, args.requests / hit_seconds, refetched
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker counts')
+    parser.add_argument('--requests', type=int, default=400, help='Distinct posts requested per run')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client connections')
+    parser.add_argument('--parser', default='html.parser', help='LINKEDIN_MCP_PARSER for the workers')
+    parser.add_argument('--comments', type=int, default=400, help='Comments on the synthetic page (page size)')
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU cores, {args.requests} posts, {args.concurrency} clients, parser {args.parser}")
+    print(f"{'workers':>7}{'miss req/s':>12}{'hit req/s':>11}  re-extracted on second pass")
+    for workers in (int(w) for w in args.workers.split(',')):
+        miss_rate, hit_rate, refetched = asyncio.run(bench(workers, args))
+        print(f"{workers:>7}{miss_rate:>12.1f}{hit_rate:>11.1f}  {refetched}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Synthetic LinkedIn post pages for the benchmarks.
+
+The generated pages mimic the structure of a public post page: a large <head> with
+meta tags, inline JSON and CSS, a nav bar full of internal links, the activity card with
+the post text, link and image, and a long comments section.
+"""
+
+import glob
+import json
+import os
+import random
+from typing import List, Tuple
+
+POST_TEXT = (
+    "הבוקר נפתח בקפה, טרמינל פתוח ו-prompt אחד שמריץ סוכן שמתחיל לבשל את הקוד. "
+    "Sub-agents that build themselves: a short write-up of what worked, what broke and "
+    "what we would do differently next time. "
+)
+
+
+def _head(index: int, post_text: str) -> str:
+    css = ''.join(f'.c{i}{{margin:{i}px;padding:{i % 7}px}}' for i in range(1500))
+    bootstrap = json.dumps({"data": [{"id": i, "value": "x" * 40} for i in range(600)]})
+    ld_json = json.dumps({
+        "@context": "http://schema.org",
+        "@type": "SocialMediaPosting",
+        "articleBody": post_text,
+        "image": {"@type": "ImageObject", "url": f"https://media.licdn.com/dms/image/post-{index}.jpg"},
+        "sharedContent": {"@type": "WebPage", "url": f"https://lnkd.in/post{index}"},
+    }, ensure_ascii=False)
+    return (
+        '<head><meta charset="utf-8"><title>Post | LinkedIn</title>'
+        f'<link rel="canonical" href="https://www.linkedin.com/posts/author_activity-73660525401084{index:05d}-abcd">'
+        f'<meta property="og:description" content="{post_text[:120]}">'
+        f'<meta property="og:image" content="https://media.licdn.com/dms/image/post-{index}.jpg">'
+        f'<script type="application/ld+json">{ld_json}</script>'
+        f'<style>{css}</style>'
+        f'<script>window.__bootstrap = {bootstrap};</script>'
+        '</head>'
+    )
+
+
+def _nav() -> str:
+    links = ''.join(
+        f'<li><a href="https://www.linkedin.com/{section}/item-{i}/">{section} {i}</a></li>'
+        for i in range(40) for section in ('in', 'company', 'jobs', 'feed')
+    )
+    return f'<header><nav class="global-nav"><ul>{links}</ul></nav></header>'
+
+
+def _comment(rng: random.Random, i: int) -> str:
+    words = ' '.join(rng.choice(['great', 'post', 'thanks', 'agree', 'insightful', 'תודה', 'מעולה'])
+                     for _ in range(rng.randint(5, 40)))
+    return (
+        f'<section class="comment" data-id="{i}">'
+        f'<div class="comment__header"><a href="https://www.linkedin.com/in/user-{i}">'
+        f'<img src="https://media.licdn.com/dms/image/profile-displayphoto-{i}.jpg" width="48" height="48"></a>'
+        f'<span class="comment__name">Commenter {i}</span></div>'
+        f'<div class="comment__body"><p class="comment-text">{words}</p></div>'
+        f'<div class="comment__actions"><button class="icon like-icon">Like</button>'
+        f'<button>Reply</button><img src="https://static.licdn.com/icon-{i}.svg"></div>'
+        '</section>'
+    )
+
+
+def make_post_page(index: int = 0, comments: int = 400, seed: int = 0) -> str:
+    """Build one synthetic post page (a few hundred KB with the default comment count)."""
+    rng = random.Random(seed + index)
+    post_text = POST_TEXT * 3
+    card = (
+        '<div data-test-id="main-feed-activity-card" class="main-feed-activity-card">'
+        '<div class="base-main-card__info"><a href="https://www.linkedin.com/in/author">'
+        '<img src="https://media.licdn.com/dms/image/profile-displayphoto-author.jpg" width="56" height="56">'
+        'Author Name</a></div>'
+        f'<p class="attributed-text-segment-list__content">{post_text}'
+        f'<a href="https://lnkd.in/post{index}">https://lnkd.in/post{index}</a></p>'
+        '<div class="feed-shared-image">'
+        f'<img src="https://media.licdn.com/dms/image/post-{index}.jpg" width="800" height="450"></div>'
+        '</div>'
+    )
+    body = (
+        '<body>' + _nav() +
+        '<main class="main">' + card +
+        '<div class="comments">' + ''.join(_comment(rng, i) for i in range(comments)) + '</div>'
+        '</main><footer>' +
+        ''.join(f'<a href="https://about.linkedin.com/page-{i}">Footer {i}</a>' for i in range(60)) +
+        '</footer></body>'
+    )
+    return '<!DOCTYPE html><html lang="en">' + _head(index, post_text) + body + '</html>'
+
+
+def load_pages(directory: str = None, count: int = 5) -> List[Tuple[str, bytes]]:
+    """Return (name, html bytes) pairs from a directory of saved pages, or synthetic ones."""
+    if directory:
+        paths = sorted(glob.glob(os.path.join(directory, '*.html')))
+        if not paths:
+            raise SystemExit(f"No .html files found in {directory}")
+        pages = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                pages.append((os.path.basename(path), f.read()))
+        return pages
+    return [(f"synthetic-{i}", make_post_page(i).encode('utf-8')) for i in range(count)]
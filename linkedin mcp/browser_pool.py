@@ -0,0 +1,233 @@
+"""
+Shared Chromium browser pool for the Playwright fallback.
+Keeps one browser alive for the lifetime of the extractor and leases context/page pairs per request.
+"""
+
+import asyncio
+import contextlib
+import logging
+import re
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from http_client import DEFAULT_HEADERS
+
+# Bound by _import_playwright() on the first launch, so servers that never need the browser
+# don't pay for importing Playwright at startup
+async_playwright = None
+
+logger = logging.getLogger(__name__)
+
+# Returns the page's JS heap usage in bytes (Chromium-only API, 0 elsewhere)
+_JS_HEAP_SCRIPT = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+# Resource types the extractor never needs: post text, links and image URLs all come from
+# the DOM, so the bytes behind them are not downloaded
+DEFAULT_BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+# Analytics, tracking and ad hosts requested by LinkedIn pages
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'px.ads.linkedin.com', 'snap.licdn.com', 'ads.linkedin.com', 'linkedin.com/li/track',
+    'bat.bing.com', 'connect.facebook.net', 'analytics.',
+)
+
+
+def _import_playwright():
+    global async_playwright
+    if async_playwright is None:
+        from playwright.async_api import async_playwright
+
+
+class _PooledPage:
+    """A browser context with its single page and usage counter."""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.navigations = 0
+
+
+class BrowserPool:
+    """
+    Long-lived headless Chromium with a bounded pool of pages.
+
+    The browser is launched on first use. Each lease gets its own context/page pair,
+    which is returned to the pool afterwards and recycled (closed and replaced) after
+    `max_navigations_per_page` uses or once its JS heap exceeds `max_js_heap_mb`.
+    Every context routes its requests through the blocking policy, so images, media,
+    fonts and analytics/ad requests are aborted before they hit the network.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = 2,
+        max_navigations_per_page: int = 20,
+        max_js_heap_mb: Optional[int] = 256,
+        blocked_resource_types: Iterable[str] = DEFAULT_BLOCKED_RESOURCE_TYPES,
+        blocked_url_patterns: Iterable[str] = DEFAULT_BLOCKED_URL_PATTERNS,
+    ):
+        self.max_pages = max(1, max_pages)
+        self.max_navigations_per_page = max_navigations_per_page
+        self.max_js_heap_mb = max_js_heap_mb
+        self.blocked_resource_types = frozenset(blocked_resource_types)
+        blocked_url_patterns = list(blocked_url_patterns)
+        self._blocked_url_re = (
+            re.compile('|'.join(re.escape(pattern) for pattern in blocked_url_patterns))
+            if blocked_url_patterns else None
+        )
+        self._semaphore = asyncio.Semaphore(self.max_pages)
+        self._start_lock = asyncio.Lock()
+        self._idle: List[_PooledPage] = []
+        self._playwright = None
+        self._browser = None
+        self._closed = False
+        self._in_use = 0
+        self.launches = 0
+        self.pages_created = 0
+        self.pages_recycled = 0
+        self.requests_blocked = 0
+        self.requests_allowed = 0
+
+    def _should_block(self, resource_type: str, url: str) -> bool:
+        """Check a request against the routing policy."""
+        if resource_type in self.blocked_resource_types:
+            return True
+        return self._blocked_url_re is not None and self._blocked_url_re.search(url) is not None
+
+    async def _route_request(self, route):
+        """Abort heavy and tracking requests; let everything else through."""
+        request = route.request
+        try:
+            if self._should_block(request.resource_type, request.url):
+                self.requests_blocked += 1
+                await route.abort()
+            else:
+                self.requests_allowed += 1
+                await route.continue_()
+        except Exception as e:
+            # The page may have navigated away or closed while the request was pending
+            logger.debug(f"Routing failed for {request.url}: {e}")
+
+    async def _ensure_browser(self):
+        """Launch Chromium if it is not running (or has crashed)."""
+        async with self._start_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            await self._stop_browser()
+            logger.info("Launching shared Chromium browser")
+            _import_playwright()
+            self._playwright = await async_playwright().start()
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            except Exception:
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            self.launches += 1
+            return self._browser
+
+    async def _new_page(self) -> _PooledPage:
+        """Open a fresh context/page pair in the shared browser."""
+        browser = await self._ensure_browser()
+        context = await browser.new_context(user_agent=DEFAULT_HEADERS['User-Agent'])
+        try:
+            if self.blocked_resource_types or self._blocked_url_re is not None:
+                await context.route('**/*', self._route_request)
+            page = await context.new_page()
+        except Exception:
+            await context.close()
+            raise
+        self.pages_created += 1
+        return _PooledPage(context, page)
+
+    async def _close_page(self, pooled: _PooledPage):
+        """Close a pooled page's context, ignoring errors from an already-dead browser."""
+        try:
+            await pooled.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser context: {e}")
+
+    async def _is_reusable(self, pooled: _PooledPage) -> bool:
+        """Check whether a page can go back to the pool."""
+        if self._closed or pooled.page.is_closed():
+            return False
+        if pooled.navigations >= self.max_navigations_per_page:
+            return False
+        if self.max_js_heap_mb:
+            try:
+                heap_bytes = await pooled.page.evaluate(_JS_HEAP_SCRIPT)
+            except Exception:
+                return False
+            if heap_bytes > self.max_js_heap_mb * 1024 * 1024:
+                logger.debug(f"Recycling page with {heap_bytes / 1024 / 1024:.0f} MB JS heap")
+                return False
+        return True
+
+    async def _take_idle_page(self) -> Optional[_PooledPage]:
+        """Pop an idle page whose browser is still alive."""
+        while self._idle:
+            pooled = self._idle.pop()
+            if not pooled.page.is_closed() and self._browser is not None and self._browser.is_connected():
+                return pooled
+            await self._close_page(pooled)
+        return None
+
+    @contextlib.asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Lease a page for one navigation. Waits while `max_pages` leases are active."""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+
+        async with self._semaphore:
+            pooled = await self._take_idle_page() or await self._new_page()
+            pooled.navigations += 1
+            self._in_use += 1
+            reusable = False
+            try:
+                yield pooled.page
+                reusable = await self._is_reusable(pooled)
+            finally:
+                self._in_use -= 1
+                if reusable:
+                    self._idle.append(pooled)
+                else:
+                    self.pages_recycled += 1
+                    await self._close_page(pooled)
+
+    async def _stop_browser(self):
+        """Close the browser and the Playwright driver, if running."""
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {e}")
+        if playwright is not None:
+            try:
+                await playwright.stop()
+            except Exception as e:
+                logger.debug(f"Error stopping Playwright: {e}")
+
+    async def close(self):
+        """Close all pages and shut the browser down."""
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._close_page(pooled)
+        await self._stop_browser()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool counters for monitoring."""
+        return {
+            "browser_running": self._browser is not None and self._browser.is_connected(),
+            "max_pages": self.max_pages,
+            "pages_in_use": self._in_use,
+            "idle_pages": len(self._idle),
+            "launches": self.launches,
+            "pages_created": self.pages_created,
+            "pages_recycled": self.pages_recycled,
+            "requests_blocked": self.requests_blocked,
+            "requests_allowed": self.requests_allowed,
+        }
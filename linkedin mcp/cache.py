@@ -0,0 +1,364 @@
+"""
+Persistent on-disk caches for LinkedIn extraction results and resolved redirect links.
+Backed by SQLite so cached posts and links survive server restarts. The database runs in WAL
+mode, so the worker processes of a multi-worker server share one cache: a post extracted by
+one worker is a hit for all the others. The async methods (aget/aset) run the SQLite calls in
+a worker thread, so a write held up by another process never stalls the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'LINKEDIN_MCP_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'linkedin-mcp')
+)
+DEFAULT_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, 'cache.sqlite3')
+
+# Matches both /posts/user_slug-activity-<id>-xxxx and urn:li:activity:<id> URLs
+_ACTIVITY_ID_RE = re.compile(r'activity[-:](\d{10,})')
+
+# Share/tracking query parameters that don't change which post a URL points to
+_NOISE_PARAMS = {'rcm', 'trk', 'trackingId'}
+
+# Seconds a connection waits for another process's write to finish before giving up
+_BUSY_TIMEOUT = 5.0
+
+# A cache hit only rewrites the entry's access time when the stored one is older than this,
+# so most hits are pure reads; LRU eviction doesn't need finer recency than that
+DEFAULT_TOUCH_INTERVAL = 60.0
+
+
+def canonical_post_key(url: str) -> str:
+    """
+    Build a cache key that identifies a post regardless of how its URL was shared.
+
+    URLs carrying an activity ID are keyed on that ID alone; other URLs are
+    normalized (scheme, host, trailing slash) with utm_*/rcm/trk parameters removed.
+    """
+    match = _ACTIVITY_ID_RE.search(url)
+    if match:
+        return f"activity:{match.group(1)}"
+
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = [
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.startswith('utm_') and key not in _NOISE_PARAMS
+    ]
+    return urlunparse(('https', host, parsed.path.rstrip('/'), '', urlencode(sorted(query)), ''))
+
+
+def open_database(path: str) -> sqlite3.Connection:
+    """
+    Open (and create the directory for) a cache database in autocommit mode.
+
+    The connection may be used from any thread; callers serialize access with their own lock.
+    """
+    if path == ':memory:':
+        return sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, isolation_level=None, timeout=_BUSY_TIMEOUT, check_same_thread=False)
+    # Readers in other processes don't block the writer (or each other) in WAL mode;
+    # synchronous=NORMAL is durable across process crashes, which is all a cache needs
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+class ExtractionCache:
+    """SQLite-backed result cache with a TTL and size-bounded LRU eviction."""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl: float = 7 * 24 * 3600,
+        max_bytes: int = 50 * 1024 * 1024,
+        touch_interval: float = DEFAULT_TOUCH_INTERVAL,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Size of the cache as of this process's last open, write or expiry; kept here so
+        # get_stats() (and /health) never queries the database from the event loop
+        self.entries = 0
+        self.size_bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        # Guards the connection, which is shared by the event loop and worker threads
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, creating the schema if needed."""
+        if self._conn is None:
+            conn = open_database(self.path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS extractions_accessed_at ON extractions (accessed_at)"
+            )
+            self._measure(conn)
+            self._conn = conn
+        return self._conn
+
+    def _measure(self, conn: sqlite3.Connection):
+        """Refresh the entry count and total size from the database."""
+        self.entries, self.size_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extractions"
+        ).fetchone()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for `key`, or None on a miss or expired entry."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT result, created_at, accessed_at FROM extractions WHERE key = ?", (key,)
+                ).fetchone()
+                now = time.time()
+                if row is None or now - row[1] > self.ttl:
+                    if row is not None:
+                        conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                        self._measure(conn)
+                    self.misses += 1
+                    return None
+                if now - row[2] >= self.touch_interval:
+                    conn.execute("UPDATE extractions SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"Extraction cache read failed: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, result: Dict[str, Any]):
+        """Store a result and evict least recently used entries beyond `max_bytes`."""
+        payload = json.dumps(result)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO extractions (key, result, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload), now, now)
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"Extraction cache write failed: {e}")
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """get() run in a worker thread."""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, result: Dict[str, Any]):
+        """set() run in a worker thread."""
+        await asyncio.to_thread(self.set, key, result)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete least recently used entries until the cache fits in `max_bytes`."""
+        self._measure(conn)
+        total = self.size_bytes
+        if total <= self.max_bytes:
+            return
+
+        stale_keys = []
+        for key, size in conn.execute("SELECT key, size FROM extractions ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM extractions WHERE key = ?", stale_keys)
+        self.evictions += len(stale_keys)
+        self.entries -= len(stale_keys)
+        self.size_bytes = total
+
+    def clear(self):
+        """Remove every cached result."""
+        try:
+            with self._lock:
+                self._connect().execute("DELETE FROM extractions")
+                self.entries, self.size_bytes = 0, 0
+        except sqlite3.Error as e:
+            logger.warning(f"Extraction cache clear failed: {e}")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the size last measured. Other processes sharing the file
+        may have written since; the next open, write or expiry here picks that up.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": self.entries,
+            "size_bytes": self.size_bytes,
+        }
+
+
+class RedirectCache:
+    """
+    Memo table from a short/redirect URL to its final destination.
+
+    Lookups are served from memory first, then from SQLite (when `path` is set) so
+    resolutions survive restarts. Successful resolutions are kept for `ttl` seconds
+    (None = forever, since lnkd.in targets never change); failed ones are kept
+    for `negative_ttl` seconds so a broken link isn't retried on every post.
+    The in-memory table is only touched from the event loop; aget/aset run just
+    the SQLite calls in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_CACHE_PATH,
+        ttl: Optional[float] = None,
+        negative_ttl: float = 300.0,
+        max_memory_entries: int = 10000,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_memory_entries = max_memory_entries
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        # url -> (final_url, expires_at or None, failed)
+        self._memory: Dict[str, Tuple[str, Optional[float], bool]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, creating the schema if needed."""
+        if self._conn is None:
+            conn = open_database(self.path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS redirects ("
+                "url TEXT PRIMARY KEY, final_url TEXT NOT NULL, failed INTEGER NOT NULL, "
+                "expires_at REAL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, url: str, entry: Tuple[str, Optional[float], bool]):
+        """Store an entry in the in-memory table, dropping the oldest when full."""
+        if url not in self._memory and len(self._memory) >= self.max_memory_entries:
+            del self._memory[next(iter(self._memory))]
+        self._memory[url] = entry
+
+    def _load(self, url: str) -> Optional[Tuple[str, Optional[float], bool]]:
+        """Read an entry from SQLite."""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT final_url, expires_at, failed FROM redirects WHERE url = ?", (url,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Redirect cache read failed: {e}")
+            return None
+        return (row[0], row[1], bool(row[2])) if row is not None else None
+
+    def _store(self, url: str, entry: Tuple[str, Optional[float], bool]):
+        """Write an entry to SQLite."""
+        final_url, expires_at, failed = entry
+        try:
+            with self._lock:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO redirects (url, final_url, failed, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (url, final_url, int(failed), expires_at)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Redirect cache write failed: {e}")
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the memoized final URL, or None if `url` has not been resolved (or expired)."""
+        entry = self._memory.get(url)
+        if entry is None and self.path:
+            entry = self._load(url)
+        return self._lookup(url, entry)
+
+    async def aget(self, url: str) -> Optional[str]:
+        """get() with the SQLite read, if one is needed, run in a worker thread."""
+        entry = self._memory.get(url)
+        if entry is None and self.path:
+            entry = await asyncio.to_thread(self._load, url)
+        return self._lookup(url, entry)
+
+    def _lookup(self, url: str, entry: Optional[Tuple[str, Optional[float], bool]]) -> Optional[str]:
+        """Finish a lookup: keep a loaded entry in memory, count it and drop it if it expired."""
+        if entry is not None and url not in self._memory:
+            self._remember(url, entry)
+        if entry is None or (entry[1] is not None and entry[1] < time.time()):
+            if entry is not None:
+                self._memory.pop(url, None)
+            self.misses += 1
+            return None
+
+        if entry[2]:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return entry[0]
+
+    def _entry(self, final_url: str, failed: bool) -> Tuple[str, Optional[float], bool]:
+        """Build an entry that expires after the TTL for its outcome."""
+        ttl = self.negative_ttl if failed else self.ttl
+        return final_url, (time.time() + ttl if ttl is not None else None), failed
+
+    def set(self, url: str, final_url: str, failed: bool = False):
+        """Memoize a resolution; failed resolutions expire after `negative_ttl`."""
+        entry = self._entry(final_url, failed)
+        self._remember(url, entry)
+        if self.path:
+            self._store(url, entry)
+
+    async def aset(self, url: str, final_url: str, failed: bool = False):
+        """set() with the SQLite write run in a worker thread."""
+        entry = self._entry(final_url, failed)
+        self._remember(url, entry)
+        if self.path:
+            await asyncio.to_thread(self._store, url, entry)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters."""
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+        }
@@ -5,14 +5,15 @@ Command-line interface for testing the LinkedIn post text extractor.
 import asyncio
 import json
 import sys
-from typing import Optional
+from typing import Optional, Tuple
 
 import click
 
-from linkedin_extractor import LinkedInExtractor
+from linkedin_extractor import LinkedInExtractor, DEFAULT_BATCH_CONCURRENCY
 
 
-async def async_extract_post_text(url: str, output, pretty: bool, verbose: bool):
+async def async_extract_post_text(urls: Tuple[str, ...], output, pretty: bool, verbose: bool,
+                                  concurrency: int, timeout: Optional[float]):
     """Async wrapper for the extraction logic."""
     if verbose:
         import logging
@@ -21,8 +22,14 @@ async def async_extract_post_text(url: str, output, pretty: bool, verbose: bool)
     extractor = LinkedInExtractor()
     
     try:
-        click.echo(f"Extracting text from: {url}", err=True)
-        result = await extractor.extract_post_text(url)
+        if len(urls) == 1:
+            click.echo(f"Extracting text from: {urls[0]}", err=True)
+            result = await extractor.extract_post_text(urls[0], timeout)
+            succeeded = result.get('success')
+        else:
+            click.echo(f"Extracting text from {len(urls)} posts", err=True)
+            result = await extractor.extract_many(list(urls), concurrency=concurrency, timeout=timeout)
+            succeeded = all(item.get('success') for item in result)
         
         if pretty:
             json_output = json.dumps(result, indent=2, ensure_ascii=True)
@@ -37,25 +44,32 @@ async def async_extract_post_text(url: str, output, pretty: bool, verbose: bool)
             safe_output = json_output.encode('utf-8', errors='replace').decode('utf-8')
             click.echo(safe_output, file=output)
         
-        if not result.get('success'):
+        if not succeeded:
             sys.exit(1)
             
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
+    finally:
+        await extractor.aclose()
 
 
 @click.command()
-@click.argument('url')
+@click.argument('urls', nargs=-1, required=True)
 @click.option('--output', '-o', type=click.File('w'), default=sys.stdout,
               help='Output file (default: stdout)')
 @click.option('--pretty', '-p', is_flag=True, default=True,
               help='Pretty print JSON output')
 @click.option('--verbose', '-v', is_flag=True,
               help='Enable verbose logging')
-def main(url: str, output, pretty: bool, verbose: bool):
-    """Extract text from a LinkedIn post URL."""
-    asyncio.run(async_extract_post_text(url, output, pretty, verbose))
+@click.option('--concurrency', '-c', type=int, default=DEFAULT_BATCH_CONCURRENCY,
+              help='Maximum posts extracted in parallel when several URLs are given')
+@click.option('--timeout', '-t', type=click.FloatRange(min=0, min_open=True), default=None,
+              help='Overall time budget per post in seconds (default: no limit)')
+def main(urls: Tuple[str, ...], output, pretty: bool, verbose: bool, concurrency: int,
+         timeout: Optional[float]):
+    """Extract text from one or more LinkedIn post URLs."""
+    asyncio.run(async_extract_post_text(urls, output, pretty, verbose, concurrency, timeout))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+"""
+Overall time budget for one extraction.
+A Deadline is created once per extract_post_text call and passed down through fetch, redirect
+resolution and the browser stage, so each network call only gets the time that is left.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Overall budget for MCP tool calls that don't pass one; below the usual 60 s client timeout
+DEFAULT_TOOL_TIMEOUT = 50.0
+
+
+class Deadline:
+    """A point in time an extraction must finish by, or no limit when `seconds` is None."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self._expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self, cap: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds left, never more than `cap` (the stage's own timeout).
+
+        Returns None only when there is neither a deadline nor a cap.
+        """
+        if self._expires_at is None:
+            return cap
+        left = max(0.0, self._expires_at - time.monotonic())
+        return left if cap is None else min(cap, left)
+
+    @property
+    def expired(self) -> bool:
+        return self._expires_at is not None and time.monotonic() >= self._expires_at
+
+    async def run(self, awaitable: Awaitable[T], cap: Optional[float] = None) -> T:
+        """Await `awaitable`, raising asyncio.TimeoutError once the deadline (or `cap`) passes."""
+        return await asyncio.wait_for(awaitable, self.remaining(cap))
+
+
+# Shared "no limit" deadline for callers that don't pass one
+NO_DEADLINE = Deadline()
+
+
+def parse_timeout(value: Any, default: Optional[float] = DEFAULT_TOOL_TIMEOUT) -> Optional[float]:
+    """Validate a client-supplied timeout in seconds. Raises ValueError for non-positive or non-numeric values."""
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError("timeout must be a positive number of seconds")
+    return float(value)
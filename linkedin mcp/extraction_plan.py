@@ -0,0 +1,292 @@
+"""
+Compiled single-pass extraction plan for LinkedIn post pages.
+Collects text, link and image candidates in one walk over the parsed tree instead of one soup.select sweep per selector.
+For the Playwright fallback the same selectors are evaluated inside the page in a single round trip.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from html_parsers import SoupTree
+
+# Selectors in priority order: earlier selectors win over later ones
+TEXT_SELECTORS = [
+    '[data-test-id="main-feed-activity-card"] .feed-shared-text',
+    '.feed-shared-text',
+    '.feed-shared-update-v2__commentary',
+    '.attributed-text-segment-list__content',
+    '.break-words span[dir="ltr"]',
+    'div[data-test-id="main-feed-activity-card"] div.break-words',
+]
+
+LINK_SELECTORS = [
+    '[data-test-id="main-feed-activity-card"] a[href]',
+    '.feed-shared-text a[href]',
+    '.feed-shared-update-v2__commentary a[href]',
+    '.attributed-text-segment-list__content a[href]',
+    'div.break-words a[href]',
+    'a[href*="lnkd.in"]',  # LinkedIn shortened links (highest priority)
+    'a[href^="http"]',     # External links
+]
+
+IMAGE_SELECTORS = [
+    '[data-test-id="main-feed-activity-card"] img[src]',
+    '.feed-shared-image img[src]',
+    '.feed-shared-update-v2__content img[src]',
+    '.attributed-text-segment-list__content img[src]',
+    'div.break-words img[src]',
+    'img[src*="media-exp"]',  # LinkedIn media images
+    'img[src*="licdn.com"]',  # LinkedIn CDN images
+]
+
+# LinkedIn internal links (profiles, companies, etc.) that are never the post's external link
+LINK_SKIP_PATTERNS = [
+    '/in/', '/company/', '/school/',
+    '/feed/', '/mynetwork/', '/jobs/',
+    'linkedin.com/posts/', 'linkedin.com/pulse/',
+    'linkedin.com/signup/', 'linkedin.com/login/',
+    'linkedin.com/uas/', 'linkedin.com/reg/',
+    'session_redirect', 'cold-join'
+]
+
+# Profile pictures, icons and other images that are never the post image
+IMAGE_SKIP_PATTERNS = ['profile-displayphoto', 'company-logo', 'icon', 'avatar', 'emoji']
+
+_LINK_SKIP_RE = re.compile('|'.join(re.escape(pattern) for pattern in LINK_SKIP_PATTERNS))
+_IMAGE_SKIP_RE = re.compile('|'.join(re.escape(pattern) for pattern in IMAGE_SKIP_PATTERNS))
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# One compound selector: optional tag, then .class and [attr], [attr="v"], [attr*="v"], [attr^="v"] parts
+_COMPOUND_RE = re.compile(r'^([a-z][a-z0-9]*)?((?:\.[\w-]+|\[[\w-]+(?:[*^]?="[^"]*")?\])*)$')
+_PART_RE = re.compile(r'\.([\w-]+)|\[([\w-]+)(?:([*^]?=)"([^"]*)")?\]')
+
+# Runs in the browser: returns every selector's candidates, bucketed like PostCandidates
+_BROWSER_HARVEST_SCRIPT = """
+(selectors) => {
+    const all = (selector) => {
+        try {
+            return Array.from(document.querySelectorAll(selector));
+        } catch (e) {
+            return [];
+        }
+    };
+    return {
+        text: selectors.text.map((s) => all(s).map((el) => (el.innerText || '').trim())),
+        links: selectors.links.map((s) => all(s).map((el) => el.getAttribute('href'))),
+        images: selectors.images.map((s) => all(s).map(
+            (el) => [el.getAttribute('src'), el.getAttribute('width'), el.getAttribute('height')]
+        )),
+    };
+}
+"""
+
+
+class _Compound:
+    """Precompiled matcher for one compound selector such as `div.break-words` or `a[href^="http"]`."""
+
+    __slots__ = ('tag', 'classes', 'attrs')
+
+    def __init__(self, selector: str):
+        match = _COMPOUND_RE.match(selector)
+        if not match:
+            raise ValueError(f"Unsupported selector: {selector!r}")
+        self.tag = match.group(1)
+        self.classes = []
+        self.attrs = []
+        for class_name, attr, operator, value in _PART_RE.findall(match.group(2)):
+            if class_name:
+                self.classes.append(class_name)
+            else:
+                self.attrs.append((attr, operator, value))
+
+    def matches(self, tag: str, classes, attrs: Dict) -> bool:
+        if self.tag is not None and self.tag != tag:
+            return False
+        for class_name in self.classes:
+            if class_name not in classes:
+                return False
+        for attr, operator, value in self.attrs:
+            actual = attrs.get(attr)
+            if actual is None:
+                if attr not in attrs:
+                    return False
+                # Valueless attribute (selectolax reports these as None)
+                actual = ''
+            if operator == '=' and actual != value:
+                return False
+            if operator == '*=' and value not in actual:
+                return False
+            if operator == '^=' and not actual.startswith(value):
+                return False
+        return True
+
+
+def _compile_selector(selector: str) -> Tuple[Optional[_Compound], _Compound]:
+    """Compile `[ancestor ]subject` into (ancestor matcher or None, subject matcher)."""
+    parts = selector.split()
+    if len(parts) > 2:
+        raise ValueError(f"Only one descendant combinator is supported: {selector!r}")
+    ancestor = _Compound(parts[0]) if len(parts) == 2 else None
+    return ancestor, _Compound(parts[-1])
+
+
+class PostCandidates:
+    """Candidates gathered by one walk, bucketed by selector priority."""
+
+    def __init__(self, text_count: int, link_count: int, image_count: int):
+        self.text: List[list] = [[] for _ in range(text_count)]
+        self.links: List[List[str]] = [[] for _ in range(link_count)]
+        self.images: List[List[Tuple[str, Optional[str], Optional[str]]]] = [[] for _ in range(image_count)]
+
+
+class ExtractionPlan:
+    """
+    Text, link and image selectors compiled into a single tree walk.
+
+    Each selector becomes a subject matcher plus an optional ancestor matcher. The walk
+    carries a bitmask of the ancestor matchers satisfied above the current element, so
+    every selector is evaluated in the same pass and results keep selector priority.
+    """
+
+    def __init__(self, text_selectors: List[str], link_selectors: List[str], image_selectors: List[str]):
+        self.text_selectors = text_selectors
+        self.link_selectors = link_selectors
+        self.image_selectors = image_selectors
+        self._ancestors: List[_Compound] = []
+        ancestor_bits: Dict[str, int] = {}
+        # tag name (or None for any tag) -> [(kind, priority, ancestor bit, subject matcher)]
+        self._rules: Dict[Optional[str], List[Tuple[str, int, int, _Compound]]] = {}
+
+        for kind, selectors in (('text', text_selectors), ('link', link_selectors), ('image', image_selectors)):
+            for priority, selector in enumerate(selectors):
+                ancestor, subject = _compile_selector(selector)
+                bit = 0
+                if ancestor is not None:
+                    ancestor_key = selector.split()[0]
+                    if ancestor_key not in ancestor_bits:
+                        ancestor_bits[ancestor_key] = 1 << len(self._ancestors)
+                        self._ancestors.append(ancestor)
+                    bit = ancestor_bits[ancestor_key]
+                self._rules.setdefault(subject.tag, []).append((kind, priority, bit, subject))
+
+        self._untagged_rules = self._rules.pop(None, [])
+
+    def collect(self, document, tree=SoupTree) -> PostCandidates:
+        """Walk `document` once, bucketing every matching element by selector priority."""
+        candidates = PostCandidates(
+            len(self.text_selectors), len(self.link_selectors), len(self.image_selectors)
+        )
+        rules = self._rules
+        untagged_rules = self._untagged_rules
+        ancestors = self._ancestors
+        element = tree.element
+        stack = [(iter(tree.top_level(document)), 0)]
+
+        while stack:
+            children, mask = stack[-1]
+            node = next(children, None)
+            if node is None:
+                stack.pop()
+                continue
+            info = element(node)
+            if info is None:
+                continue
+
+            tag, attrs, classes, node_children = info
+
+            tagged_rules = rules.get(tag)
+            for kind, priority, bit, subject in (tagged_rules + untagged_rules if tagged_rules else untagged_rules):
+                if bit and not mask & bit:
+                    continue
+                if not subject.matches(tag, classes, attrs):
+                    continue
+                if kind == 'text':
+                    candidates.text[priority].append(node)
+                elif kind == 'link':
+                    candidates.links[priority].append(attrs['href'])
+                else:
+                    candidates.images[priority].append((attrs['src'], attrs.get('width'), attrs.get('height')))
+
+            if node_children:
+                child_mask = mask
+                if classes or 'data-test-id' in attrs:
+                    for index, ancestor in enumerate(ancestors):
+                        if ancestor.matches(tag, classes, attrs):
+                            child_mask |= 1 << index
+                stack.append((iter(node_children), child_mask))
+
+        return candidates
+
+    def extract(self, document, tree=SoupTree) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Return (text, raw link, image) for a parsed post page."""
+        candidates = self.collect(document, tree)
+        text = select_text(
+            # Text is only computed for buckets select_text actually looks at
+            (tree.text(node) for node in bucket) for bucket in candidates.text
+        )
+        return text, select_link(candidates.links), select_image(candidates.images)
+
+    async def harvest(self, page) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Return (text, raw link, image) from a live Playwright page.
+        
+        All candidates come back from one page.evaluate call; the selection rules then
+        run locally without further browser round trips.
+        """
+        payload = await page.evaluate(_BROWSER_HARVEST_SCRIPT, {
+            'text': self.text_selectors,
+            'links': self.link_selectors,
+            'images': self.image_selectors,
+        })
+        images = [[tuple(image) for image in bucket] for bucket in payload['images']]
+        return select_text(payload['text']), select_link(payload['links']), select_image(images)
+
+
+def select_text(buckets: Iterable[Iterable[str]]) -> Optional[str]:
+    """Join the text of the highest-priority selector that has non-trivial text."""
+    for texts in buckets:
+        # Filter out very short text snippets
+        text_parts = [text for text in texts if text and len(text) > 10]
+        if text_parts:
+            # Clean up extra whitespace
+            return _WHITESPACE_RE.sub(' ', ' '.join(text_parts)).strip()
+    return None
+
+
+def select_link(buckets: List[List[str]]) -> Optional[str]:
+    """Pick the post's link: the first lnkd.in link, else the first external non-LinkedIn link."""
+    found_links = []
+    for hrefs in buckets:
+        for href in hrefs:
+            if not href:
+                continue
+            href = href.strip()
+            # Prioritize LinkedIn shortened links (lnkd.in)
+            if 'lnkd.in' in href:
+                return href
+            if href.startswith('http') and not _LINK_SKIP_RE.search(href):
+                found_links.append(href)
+    return found_links[0] if found_links else None
+
+
+def select_image(
+    buckets: List[List[Tuple[str, Optional[str], Optional[str]]]], check_size: bool = True
+) -> Optional[str]:
+    """Pick the first post image, skipping profile pictures, icons and tiny images."""
+    for images in buckets:
+        for src, width, height in images:
+            if not src or not src.startswith('http') or _IMAGE_SKIP_RE.search(src.lower()):
+                continue
+            # Skip if we can determine it's too small
+            if check_size and width and height:
+                try:
+                    if int(width) < 100 or int(height) < 100:
+                        continue
+                except (ValueError, TypeError):
+                    pass
+            return src
+    return None
+
+
+# Plan used for LinkedIn post pages fetched over HTTP
+POST_PLAN = ExtractionPlan(TEXT_SELECTORS, LINK_SELECTORS, IMAGE_SELECTORS)
@@ -0,0 +1,172 @@
+"""
+HTML parser backends for the LinkedIn extractor.
+html.parser is always available; lxml and selectolax are optional, faster backends selected by config.
+Parser packages (bs4 included) are imported on first parse, not when this module is imported.
+"""
+
+import importlib.util
+import logging
+import os
+import re
+import time
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+# 'auto' picks the fastest installed backend
+DEFAULT_PARSER_BACKEND = os.environ.get('LINKEDIN_MCP_PARSER', 'auto')
+
+# Script/style bodies and the <head> never hold post text, links or images, so they are
+# cut out before parsing to keep the tree (and its memory) down to the content region
+_NON_CONTENT_RE = re.compile(
+    rb'<head\b.*?</head\s*>|<(script|style)\b[^>]*>.*?</\1\s*>',
+    re.DOTALL | re.IGNORECASE
+)
+
+
+# bs4 classes, bound by _import_bs4() the first time a BeautifulSoup document is used
+BeautifulSoup = Tag = None
+
+
+def _import_bs4():
+    global BeautifulSoup, Tag
+    if Tag is None:
+        from bs4 import BeautifulSoup, Tag
+
+
+def _is_installed(backend: str) -> bool:
+    """Check whether the optional package behind a backend can be imported."""
+    if backend == 'html.parser':
+        return True
+    return importlib.util.find_spec(backend) is not None
+
+
+def available_backends() -> List[str]:
+    """Return the parser backends usable in this environment."""
+    return [backend for backend in PARSER_BACKENDS if _is_installed(backend)]
+
+
+def resolve_backend(name: str) -> str:
+    """Map a configured backend name to an installed one, falling back to html.parser."""
+    if name == 'auto':
+        # Fastest first (see benchmarks/bench_parsers.py)
+        for backend in ('selectolax', 'lxml'):
+            if _is_installed(backend):
+                return backend
+        return 'html.parser'
+    if name not in PARSER_BACKENDS:
+        logger.warning(f"Unknown parser backend {name!r}, using html.parser")
+        return 'html.parser'
+    if not _is_installed(name):
+        logger.warning(f"Parser backend {name!r} is not installed, using html.parser")
+        return 'html.parser'
+    return name
+
+
+def strip_non_content(html: bytes) -> bytes:
+    """Drop <head>, <script> and <style> blocks from a page before parsing."""
+    return _NON_CONTENT_RE.sub(b'', html)
+
+
+class SoupTree:
+    """Tree access for BeautifulSoup documents (html.parser and lxml backends)."""
+
+    @staticmethod
+    def top_level(document) -> Iterable:
+        # Every walk starts here, so element() can rely on Tag being bound
+        _import_bs4()
+        return document.contents
+
+    @staticmethod
+    def element(node) -> Optional[Tuple[str, Dict[str, Any], Any, Iterable]]:
+        """Return (tag, attrs, classes, children) for an element, None for text/comments."""
+        if not isinstance(node, Tag):
+            return None
+        attrs = node.attrs
+        return node.name, attrs, attrs.get('class') or (), node.contents
+
+    @staticmethod
+    def text(node) -> str:
+        return node.get_text(strip=True)
+
+
+class SelectolaxTree:
+    """Tree access for selectolax (Lexbor) documents."""
+
+    @staticmethod
+    def top_level(document) -> Iterable:
+        return [document.root] if document.root is not None else []
+
+    @staticmethod
+    def element(node) -> Optional[Tuple[str, Dict[str, Any], Any, Iterable]]:
+        """Return (tag, attrs, classes, children) for an element, None for comments."""
+        tag = node.tag
+        if tag[0] in '-_':
+            return None
+        attrs = node.attributes
+        class_attr = attrs.get('class')
+        return tag, attrs, class_attr.split() if class_attr else (), node.iter(include_text=False)
+
+    @staticmethod
+    def text(node) -> str:
+        return node.text(deep=True, separator='', strip=True)
+
+
+def parse_html(html: bytes, backend: str):
+    """Parse a page with the given backend. Returns (document, tree accessor)."""
+    if backend == 'selectolax':
+        try:
+            from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+        except ImportError:
+            from selectolax.parser import HTMLParser as SelectolaxParser
+        return SelectolaxParser(html.decode('utf-8', errors='replace')), SelectolaxTree
+    _import_bs4()
+    return BeautifulSoup(html, backend), SoupTree
+
+
+class ParseStats:
+    """Per-backend parse time and (when profiling) peak Python memory."""
+
+    def __init__(self, profile_memory: bool = False):
+        self.profile_memory = profile_memory
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def parse(self, html: bytes, backend: str):
+        """Parse `html` with `backend`, recording how long it took and how much memory it used."""
+        tracing = self.profile_memory
+        if tracing:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        parsed = parse_html(html, backend)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        stats = self._stats.setdefault(backend, {
+            "pages": 0, "bytes": 0, "total_ms": 0.0, "max_ms": 0.0, "peak_kb": None
+        })
+        stats["pages"] += 1
+        stats["bytes"] += len(html)
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if tracing:
+            peak_kb = (tracemalloc.get_traced_memory()[1] - baseline) / 1024
+            stats["peak_kb"] = max(stats["peak_kb"] or 0.0, peak_kb)
+        return parsed
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Return per-backend counters with the average parse time."""
+        return {
+            backend: {
+                **stats,
+                "total_ms": round(stats["total_ms"], 1),
+                "max_ms": round(stats["max_ms"], 1),
+                "avg_ms": round(stats["total_ms"] / stats["pages"], 1),
+            }
+            for backend, stats in self._stats.items()
+        }
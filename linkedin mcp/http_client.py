@@ -0,0 +1,163 @@
+"""
+Async HTTP client for the LinkedIn extractor.
+Wraps a pooled httpx.AsyncClient so page fetches and redirect resolution never block the event loop.
+Requests to linkedin.com and lnkd.in go through a per-host rate limiter and are retried when throttled.
+httpx itself is imported when the first request is made, so importing this module stays cheap.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Optional, Tuple
+
+from rate_limit import DEFAULT_HOST_RATES, HostRateLimiter
+
+if TYPE_CHECKING:
+    import httpx
+
+# The `h2` package enables HTTP/2 support in httpx
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+logger = logging.getLogger(__name__)
+
+# Headers that mimic a real browser
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+
+class AsyncHTTPClient:
+    """Pooled, keep-alive async HTTP client (HTTP/2 when the `h2` package is installed)."""
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        host_rates: Mapping[str, Tuple[float, int]] = DEFAULT_HOST_RATES,
+        max_retries: int = 2,
+    ):
+        self.headers = dict(DEFAULT_HEADERS if headers is None else headers)
+        self.limits = {
+            "max_connections": max_connections,
+            "max_keepalive_connections": max_keepalive_connections,
+            "keepalive_expiry": keepalive_expiry,
+        }
+        self._client: Optional['httpx.AsyncClient'] = None
+        self.rate_limiter = HostRateLimiter(host_rates)
+        self.max_retries = max_retries
+        self.stream_stats = {"streamed": 0, "stopped_early": 0, "bytes_read": 0}
+
+    def _get_client(self) -> 'httpx.AsyncClient':
+        """Create the underlying client on first use so it binds to the running event loop."""
+        if self._client is None or self._client.is_closed:
+            import httpx
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                limits=httpx.Limits(**self.limits),
+                http2=HTTP2_AVAILABLE,
+                timeout=30.0,
+            )
+        return self._client
+
+    async def _send(
+        self, method: str, url: str, timeout: float, follow_redirects: bool = True, stream: bool = False
+    ) -> 'httpx.Response':
+        """
+        Send a request through the host's rate limiter, retrying throttled responses.
+        
+        Throttled responses (429/999/auth wall) are retried up to `max_retries` times after
+        the limiter's jittered backoff; the last response is returned either way. A throttled
+        response is returned without retrying when the server's Retry-After is longer than
+        the limiter's `max_backoff` or than what is left of `timeout`. With `stream=True`
+        the caller must close the returned response.
+        """
+        import httpx
+        client = self._get_client()
+        host = httpx.URL(url).host
+        loop = asyncio.get_running_loop()
+        give_up_at = None if timeout is None else loop.time() + timeout
+        attempt = 0
+        while True:
+            wait = self.rate_limiter.reserve(host)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            response = await client.send(
+                client.build_request(method, url, timeout=timeout),
+                stream=stream,
+                follow_redirects=follow_redirects,
+            )
+            retry_in = self.rate_limiter.record_response(
+                host, response.status_code, str(response.url), response.headers.get('Retry-After')
+            )
+            if retry_in is None or attempt >= self.max_retries:
+                return response
+            time_left = None if give_up_at is None else give_up_at - loop.time()
+            if not self.rate_limiter.should_retry(retry_in, time_left):
+                logger.warning(f"Not retrying {url}: {host} asked to wait {retry_in:.1f}s")
+                return response
+            await response.aclose()
+            attempt += 1
+            await asyncio.sleep(retry_in)
+
+    async def get(self, url: str, timeout: float, follow_redirects: bool = True) -> 'httpx.Response':
+        """GET a URL and read the full response body."""
+        return await self._send('GET', url, timeout, follow_redirects)
+
+    async def head(self, url: str, timeout: float, follow_redirects: bool = True) -> 'httpx.Response':
+        """HEAD a URL (no body is transferred)."""
+        return await self._send('HEAD', url, timeout, follow_redirects)
+
+    async def get_until(
+        self,
+        url: str,
+        timeout: float,
+        done: Callable[[bytearray, int], bool],
+    ) -> Tuple['httpx.Response', bytes]:
+        """
+        Stream a GET response, handing the body read so far to `done` after every chunk.
+        
+        `done(body, start)` gets the buffered body and the offset where the newest chunk
+        begins; once it returns True the response is closed without reading the rest.
+        Chunks are checked as they arrive from the network rather than re-buffered.
+        Error statuses raise httpx.HTTPStatusError before any body is read.
+        
+        Returns:
+            (response, body bytes read before stopping)
+        """
+        body = bytearray()
+        response = await self._send('GET', url, timeout, stream=True)
+        try:
+            response.raise_for_status()
+            self.stream_stats["streamed"] += 1
+            async for chunk in response.aiter_bytes():
+                start = len(body)
+                body.extend(chunk)
+                self.stream_stats["bytes_read"] += len(chunk)
+                if done(body, start):
+                    self.stream_stats["stopped_early"] += 1
+                    break
+        finally:
+            await response.aclose()
+        return response, bytes(body)
+
+    async def final_url_via_get(self, url: str, timeout: float) -> str:
+        """Follow redirects with GET, closing the response before the body is downloaded."""
+        response = await self._send('GET', url, timeout, stream=True)
+        await response.aclose()
+        return str(response.url)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return streaming fetch counters and the current rate per limited host."""
+        return {**self.stream_stats, "hosts": self.rate_limiter.get_stats()}
+
+    async def aclose(self):
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,390 @@
+"""
+Background extraction jobs for the HTTP server.
+A submitted job gets its ID back immediately. A fixed pool of workers runs the extractions and
+records each stage the extractor reports (see progress.py). Clients poll a job or follow its
+events as they happen. Finished jobs stay retrievable for a TTL, so a client whose connection
+dropped can collect the result instead of starting the extraction over. With a JobStore, job
+state is also written to SQLite, so in a multi-worker server any worker can answer for a job.
+Store reads and writes run in worker threads, off the event loop.
+"""
+
+import asyncio
+import collections
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from cache import open_database
+from deadline import parse_timeout
+from progress import stage_listener
+
+logger = logging.getLogger(__name__)
+
+# Extractions run at once by the job workers
+DEFAULT_JOB_WORKERS = 4
+
+# Jobs waiting for a worker; further submissions are refused until the queue drains
+DEFAULT_MAX_QUEUED_JOBS = 100
+
+# Seconds a finished job stays retrievable
+DEFAULT_JOB_TTL = 600.0
+
+# Overall budget per job when the client doesn't pass one. No HTTP request waits on a job,
+# so it can be longer than the tool call default and leave room for the Playwright fallback
+DEFAULT_JOB_TIMEOUT = 300.0
+
+# Seconds without a new event after which Job.follow yields None, so a stream can send a keep-alive
+EVENT_HEARTBEAT = 15.0
+
+# How often a job run by another worker process is re-read from the JobStore while followed
+STORE_POLL_INTERVAL = 0.5
+
+# Seconds between sweeps of expired jobs from the JobStore
+_STORE_PURGE_INTERVAL = 60.0
+
+_FINISHED_STATUSES = ("succeeded", "failed")
+
+# Runs one extraction: (url, timeout) -> result dictionary
+ExtractFunc = Callable[[str, Optional[float]], Awaitable[Dict[str, Any]]]
+
+
+class JobQueueFull(Exception):
+    """Raised by JobManager.submit when the wait queue is full."""
+
+
+def parse_job_request(body: Any) -> Tuple[str, Optional[float]]:
+    """
+    Validate a job submission body.
+
+    Returns:
+        (url, timeout)
+
+    Raises:
+        ValueError: if the body is not an object with a url, or the timeout is invalid
+    """
+    if not isinstance(body, dict):
+        raise ValueError("body must be a JSON object")
+    url = body.get("url")
+    if not isinstance(url, str) or not url:
+        raise ValueError("url required")
+    return url, parse_timeout(body.get("timeout"), DEFAULT_JOB_TIMEOUT)
+
+
+class Job:
+    """One extraction: its status, the stages it went through and, once finished, the result."""
+
+    def __init__(self, url: str, timeout: Optional[float]):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.timeout = timeout
+        self.status = "queued"
+        self.result: Optional[Dict[str, Any]] = None
+        self.events: List[Dict[str, Any]] = []
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._started = time.monotonic()
+        # Set (and replaced) whenever an event is added, waking everyone following the job
+        self._changed = asyncio.Event()
+        self.add_event("queued")
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED_STATUSES
+
+    def add_event(self, stage: str, detail: Optional[Dict[str, Any]] = None):
+        """Record that the job reached `stage`."""
+        elapsed_ms = round((time.monotonic() - self._started) * 1000, 1)
+        self.events.append({"stage": stage, "elapsed_ms": elapsed_ms, **(detail or {})})
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def finish(self, result: Dict[str, Any]):
+        self.result = result
+        self.status = "succeeded" if result.get("success") else "failed"
+        self.finished_at = time.time()
+        self.add_event(self.status)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "url": self.url,
+            "status": self.status,
+            "stage": self.events[-1]["stage"],
+            "events": self.events,
+            "result": self.result,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    async def follow(
+        self, after: int = 0, heartbeat: Optional[float] = EVENT_HEARTBEAT
+    ) -> AsyncIterator[Optional[Tuple[int, Dict[str, Any]]]]:
+        """
+        Yield (index, event) for every event from index `after` on, as they happen, until the
+        job finishes. Yields None after `heartbeat` seconds without a new event.
+        """
+        index = after
+        while True:
+            while index < len(self.events):
+                yield index, self.events[index]
+                index += 1
+            if self.finished:
+                return
+            try:
+                await asyncio.wait_for(self._changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+
+class JobStore:
+    """
+    Job snapshots in SQLite, shared by every process that opens the same file, so a worker
+    process can report on (and follow) jobs another one is running.
+
+    save() only queues the snapshot; a worker thread writes whatever is queued in one
+    transaction, so a burst of stage events costs one write and never blocks the event loop.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._next_purge = 0.0
+        # Guards the connection. flush() holds it while draining _pending too, so snapshots
+        # are written in the order they were queued
+        self._lock = threading.Lock()
+        # Latest unwritten snapshot per job: job ID -> (snapshot JSON, expires_at)
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, creating the schema if needed."""
+        if self._conn is None:
+            conn = open_database(self.path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, snapshot TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def save(self, job: Job, ttl: float):
+        """Queue the job's current state for writing. Unfinished jobs also expire, in case their worker dies."""
+        budget = ttl if job.finished else (job.timeout or DEFAULT_JOB_TIMEOUT) + ttl
+        with self._pending_lock:
+            self._pending[job.id] = (json.dumps(job.to_dict()), time.time() + budget)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self.flush)
+        except RuntimeError:
+            # No event loop (synchronous use): write straight away
+            self.flush()
+
+    def flush(self):
+        """Write every queued snapshot in one transaction."""
+        try:
+            with self._lock:
+                # Drained under the connection lock: a flush that drained earlier snapshots
+                # can't commit after this one and overwrite a job's newer state
+                with self._pending_lock:
+                    rows = [
+                        (job_id, snapshot, expires_at)
+                        for job_id, (snapshot, expires_at) in self._pending.items()
+                    ]
+                    self._pending.clear()
+                    self._flush_scheduled = False
+                if not rows:
+                    return
+                conn = self._connect()
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO jobs (id, snapshot, expires_at) VALUES (?, ?, ?)", rows
+                    )
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            logger.warning(f"Job store write failed: {e}")
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's last saved state, or None if it is unknown or expired."""
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                if now >= self._next_purge:
+                    conn.execute("DELETE FROM jobs WHERE expires_at < ?", (now,))
+                    self._next_purge = now + _STORE_PURGE_INTERVAL
+                row = conn.execute("SELECT snapshot, expires_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Job store read failed: {e}")
+            return None
+        if row is None or row[1] < now:
+            return None
+        return json.loads(row[0])
+
+    async def aload(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """load() run in a worker thread."""
+        return await asyncio.to_thread(self.load, job_id)
+
+    def close(self):
+        """Write anything still queued and close the database connection."""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class JobManager:
+    """
+    Queues jobs, runs them on a bounded pool of workers and forgets them `ttl` seconds after
+    they finish. With a `store`, jobs run by other processes sharing it can be looked up too.
+    """
+
+    def __init__(
+        self,
+        extract: ExtractFunc,
+        workers: int = DEFAULT_JOB_WORKERS,
+        max_queued: int = DEFAULT_MAX_QUEUED_JOBS,
+        ttl: float = DEFAULT_JOB_TTL,
+        store: Optional[JobStore] = None,
+    ):
+        self._extract = extract
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.store = store
+        self._jobs: Dict[str, Job] = {}
+        # (monotonic finish time, job ID), oldest first
+        self._finished: Deque[Tuple[float, str]] = collections.deque()
+        # Created with the worker pool on first submit, inside the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self.running = 0
+        self.stats = {"submitted": 0, "succeeded": 0, "failed": 0, "rejected": 0, "expired": 0}
+
+    def submit(self, url: str, timeout: Optional[float] = DEFAULT_JOB_TIMEOUT) -> Job:
+        """Queue an extraction and return its job right away. Raises JobQueueFull if the queue is full."""
+        self._expire()
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._worker_tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        if self._queue.qsize() >= self.max_queued:
+            self.stats["rejected"] += 1
+            raise JobQueueFull(f"{self.max_queued} jobs are already waiting")
+        job = Job(url, timeout)
+        self._jobs[job.id] = job
+        self._save(job)
+        self._queue.put_nowait(job)
+        self.stats["submitted"] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job of this process that is queued, running or finished within the TTL."""
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's state as a dictionary, whichever process runs it, or None if unknown or expired."""
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return await self.store.aload(job_id) if self.store is not None else None
+
+    async def follow(
+        self, job_id: str, after: int = 0, heartbeat: Optional[float] = EVENT_HEARTBEAT
+    ) -> AsyncIterator[Optional[Tuple[int, Dict[str, Any]]]]:
+        """
+        Yield a job's events as Job.follow does. A job run by another process is followed by
+        re-reading the store every STORE_POLL_INTERVAL seconds.
+        """
+        job = self.get(job_id)
+        if job is not None:
+            async for update in job.follow(after, heartbeat):
+                yield update
+            return
+
+        index = after
+        quiet = 0.0
+        while True:
+            snapshot = await self.store.aload(job_id) if self.store is not None else None
+            if snapshot is None:
+                return
+            events = snapshot["events"]
+            if index < len(events):
+                quiet = 0.0
+            while index < len(events):
+                yield index, events[index]
+                index += 1
+            if snapshot["status"] in _FINISHED_STATUSES:
+                return
+            await asyncio.sleep(STORE_POLL_INTERVAL)
+            quiet += STORE_POLL_INTERVAL
+            if heartbeat is not None and quiet >= heartbeat:
+                quiet = 0.0
+                yield None
+
+    def _save(self, job: Job):
+        if self.store is not None:
+            self.store.save(job, self.ttl)
+
+    def _add_event(self, job: Job, stage: str, detail: Optional[Dict[str, Any]] = None):
+        job.add_event(stage, detail)
+        self._save(job)
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            self._add_event(job, "running")
+            self.running += 1
+            try:
+                with stage_listener(lambda stage, detail: self._add_event(job, stage, detail)):
+                    result = await self._extract(job.url, job.timeout)
+            except Exception as e:
+                logger.error(f"Job {job.id} failed for {job.url}: {e}")
+                result = {"url": job.url, "text": None, "error": str(e), "success": False}
+            finally:
+                self.running -= 1
+            job.finish(result)
+            self._save(job)
+            self.stats[job.status] += 1
+            self._finished.append((time.monotonic(), job.id))
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._finished and self._finished[0][0] <= cutoff:
+            _, job_id = self._finished.popleft()
+            del self._jobs[job_id]
+            self.stats["expired"] += 1
+
+    async def aclose(self):
+        """Stop the workers; jobs still queued or running are abandoned."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+        if self.store is not None:
+            self.store.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue, worker and outcome counters for monitoring."""
+        self._expire()
+        return {
+            **self.stats,
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "retained": len(self._jobs),
+            "ttl_s": self.ttl,
+        }
@@ -0,0 +1,41 @@
+"""
+JSON-RPC 2.0 helpers shared by the HTTP and stdio MCP servers.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+
+def error_response(request_id: Any, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    """Build a JSON-RPC error response."""
+    error: Dict[str, Any] = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+def is_notification(entry: Any) -> bool:
+    """A notification is a request object without an `id` member; it gets no response."""
+    return isinstance(entry, dict) and "method" in entry and "id" not in entry
+
+
+async def handle_batch(
+    entries: List[Any],
+    handle_one: Callable[[Any], Awaitable[Dict[str, Any]]],
+) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Handle a JSON-RPC batch array with `handle_one` for each entry.
+
+    Entries run concurrently; responses are returned in request order so they line up with
+    the batch. Notifications get no response, so a batch of only notifications returns None.
+    An empty batch is itself an invalid request and gets a single error response.
+    """
+    if not entries:
+        return error_response(None, -32600, "Invalid Request: empty batch")
+
+    responses = await asyncio.gather(*(handle_one(entry) for entry in entries))
+    batch = [
+        response for entry, response in zip(entries, responses)
+        if not is_notification(entry)
+    ]
+    return batch or None
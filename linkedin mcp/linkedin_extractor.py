@@ -1,35 +1,163 @@
 """
 LinkedIn post text extraction module.
-Handles both public posts (via requests + BeautifulSoup) and JavaScript-heavy posts (via Playwright).
+Handles both public posts (via async HTTP + BeautifulSoup) and JavaScript-heavy posts (via Playwright).
 """
 
 import re
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 from urllib.parse import urlparse, parse_qs, unquote
 
-import requests
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from browser_pool import BrowserPool
+from cache import DEFAULT_CACHE_PATH, ExtractionCache, RedirectCache, canonical_post_key
+from deadline import NO_DEADLINE, Deadline
+from extraction_plan import POST_PLAN, TEXT_SELECTORS
+from html_parsers import DEFAULT_PARSER_BACKEND, ParseStats, resolve_backend, strip_non_content
+from page_metadata import HeadScanner
+from progress import report_stage
+from singleflight import SingleFlight
+from http_client import AsyncHTTPClient
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default number of posts extracted in parallel by extract_many
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Upper bound on how long the Playwright fallback waits for post text to render
+DEFAULT_CONTENT_WAIT_MS = 10000
+
+# Seconds the HTTP tier may run before the Playwright tier is started alongside it
+DEFAULT_HEDGE_AFTER = 5.0
+
+# How long past the deadline a tier may take to hand back what it has before it is cancelled
+_DEADLINE_GRACE = 0.5
+
+# Matches as soon as any of the post text selectors is in the DOM
+_CONTENT_READY_SELECTOR = ', '.join(TEXT_SELECTORS)
+
+# YouTube video ID patterns found on lnkd.in interstitial pages
+_YOUTUBE_ID_PATTERNS = [
+    re.compile(r'https?://(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})'),
+    re.compile(r'https?://youtu\.be/([a-zA-Z0-9_-]{11})'),
+    re.compile(r'["\']v["\']:\s*["\']([a-zA-Z0-9_-]{11})["\']'),  # JSON format
+    re.compile(r'videoId["\']?\s*:\s*["\']([a-zA-Z0-9_-]{11})["\']'),  # videoId property
+]
+
+# Bytes of the previous chunk re-scanned so an ID split across two chunks is still found
+_YOUTUBE_SCAN_OVERLAP = 256
+
 
 class LinkedInExtractor:
     """Extracts text content from LinkedIn posts."""
     
-    def __init__(self):
-        self.session = requests.Session()
-        # Set headers to mimic a real browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        })
+    def __init__(
+        self,
+        max_browser_pages: int = 2,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        profile_parsing: bool = False,
+        content_wait_ms: int = DEFAULT_CONTENT_WAIT_MS,
+        hedge_after: Optional[float] = DEFAULT_HEDGE_AFTER,
+    ):
+        """
+        Args:
+            max_browser_pages: Maximum concurrent Playwright fallbacks
+            content_wait_ms: Longest time the Playwright fallback waits for post text after the DOM loads
+            hedge_after: Seconds before a slow HTTP tier is hedged with a parallel Playwright run,
+                or None to only fall back once the HTTP tier has failed
+            cache_path: SQLite file for cached results, or None to disable caching
+            parser_backend: 'auto', 'html.parser', 'lxml' or 'selectolax'
+            profile_parsing: Record peak Python memory per parse (uses tracemalloc)
+        """
+        # Pooled async client; sends browser-like headers
+        self.http = AsyncHTTPClient()
+        # Shared Chromium for the Playwright fallback, launched on first use
+        self.browser_pool = BrowserPool(max_pages=max_browser_pages)
+        # Successful results, keyed by canonical post identity
+        self.cache = ExtractionCache(cache_path) if cache_path else None
+        # Short link -> final URL memo (memory-only when caching is disabled)
+        self.redirect_cache = RedirectCache(cache_path)
+        # HTML parser used for pages fetched over HTTP
+        self.parser_backend = resolve_backend(parser_backend)
+        self.parse_stats = ParseStats(profile_memory=profile_parsing)
+        # How often the <head> metadata was enough on its own vs. needing the DOM walk
+        self.tier_stats = {"metadata_only": 0, "metadata_and_dom": 0, "dom_only": 0}
+        self.content_wait_ms = content_wait_ms
+        # Time spent per Playwright fallback phase, for tuning the wait bounds
+        self.fallback_stats: Dict[str, Any] = {"runs": 0, "content_wait_timeouts": 0, "phases": {}}
+        self.hedge_after = hedge_after
+        # Extractions that reached the network, how many were hedged and which tier won those
+        self.hedge_stats = {"extractions": 0, "hedged": 0, "http_won": 0, "playwright_won": 0}
+        # Concurrent requests for the same post / short link share one in-flight extraction
+        self.post_flights = SingleFlight()
+        self.redirect_flights = SingleFlight()
+
+    async def aclose(self):
+        """Release network connections, shut down the shared browser and close the cache."""
+        await self.http.aclose()
+        await self.browser_pool.close()
+        if self.cache is not None:
+            self.cache.close()
+        self.redirect_cache.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache, browser pool and parser counters for monitoring."""
+        return {
+            "cache": self.cache.get_stats() if self.cache is not None else None,
+            "redirect_cache": self.redirect_cache.get_stats(),
+            "browser_pool": self.browser_pool.get_stats(),
+            "parser": {
+                "backend": self.parser_backend,
+                "backends": self.parse_stats.get_stats(),
+            },
+            "tiers": dict(self.tier_stats),
+            "http": self.http.get_stats(),
+            "playwright_fallback": self._fallback_timing_stats(),
+            "coalescing": {
+                "posts": self.post_flights.get_stats(),
+                "redirects": self.redirect_flights.get_stats(),
+            },
+            "hedging": {
+                **self.hedge_stats,
+                "hedge_after": self.hedge_after,
+                "hedge_rate": round(self.hedge_stats["hedged"] / self.hedge_stats["extractions"], 3)
+                if self.hedge_stats["extractions"] else 0.0,
+            },
+        }
+
+    def _record_fallback_timing(self, phases: Dict[str, float], content_found: bool):
+        """Add one Playwright fallback's per-phase durations (ms) to the running totals."""
+        self.fallback_stats["runs"] += 1
+        if not content_found:
+            self.fallback_stats["content_wait_timeouts"] += 1
+        for phase, elapsed_ms in phases.items():
+            totals = self.fallback_stats["phases"].setdefault(phase, {"total_ms": 0.0, "max_ms": 0.0})
+            totals["total_ms"] += elapsed_ms
+            totals["max_ms"] = max(totals["max_ms"], elapsed_ms)
+        logger.debug(
+            "Playwright fallback timings: "
+            + ", ".join(f"{phase}={elapsed_ms:.0f}ms" for phase, elapsed_ms in phases.items())
+        )
+
+    def _fallback_timing_stats(self) -> Dict[str, Any]:
+        """Return fallback counters with average and max time per phase."""
+        runs = self.fallback_stats["runs"]
+        return {
+            "runs": runs,
+            "content_wait_timeouts": self.fallback_stats["content_wait_timeouts"],
+            "content_wait_ms": self.content_wait_ms,
+            "phases": {
+                phase: {
+                    "avg_ms": round(totals["total_ms"] / runs, 1),
+                    "max_ms": round(totals["max_ms"], 1),
+                }
+                for phase, totals in self.fallback_stats["phases"].items()
+            },
+        }
 
     def _is_valid_linkedin_url(self, url: str) -> bool:
         """Validate if the URL is a valid LinkedIn post URL."""
@@ -42,82 +170,89 @@ class LinkedInExtractor:
         except Exception:
             return False
 
-    def _extract_text_from_soup(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract post text from BeautifulSoup object."""
-        # Common selectors for LinkedIn post content
-        selectors = [
-            '[data-test-id="main-feed-activity-card"] .feed-shared-text',
-            '.feed-shared-text',
-            '.feed-shared-update-v2__commentary',
-            '.attributed-text-segment-list__content',
-            '.break-words span[dir="ltr"]',
-            'div[data-test-id="main-feed-activity-card"] div.break-words',
-        ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                # Extract text from all matching elements and join
-                text_parts = []
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    if text and len(text) > 10:  # Filter out very short text snippets
-                        text_parts.append(text)
-                
-                if text_parts:
-                    full_text = ' '.join(text_parts)
-                    # Clean up extra whitespace
-                    full_text = re.sub(r'\s+', ' ', full_text).strip()
-                    return full_text
+    async def _resolve_linkedin_redirect(self, url: str, deadline: Deadline = NO_DEADLINE) -> str:
+        """Resolve LinkedIn redirect URLs to their final destinations, memoizing the result."""
+        cached = await self.redirect_cache.aget(url)
+        if cached is not None:
+            logger.debug(f"Redirect cache hit: {url} -> {cached}")
+            return cached
         
+        report_stage("resolving_link", link=url)
+        # Concurrent lookups of the same link share one resolution; a caller that joins it
+        # waits no longer than its own deadline and then keeps the link unresolved
+        try:
+            return await self.redirect_flights.do(
+                url, lambda: self._follow_and_memoize(url, deadline), timeout=deadline.remaining()
+            )
+        except asyncio.TimeoutError:
+            logger.debug(f"Deadline reached while waiting on the shared resolution of {url}")
+            return url
+
+    async def _follow_and_memoize(self, url: str, deadline: Deadline) -> str:
+        """Follow a link's redirect chain and record the outcome in the redirect cache."""
+        final_url, failed = await self._follow_redirect_chain(url, deadline)
+        if deadline.expired:
+            # Cut short by the caller's budget, which says nothing about the link itself
+            return final_url
+        await self.redirect_cache.aset(url, final_url, failed=failed)
+        return final_url
+
+    def _find_youtube_video_id(self, content: str) -> Optional[str]:
+        """Find the first YouTube video ID mentioned in an lnkd.in interstitial page."""
+        for pattern in _YOUTUBE_ID_PATTERNS:
+            match = pattern.search(content)
+            if match:
+                return match.group(1)
         return None
 
-    def _resolve_linkedin_redirect(self, url: str) -> str:
-        """Resolve LinkedIn redirect URLs to their final destinations, following the complete redirect chain."""
+    async def _scan_lnkd_in_page(self, url: str, deadline: Deadline = NO_DEADLINE) -> Optional[str]:
+        """Stream an lnkd.in interstitial page and stop reading at the first YouTube video ID."""
+        found = []
+        
+        def scan(body: bytearray, start: int) -> bool:
+            window = bytes(body[max(0, start - _YOUTUBE_SCAN_OVERLAP):]).decode('utf-8', errors='replace')
+            video_id = self._find_youtube_video_id(window)
+            if video_id:
+                found.append(video_id)
+            return bool(found)
+        
+        await deadline.run(self.http.get_until(url, timeout=deadline.remaining(15), done=scan))
+        return found[0] if found else None
+
+    async def _follow_redirect_chain(self, url: str, deadline: Deadline = NO_DEADLINE) -> tuple[str, bool]:
+        """
+        Follow the complete redirect chain for a URL, stopping where it got to once the deadline passes.
+        
+        Returns:
+            (final_url, failed) where failed is True if a network error cut the chain short
+        """
         try:
             current_url = url
             max_redirects = 5  # Prevent infinite redirect loops
             redirects_followed = 0
+            failed = False
             
             while redirects_followed < max_redirects:
+                if deadline.expired:
+                    logger.debug(f"Deadline reached while resolving {url}, stopping at {current_url}")
+                    break
                 original_url = current_url
                 
                 # Step 1: Handle lnkd.in URLs specially (they serve content directly, not HTTP redirects)
                 if 'lnkd.in' in current_url:
                     try:
-                        response = self.session.get(current_url, timeout=15)
-                        response.raise_for_status()
-                        
-                        # Parse HTML to find YouTube video ID
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        content = str(soup)
-                        
-                        # Look for YouTube video IDs in the content
-                        youtube_patterns = [
-                            r'https?://(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})',
-                            r'https?://youtu\.be/([a-zA-Z0-9_-]{11})',
-                            r'["\']v["\']:\s*["\']([a-zA-Z0-9_-]{11})["\']',  # JSON format
-                            r'videoId["\']?\s*:\s*["\']([a-zA-Z0-9_-]{11})["\']'  # videoId property
-                        ]
-                        
-                        for pattern in youtube_patterns:
-                            matches = re.findall(pattern, content)
-                            if matches:
-                                video_id = matches[0]  # Take the first match
-                                youtube_url = f"https://www.youtube.com/watch?v={video_id}"
-                                logger.debug(f"Resolved lnkd.in URL: {current_url} -> {youtube_url} (video ID: {video_id})")
-                                redirects_followed += 1
-                                current_url = youtube_url
-                                break
-                        
-                        # If we found a YouTube URL, break the loop
-                        if 'youtube.com' in current_url or 'youtu.be' in current_url:
-                            break
+                        # Look for a YouTube video ID in the raw page content
+                        video_id = await self._scan_lnkd_in_page(current_url, deadline)
+                        if video_id:
+                            youtube_url = f"https://www.youtube.com/watch?v={video_id}"
+                            logger.debug(f"Resolved lnkd.in URL: {current_url} -> {youtube_url} (video ID: {video_id})")
+                            redirects_followed += 1
+                            current_url = youtube_url
                             
                     except Exception as e:
                         logger.debug(f"Failed to resolve lnkd.in URL {current_url}: {e}")
                         # Fall back to returning the original URL
-                        break
+                        failed = True
                 
                 # Step 2: Check if it's a LinkedIn redirect URL
                 elif 'linkedin.com/redir/redirect' in current_url:
@@ -135,26 +270,29 @@ class LinkedInExtractor:
                 elif current_url.startswith('http'):
                     try:
                         # Make a HEAD request to follow redirects without downloading content
-                        response = self.session.head(current_url, allow_redirects=True, timeout=15)
-                        if response.url != current_url and response.url != original_url:
-                            logger.debug(f"Followed HTTP redirect: {current_url} -> {response.url}")
-                            current_url = response.url
+                        response = await deadline.run(self.http.head(current_url, timeout=deadline.remaining(15)))
+                        final_url = str(response.url)
+                        if final_url != current_url and final_url != original_url:
+                            logger.debug(f"Followed HTTP redirect: {current_url} -> {final_url}")
+                            current_url = final_url
                             redirects_followed += 1
                             continue
                     except Exception as e:
                         logger.debug(f"Could not follow HTTP redirect for {current_url}: {e}")
                         # Try with GET request if HEAD fails (some servers don't support HEAD)
                         try:
-                            response = self.session.get(current_url, allow_redirects=True, timeout=15, stream=True)
-                            # Close the response immediately to avoid downloading large content
-                            response.close()
-                            if response.url != current_url and response.url != original_url:
-                                logger.debug(f"Followed HTTP redirect via GET: {current_url} -> {response.url}")
-                                current_url = response.url
+                            # The response is closed before its body is downloaded
+                            final_url = await deadline.run(
+                                self.http.final_url_via_get(current_url, timeout=deadline.remaining(15))
+                            )
+                            if final_url != current_url and final_url != original_url:
+                                logger.debug(f"Followed HTTP redirect via GET: {current_url} -> {final_url}")
+                                current_url = final_url
                                 redirects_followed += 1
                                 continue
                         except Exception as e2:
                             logger.debug(f"Could not follow HTTP redirect via GET for {current_url}: {e2}")
+                            failed = True
                 
                 # No more redirects found, break the loop
                 break
@@ -162,11 +300,11 @@ class LinkedInExtractor:
             if redirects_followed > 0:
                 logger.info(f"Final URL after {redirects_followed} redirects: {current_url}")
             
-            return current_url
+            return current_url, failed
             
         except Exception as e:
             logger.error(f"Error resolving redirect chain for {url}: {e}")
-            return url
+            return url, True
 
     def _extract_youtube_video_id(self, url: str) -> Optional[str]:
         """Extract YouTube video ID from various YouTube URL formats."""
@@ -195,232 +333,120 @@ class LinkedInExtractor:
         """Generate YouTube thumbnail URL from video ID."""
         return f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
 
-    def _extract_post_images_from_soup(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract the first image from LinkedIn post content."""
-        # Look for images in post content areas
-        image_selectors = [
-            '[data-test-id="main-feed-activity-card"] img[src]',
-            '.feed-shared-image img[src]',
-            '.feed-shared-update-v2__content img[src]',
-            '.attributed-text-segment-list__content img[src]',
-            'div.break-words img[src]',
-            'img[src*="media-exp"]',  # LinkedIn media images
-            'img[src*="licdn.com"]',  # LinkedIn CDN images
-        ]
-        
-        for selector in image_selectors:
-            images = soup.select(selector)
-            for img in images:
-                src = img.get('src')
-                if src and src.startswith('http'):
-                    # Skip profile pictures, icons, and very small images
-                    skip_patterns = [
-                        'profile-displayphoto',
-                        'company-logo',
-                        'icon',
-                        'avatar',
-                        'emoji'
-                    ]
-                    
-                    if not any(pattern in src.lower() for pattern in skip_patterns):
-                        # Check if image has reasonable dimensions (avoid tiny icons)
-                        width = img.get('width')
-                        height = img.get('height')
-                        
-                        # Skip if we can determine it's too small
-                        if width and height:
-                            try:
-                                if int(width) < 100 or int(height) < 100:
-                                    continue
-                            except (ValueError, TypeError):
-                                pass
-                        
-                        logger.debug(f"Found post image: {src}")
-                        return src
-                        
-        return None
-
-    def _extract_links_from_soup(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extract the first external link from BeautifulSoup object."""
-        found_links = []
-        
-        # Look for links in post content areas
-        link_selectors = [
-            '[data-test-id="main-feed-activity-card"] a[href]',
-            '.feed-shared-text a[href]',
-            '.feed-shared-update-v2__commentary a[href]',
-            '.attributed-text-segment-list__content a[href]',
-            'div.break-words a[href]',
-            'a[href*="lnkd.in"]',  # LinkedIn shortened links (highest priority)
-            'a[href^="http"]',     # External links
-        ]
-        
-        for selector in link_selectors:
-            links = soup.select(selector)
-            for link in links:
-                href = link.get('href')
-                if href:
-                    # Clean up the link
-                    href = href.strip()
-                    
-                    # Skip LinkedIn internal links (profiles, companies, etc.)
-                    skip_patterns = [
-                        '/in/', '/company/', '/school/',
-                        '/feed/', '/mynetwork/', '/jobs/',
-                        'linkedin.com/posts/', 'linkedin.com/pulse/',
-                        'linkedin.com/signup/', 'linkedin.com/login/',
-                        'linkedin.com/uas/', 'linkedin.com/reg/',
-                        'session_redirect', 'cold-join'
-                    ]
-                    
-                    # Prioritize LinkedIn shortened links (lnkd.in)
-                    if 'lnkd.in' in href:
-                        resolved_url = self._resolve_linkedin_redirect(href)
-                        return resolved_url
-                    
-                    # Otherwise collect external links
-                    if (href.startswith('http') and 
-                        not any(pattern in href for pattern in skip_patterns)):
-                        found_links.append(href)
-        
-        # Return first external link if no lnkd.in link found, resolve if it's a LinkedIn redirect
-        if found_links:
-            first_link = found_links[0]
-            return self._resolve_linkedin_redirect(first_link)
-        
-        return None
-
-    async def _extract_with_playwright(self, url: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    async def _extract_with_playwright(
+        self, url: str, deadline: Deadline = NO_DEADLINE
+    ) -> tuple[Optional[str], Optional[str], Optional[str]]:
         """Extract post text, links, and images using Playwright for JavaScript-heavy content."""
+        if deadline.expired:
+            return None, None, None
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                )
-                page = await context.new_page()
+            started = time.perf_counter()
+            async with self.browser_pool.page() as page:
+                leased = time.perf_counter()
+                # Heavy resources and trackers are blocked by the pool, so the DOM is enough
+                # (Playwright treats a timeout of 0 as "no timeout", hence the 1 ms floor)
+                await page.goto(url, wait_until='domcontentloaded', timeout=max(1, deadline.remaining(30) * 1000))
+                loaded = time.perf_counter()
                 
-                # Navigate to the page
-                await page.goto(url, wait_until='networkidle', timeout=30000)
-                
-                # Wait for potential content to load
-                await page.wait_for_timeout(3000)
-                
-                text_result = None
-                link_result = None
-                image_result = None
-                
-                # Try multiple selectors to find the post content
-                text_selectors = [
-                    '[data-test-id="main-feed-activity-card"] .feed-shared-text',
-                    '.feed-shared-text',
-                    '.feed-shared-update-v2__commentary',
-                    '.attributed-text-segment-list__content',
-                    '.break-words span[dir="ltr"]',
-                ]
-                
-                for selector in text_selectors:
-                    try:
-                        elements = await page.query_selector_all(selector)
-                        if elements:
-                            text_parts = []
-                            for element in elements:
-                                text = await element.inner_text()
-                                if text and len(text.strip()) > 10:
-                                    text_parts.append(text.strip())
-                            
-                            if text_parts:
-                                full_text = ' '.join(text_parts)
-                                text_result = re.sub(r'\s+', ' ', full_text).strip()
-                                break
-                    except Exception as e:
-                        logger.debug(f"Text selector {selector} failed: {e}")
-                        continue
-                
-                # Extract links
+                # Wait until post text is rendered, bounded by content_wait_ms
+                content_found = True
                 try:
-                    found_links = []
-                    links = await page.query_selector_all('a[href]')
-                    for link in links:
-                        href = await link.get_attribute('href')
-                        if href:
-                            href = href.strip()
-                            skip_patterns = [
-                                '/in/', '/company/', '/school/',
-                                '/feed/', '/mynetwork/', '/jobs/',
-                                'linkedin.com/posts/', 'linkedin.com/pulse/',
-                                'linkedin.com/signup/', 'linkedin.com/login/',
-                                'linkedin.com/uas/', 'linkedin.com/reg/',
-                                'session_redirect', 'cold-join'
-                            ]
-                            
-                            # Prioritize LinkedIn shortened links (lnkd.in)
-                            if 'lnkd.in' in href:
-                                link_result = self._resolve_linkedin_redirect(href)
-                                break
-                                
-                            # Otherwise collect external links
-                            if (href.startswith('http') and 
-                                not any(pattern in href for pattern in skip_patterns)):
-                                found_links.append(href)
-                    
-                    # Use first external link if no lnkd.in link found, resolve if it's a LinkedIn redirect
-                    if not link_result and found_links:
-                        link_result = self._resolve_linkedin_redirect(found_links[0])
-                        
+                    await page.wait_for_selector(
+                        _CONTENT_READY_SELECTOR, state='attached',
+                        timeout=max(1, deadline.remaining(self.content_wait_ms / 1000) * 1000)
+                    )
                 except Exception as e:
-                    logger.debug(f"Link extraction failed: {e}")
-
-                # Extract images
+                    content_found = False
+                    logger.debug(f"No post text selector appeared within {self.content_wait_ms} ms: {e}")
+                rendered = time.perf_counter()
+                
+                # One evaluate call returns every text, link and image candidate
                 try:
-                    image_selectors = [
-                        '[data-test-id="main-feed-activity-card"] img[src]',
-                        '.feed-shared-image img[src]',
-                        '.feed-shared-update-v2__content img[src]',
-                        'img[src*="media-exp"]',
-                        'img[src*="licdn.com"]',
-                    ]
-                    
-                    for selector in image_selectors:
-                        images = await page.query_selector_all(selector)
-                        for img in images:
-                            src = await img.get_attribute('src')
-                            if src and src.startswith('http'):
-                                skip_patterns = [
-                                    'profile-displayphoto', 'company-logo', 'icon', 'avatar', 'emoji'
-                                ]
-                                if not any(pattern in src.lower() for pattern in skip_patterns):
-                                    image_result = src
-                                    break
-                        if image_result:
-                            break
-                            
+                    text_result, link_result, image_result = await deadline.run(POST_PLAN.harvest(page))
                 except Exception as e:
-                    logger.debug(f"Image extraction failed: {e}")
+                    logger.debug(f"DOM harvest failed: {e}")
+                    text_result = link_result = image_result = None
                 
-                await browser.close()
-                return text_result, link_result, image_result
+                self._record_fallback_timing({
+                    "lease": (leased - started) * 1000,
+                    "navigation": (loaded - leased) * 1000,
+                    "content_wait": (rendered - loaded) * 1000,
+                    "harvest": (time.perf_counter() - rendered) * 1000,
+                }, content_found)
+            
+            # Resolve redirects after the page is released back to the pool
+            if link_result:
+                link_result = await self._resolve_linkedin_redirect(link_result, deadline)
+            return text_result, link_result, image_result
                 
         except Exception as e:
             logger.error(f"Playwright extraction failed: {e}")
             return None, None, None
 
-    def _extract_with_requests(self, url: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
-        """Extract post text, links, and images using requests and BeautifulSoup."""
+    def _extract_from_page(
+        self, content: bytes, head: Optional[HeadScanner] = None
+    ) -> tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Extract post text, raw link and image from a fetched page.
+        
+        og:*/JSON-LD metadata in the <head> is tried first; the page body is only parsed
+        and walked when the head leaves some of the fields missing. A JSON-LD post body
+        wins over the DOM text, while og:description (often truncated) is only used when
+        the DOM walk finds no text. `head` is the scanner that already read the head while
+        the page was streamed, if any.
+        """
+        if head is None:
+            head = HeadScanner()
+            head(content)
+        metadata = head.metadata
+        if metadata is not None and metadata.complete:
+            self.tier_stats["metadata_only"] += 1
+            return metadata.text, metadata.link, metadata.image
+        
+        # Only the content region is parsed: <head>, scripts and styles are cut out first
+        document, tree = self.parse_stats.parse(strip_non_content(content), self.parser_backend)
+        # One pass over the tree collects text, link and image candidates together
+        text, link, image = POST_PLAN.extract(document, tree)
+        
+        if metadata is None or not (metadata.text or metadata.link or metadata.image):
+            self.tier_stats["dom_only"] += 1
+            return text, link, image
+        
+        self.tier_stats["metadata_and_dom"] += 1
+        if metadata.has_full_text:
+            text = metadata.text
+        return text or metadata.text, metadata.link or link, metadata.image or image
+
+    async def _extract_with_requests(
+        self, url: str, deadline: Deadline = NO_DEADLINE
+    ) -> tuple[Optional[str], Optional[str], Optional[str]]:
+        """Extract post text, links, and images using async HTTP requests and the configured HTML parser."""
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            # The download stops as soon as the <head> metadata has text, link and image
+            head = HeadScanner()
+            _, content = await deadline.run(self.http.get_until(url, timeout=deadline.remaining(30), done=head))
+            text, link, image = self._extract_from_page(content, head)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            text = self._extract_text_from_soup(soup)
-            link = self._extract_links_from_soup(soup)
-            image = self._extract_post_images_from_soup(soup)
+            # Resolve lnkd.in / LinkedIn redirect links to their final destination
+            if link:
+                link = await self._resolve_linkedin_redirect(link, deadline)
             return text, link, image
             
         except Exception as e:
             logger.error(f"Requests extraction failed: {e}")
             return None, None, None
 
+    def _failure_result(self, url: str, error: str) -> Dict[str, Any]:
+        """Build the result dictionary returned when extraction fails."""
+        return {
+            "url": url,
+            "text": None,
+            "link": None,
+            "link_img": None,
+            "error": error,
+            "success": False
+        }
+
     def _generate_link_img(self, link: Optional[str], post_image: Optional[str]) -> Optional[str]:
         """Generate link_img based on the rules: YouTube thumbnail > proper post image > default images."""
         # Rule 1: If there's a YouTube link, generate thumbnail URL
@@ -449,34 +475,128 @@ class LinkedInExtractor:
         # Rule 3: If none of the above, return null (newsletter creation will handle default)
         return None
 
-    async def extract_post_text(self, url: str) -> Dict[str, Any]:
+    async def _extract_with_tiers(
+        self, url: str, deadline: Deadline = NO_DEADLINE
+    ) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
+        """
+        Run the HTTP tier, falling back to (or hedging with) the Playwright tier.
+        
+        Plain HTTP is tried first since it is faster for public posts. If it has not
+        finished within `hedge_after` seconds, the Playwright tier starts alongside it;
+        whichever returns text first wins and the other is cancelled. Tiers still running
+        shortly after the deadline are cancelled too.
+        
+        Returns:
+            (text, link, image, method) where method names the tier that produced the text
+        """
+        self.hedge_stats["extractions"] += 1
+        report_stage("http")
+        http_task = asyncio.create_task(self._extract_with_requests(url, deadline))
+        tiers = {http_task: "HTTP requests"}
+        pending = {http_task}
+        hedge_at = None if self.hedge_after is None else time.monotonic() + self.hedge_after
+        try:
+            while pending:
+                # Wake up for the hedge point (while only HTTP is running) or the deadline
+                left = deadline.remaining()
+                wait = None if left is None else left + _DEADLINE_GRACE
+                waiting_for_hedge = hedge_at is not None and len(tiers) == 1
+                if waiting_for_hedge:
+                    until_hedge = max(0.0, hedge_at - time.monotonic())
+                    if wait is None or until_hedge < wait:
+                        wait = until_hedge
+                    else:
+                        waiting_for_hedge = False
+                
+                done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    text, link, image = task.result()
+                    if text:
+                        if len(tiers) > 1:
+                            self.hedge_stats["http_won" if task is http_task else "playwright_won"] += 1
+                        return text, link, image, tiers[task]
+                
+                if len(tiers) == 1 and (done or waiting_for_hedge) and not deadline.expired:
+                    if done:
+                        # Fall back to Playwright for JavaScript-heavy content
+                        logger.info("Falling back to Playwright extraction")
+                        report_stage("playwright", reason="fallback")
+                    else:
+                        logger.info(
+                            f"HTTP extraction still running after {self.hedge_after}s, starting Playwright in parallel"
+                        )
+                        self.hedge_stats["hedged"] += 1
+                        report_stage("playwright", reason="hedge")
+                    browser_task = asyncio.create_task(self._extract_with_playwright(url, deadline))
+                    tiers[browser_task] = "Playwright"
+                    pending.add(browser_task)
+                elif not done and not waiting_for_hedge:
+                    logger.warning(f"Extraction of {url} ran past its {deadline.seconds}s deadline")
+                    break
+            return None, None, None, None
+        finally:
+            # Cancel whichever tier lost (or everything, if the caller was cancelled)
+            unfinished = [task for task in tiers if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+
+    async def extract_post_text(self, url: str, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Extract text, links, and images from a LinkedIn post URL.
         
         Args:
             url: LinkedIn post URL
+            timeout: Overall budget in seconds shared by all stages, or None for no limit
             
         Returns:
-            Dictionary with 'url', 'text', 'link', 'link_img', and 'success' keys
+            Dictionary with 'url', 'text', 'link', 'link_img', and 'success' keys. When the
+            budget ran out, 'timed_out' is True and the result holds whatever was found in
+            time (for example the post text with an unresolved short link).
         """
         # Validate URL
         if not self._is_valid_linkedin_url(url):
-            return {
-                "url": url,
-                "text": None,
-                "link": None,
-                "link_img": None,
-                "error": "Invalid LinkedIn post URL",
-                "success": False
-            }
+            return self._failure_result(url, "Invalid LinkedIn post URL")
+        
+        cache_key = canonical_post_key(url)
+        if self.cache is not None:
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                logger.info(f"Returning cached result for: {url}")
+                report_stage("cache_hit")
+                cached["url"] = url
+                return cached
         
+        # Concurrent requests for the same post (retries, duplicate tool calls) share one
+        # extraction, run under the deadline of the caller that started it. Callers that join
+        # it wait no longer than their own deadline, and each gets its own copy of the result.
+        deadline = Deadline(timeout)
+        while True:
+            try:
+                result = await self.post_flights.do(
+                    cache_key, lambda: self._extract_and_cache(url, cache_key, deadline),
+                    timeout=deadline.remaining(),
+                )
+            except asyncio.TimeoutError:
+                result = self._failure_result(url, f"Extraction timed out after {timeout:g}s")
+                result["timed_out"] = True
+                return result
+            if result.get("timed_out") and not deadline.expired:
+                # The shared extraction ran out of a shorter budget than ours: run again with what is left
+                logger.info(f"Joined extraction of {url} timed out early, retrying with the remaining budget")
+                continue
+            return {**result, "url": url}
+
+    async def _extract_and_cache(self, url: str, cache_key: str, deadline: Deadline) -> Dict[str, Any]:
+        """Run the extraction tiers for a post that is not cached, caching complete results."""
         logger.info(f"Extracting text, links, and images from: {url}")
         
-        # Try requests first (faster for public posts)
-        text, link, post_image = self._extract_with_requests(url)
+        text, link, post_image, method = await self._extract_with_tiers(url, deadline)
+        timed_out = deadline.expired
         
         if text:
-            logger.info("Successfully extracted content using requests")
+            logger.info(f"Successfully extracted content using {method}")
             link_img = self._generate_link_img(link, post_image)
             
             result = {
@@ -486,31 +606,77 @@ class LinkedInExtractor:
             }
             result["link"] = link
             result["link_img"] = link_img
+            if timed_out:
+                # Possibly incomplete, so it is not cached
+                result["timed_out"] = True
+            elif self.cache is not None:
+                await self.cache.aset(cache_key, result)
             return result
         
-        # Fall back to Playwright for JavaScript-heavy content
-        logger.info("Falling back to Playwright extraction")
-        text, link, post_image = await self._extract_with_playwright(url)
-        
-        if text:
-            logger.info("Successfully extracted content using Playwright")
-            link_img = self._generate_link_img(link, post_image)
-            
-            result = {
-                "url": url,
-                "text": text,
-                "success": True
-            }
-            result["link"] = link
-            result["link_img"] = link_img
+        if timed_out:
+            result = self._failure_result(url, f"Extraction timed out after {deadline.seconds:g}s")
+            result["timed_out"] = True
             return result
         
         # No text found
-        return {
-            "url": url,
-            "text": None,
-            "link": None,
-            "link_img": None,
-            "error": "Could not extract text from post. Post may be private or unavailable.",
-            "success": False
-        }
\ No newline at end of file
+        return self._failure_result(
+            url, "Could not extract text from post. Post may be private or unavailable."
+        )
+
+    async def _extract_post_text_safely(self, url: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run extract_post_text, converting unexpected exceptions into a failure result."""
+        try:
+            return await self.extract_post_text(url, timeout)
+        except Exception as e:
+            logger.error(f"Extraction failed for {url}: {e}")
+            return self._failure_result(url, str(e))
+
+    async def iter_extract_many(
+        self, urls: List[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY, timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Extract several posts concurrently, yielding results as they finish.
+        
+        Args:
+            urls: LinkedIn post URLs
+            concurrency: Maximum number of extractions running at once
+            timeout: Budget in seconds for each post, counted from when its extraction starts
+            
+        Yields:
+            (index, result) tuples, where index is the position of the URL in `urls`
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run(index: int, url: str) -> Tuple[int, Dict[str, Any]]:
+            async with semaphore:
+                return index, await self._extract_post_text_safely(url, timeout)
+        
+        tasks = [asyncio.create_task(run(index, url)) for index, url in enumerate(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Don't leave extractions running if the consumer stops early
+            for task in tasks:
+                task.cancel()
+
+    async def extract_many(
+        self, urls: List[str], concurrency: int = DEFAULT_BATCH_CONCURRENCY, timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract several posts concurrently.
+        
+        Args:
+            urls: LinkedIn post URLs
+            concurrency: Maximum number of extractions running at once
+            timeout: Budget in seconds for each post, counted from when its extraction starts
+            
+        Returns:
+            One result dictionary per URL, in the same order as `urls`. A failing
+            URL gets a result with 'success' False and an 'error' message instead
+            of failing the whole batch.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        async for index, result in self.iter_extract_many(urls, concurrency, timeout):
+            results[index] = result
+        return results
\ No newline at end of file
@@ -0,0 +1,297 @@
+"""
+JSON-RPC dispatch core shared by every MCP server entry point.
+Methods and tools are looked up in registries and the static `initialize` / `list_tools`
+results are built once. The HTTP, stdio and debug servers are thin adapters: they decode
+messages, pass them to MCPDispatcher and write back whatever it returns.
+"""
+
+import contextlib
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from admission import SERVER_BUSY, AdmissionController, ServerBusy
+from batch_tool import (
+    BATCH_TOOL_SCHEMA, Notify, ProgressCallback, parse_batch_arguments, progress_reporter,
+    run_batch_tool,
+)
+from deadline import parse_timeout
+from jsonrpc import error_response, handle_batch, is_notification
+from linkedin_extractor import LinkedInExtractor
+from serialization import parse_pretty, resolve_serializer
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = "2024-11-05"
+SERVER_INFO = {"name": "linkedin-post-extractor", "version": "1.0.0"}
+
+POST_TEXT_TOOL_SCHEMA = {
+    "name": "get_linkedin_post_text",
+    "description": "Extract text content from a LinkedIn post URL",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "url": {
+                "type": "string",
+                "description": "The LinkedIn post URL to extract text from"
+            },
+            "timeout": {
+                "type": "number",
+                "description": "Overall time budget in seconds (default 50). When it runs out, whatever was found is returned with timed_out set"
+            },
+            "pretty": {
+                "type": "boolean",
+                "description": "Indent the JSON result (default false: compact)"
+            }
+        },
+        "required": ["url"]
+    }
+}
+
+# Handles one request object (and may notify the client) and returns its response
+RequestHandler = Callable[[Dict[str, Any], Optional[Notify]], Awaitable[Dict[str, Any]]]
+
+# Gets a method's params (and a way to notify the client) and returns the result
+MethodHandler = Callable[[Dict[str, Any], Optional[Notify]], Awaitable[Any]]
+
+# Gets a tool's arguments (and a progress callback if the client asked for progress)
+# and returns the tool result
+ToolHandler = Callable[[Dict[str, Any], Optional[ProgressCallback]], Awaitable[Dict[str, Any]]]
+
+
+class RPCError(Exception):
+    """Raised by a method or tool handler to answer with a JSON-RPC error instead of a result."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class MCPDispatcher:
+    """
+    Routes JSON-RPC requests to registered method and tool handlers.
+
+    `serializer` encodes tool results and is what the adapters use to decode requests and
+    encode responses (orjson when installed, see serialization.py). With `admission`, every
+    extraction first takes a slot from it, and requests it refuses get a "Server busy" error.
+    """
+
+    def __init__(
+        self,
+        extractor: LinkedInExtractor,
+        serializer=None,
+        admission: Optional[AdmissionController] = None,
+    ):
+        self.extractor = extractor
+        self.serializer = serializer or resolve_serializer()
+        self.admission = admission
+        self._methods: Dict[str, MethodHandler] = {}
+        self._tools: Dict[str, Tuple[Dict[str, Any], ToolHandler]] = {}
+        self._list_tools_result: Optional[Dict[str, Any]] = None
+        self._method_stats: Dict[str, Dict[str, float]] = {}
+
+        self._initialize_result = {
+            "protocolVersion": PROTOCOL_VERSION,
+            "serverInfo": SERVER_INFO,
+            "capabilities": {
+                "tools": {}
+            }
+        }
+
+        self.register_method("initialize", self._initialize)
+        self.register_method("list_tools", self._list_tools)
+        self.register_method("call_tool", self._call_tool)
+        self.register_method("get_linkedin_post_text", self._get_post_text)
+        self.register_method("get_stats", self._get_stats)
+        self.register_tool(POST_TEXT_TOOL_SCHEMA, self._post_text_tool)
+        self.register_tool(BATCH_TOOL_SCHEMA, self._posts_batch_tool)
+
+    def register_method(self, name: str, handler: MethodHandler):
+        """Add (or replace) a JSON-RPC method."""
+        self._methods[name] = handler
+
+    def register_tool(self, schema: Dict[str, Any], handler: ToolHandler):
+        """Add (or replace) a tool; `schema` is what list_tools advertises for it."""
+        self._tools[schema["name"]] = (schema, handler)
+        self._list_tools_result = None
+
+    async def handle_request(self, request: Dict[str, Any], notify: Optional[Notify] = None) -> Dict[str, Any]:
+        """Handle one request object. `notify` sends progress notifications while a tool runs."""
+        request_id = request.get("id")
+        method = request.get("method")
+        if not isinstance(method, str):
+            return error_response(request_id, -32600, "Invalid Request")
+        handler = self._methods.get(method)
+        if handler is None:
+            return error_response(request_id, -32601, f"Method not found: {method}")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return error_response(request_id, -32602, "Invalid params: params must be an object")
+
+        logger.info(f"Received MCP request: {method}")
+        start = time.perf_counter()
+        try:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": await handler(params, notify)}
+        except RPCError as e:
+            response = error_response(request_id, e.code, e.message, e.data)
+        except ServerBusy as e:
+            response = error_response(request_id, SERVER_BUSY, f"Server busy: {e}", {"retry_after": e.retry_after})
+        except Exception as e:
+            logger.error(f"Error handling MCP request: {e}")
+            response = error_response(request_id, -32603, "Internal error", str(e))
+        self._record(method, time.perf_counter() - start, "error" in response)
+        return response
+
+    async def _handle_single(
+        self, payload: Any, notify: Optional[Notify], handle_request: RequestHandler
+    ) -> Dict[str, Any]:
+        """Handle one batch entry or message; anything but an object is an invalid request."""
+        if not isinstance(payload, dict):
+            return error_response(None, -32600, "Invalid Request")
+        return await handle_request(payload, notify)
+
+    async def handle_message(
+        self,
+        payload: Any,
+        notify: Optional[Notify] = None,
+        handle_request: Optional[RequestHandler] = None,
+    ) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Handle a decoded JSON-RPC message: a single request object, or a batch array whose
+        entries run concurrently. Returns None when nothing needs an answer: a notification,
+        or a batch holding only notifications.
+
+        Each request object goes through `handle_request` (this dispatcher's own by default),
+        so an adapter can wrap every request, e.g. to log it.
+        """
+        handle_request = handle_request or self.handle_request
+        if isinstance(payload, list):
+            return await handle_batch(payload, lambda entry: self._handle_single(entry, notify, handle_request))
+        response = await self._handle_single(payload, notify, handle_request)
+        return None if is_notification(payload) else response
+
+    def _record(self, method: str, elapsed: float, failed: bool):
+        stats = self._method_stats.get(method)
+        if stats is None:
+            stats = self._method_stats[method] = {"calls": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0}
+        stats["calls"] += 1
+        stats["errors"] += failed
+        stats["total_s"] += elapsed
+        stats["max_s"] = max(stats["max_s"], elapsed)
+
+    def dispatch_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return call and error counts and handler time per method."""
+        return {
+            method: {
+                "calls": stats["calls"],
+                "errors": stats["errors"],
+                "avg_ms": round(stats["total_s"] * 1000 / stats["calls"], 3),
+                "max_ms": round(stats["max_s"] * 1000, 3),
+            }
+            for method, stats in self._method_stats.items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Extractor statistics plus per-method dispatch timings (and admission counters, if enabled)."""
+        stats = {**self.extractor.get_stats(), "dispatch": self.dispatch_stats()}
+        if self.admission is not None:
+            stats["admission"] = self.admission.get_stats()
+        return stats
+
+    async def _initialize(self, params: Dict[str, Any], notify: Optional[Notify] = None) -> Dict[str, Any]:
+        return self._initialize_result
+
+    async def _list_tools(self, params: Dict[str, Any], notify: Optional[Notify] = None) -> Dict[str, Any]:
+        if self._list_tools_result is None:
+            self._list_tools_result = {"tools": [schema for schema, _ in self._tools.values()]}
+        return self._list_tools_result
+
+    async def _get_stats(self, params: Dict[str, Any], notify: Optional[Notify] = None) -> Dict[str, Any]:
+        return self.get_stats()
+
+    async def _call_tool(self, params: Dict[str, Any], notify: Optional[Notify] = None) -> Dict[str, Any]:
+        if not params:
+            raise RPCError(-32602, "Invalid params: params required")
+        tool_name = params.get("name")
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            raise RPCError(-32601, f"Unknown tool: {tool_name}")
+        arguments = params.get("arguments") or {}
+        if not isinstance(arguments, dict):
+            raise RPCError(-32602, "Invalid params: arguments must be an object")
+        meta = params.get("_meta") or {}
+        if not isinstance(meta, dict):
+            raise RPCError(-32602, "Invalid params: _meta must be an object")
+        progress_token = meta.get("progressToken")
+        _, handler = tool
+        return await handler(arguments, progress_reporter(progress_token, notify))
+
+    def _url_and_timeout(self, params: Dict[str, Any]) -> Tuple[str, Optional[float]]:
+        url = params.get("url")
+        if not url:
+            raise RPCError(-32602, "Invalid params: url required")
+        try:
+            return url, parse_timeout(params.get("timeout"))
+        except ValueError as e:
+            raise RPCError(-32602, f"Invalid params: {e}")
+
+    @contextlib.asynccontextmanager
+    async def _extraction_slot(self, timeout: Optional[float] = None, weight: int = 1) -> AsyncIterator[Optional[float]]:
+        """
+        Hold `weight` admission slots (raising ServerBusy if refused) and yield what is left of
+        `timeout` after waiting for them, so queueing doesn't stretch the caller's budget.
+        """
+        if self.admission is None:
+            yield timeout
+            return
+        queued_at = time.monotonic()
+        async with self.admission.slot(weight, wait_limit=timeout):
+            yield None if timeout is None else max(0.001, timeout - (time.monotonic() - queued_at))
+
+    async def _extract(self, url: str, timeout: Optional[float]) -> Dict[str, Any]:
+        async with self._extraction_slot(timeout) as timeout:
+            try:
+                return await self.extractor.extract_post_text(url, timeout)
+            except Exception as e:
+                logger.error(f"Error extracting post text: {e}")
+                raise RPCError(-32603, "Failed to extract post text", str(e))
+
+    async def _get_post_text(self, params: Dict[str, Any], notify: Optional[Notify] = None) -> Dict[str, Any]:
+        """Direct get_linkedin_post_text method call (legacy support): the raw extraction result."""
+        return await self._extract(*self._url_and_timeout(params))
+
+    def _text_result(self, result: Any, pretty: bool) -> Dict[str, Any]:
+        """Encode `result` once, compact unless the call asked for `pretty`, as MCP text content."""
+        return {
+            "content": [
+                {
+                    "type": "text",
+                    "text": self.serializer.dumps(result, pretty)
+                }
+            ]
+        }
+
+    async def _post_text_tool(
+        self, arguments: Dict[str, Any], on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        try:
+            pretty = parse_pretty(arguments.get("pretty"))
+        except ValueError as e:
+            raise RPCError(-32602, f"Invalid params: {e}")
+        url, timeout = self._url_and_timeout(arguments)
+        result = await self._extract(url, timeout)
+        return self._text_result(result, pretty)
+
+    async def _posts_batch_tool(
+        self, arguments: Dict[str, Any], on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        try:
+            urls, concurrency, timeout, pretty = parse_batch_arguments(arguments)
+        except ValueError as e:
+            raise RPCError(-32602, f"Invalid params: {e}")
+        # The whole call is admitted at once, holding a slot per post it extracts in parallel
+        async with self._extraction_slot(weight=min(concurrency, len(urls))):
+            combined = await run_batch_tool(self.extractor, urls, concurrency, timeout, on_progress)
+        return self._text_result(combined, pretty)
@@ -1,329 +1,255 @@
 """
 MCP Server implementation for LinkedIn post text extraction.
 Implements the Model Context Protocol specification with FastAPI.
+Requests are handled by the shared dispatch core (mcp_dispatch.py); this module is the HTTP adapter.
+Long extractions can also run as background jobs (jobs.py) that clients poll or follow over SSE.
+FastAPI and uvicorn are only imported when the HTTP app is used, so stdio mode starts quickly.
+For several worker processes, serve create_app() with uvicorn --factory --workers N (or
+gunicorn with uvicorn workers); the workers share caches and job state through SQLite.
 """
 
 import asyncio
-import json
+import contextlib
 import logging
-from typing import Any, Dict, List, Optional
-
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
-import uvicorn
+import os
+from typing import Any, Dict, Optional
 
+from admission import (
+    DEFAULT_MAX_CONCURRENT_EXTRACTIONS, DEFAULT_MAX_QUEUED_EXTRACTIONS, DEFAULT_QUEUE_WAIT, SERVER_BUSY,
+    AdmissionController,
+)
+from cache import DEFAULT_CACHE_PATH
+from jobs import (
+    DEFAULT_JOB_TTL, DEFAULT_JOB_WORKERS, DEFAULT_MAX_QUEUED_JOBS, JobManager, JobQueueFull, JobStore,
+    parse_job_request,
+)
+from jsonrpc import error_response
 from linkedin_extractor import LinkedInExtractor
+from mcp_dispatch import MCPDispatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
-class MCPRequest(BaseModel):
-    """MCP request model."""
-    jsonrpc: str = Field(default="2.0")
-    id: Optional[str] = None
-    method: str
-    params: Optional[Dict[str, Any]] = None
-
-
-class MCPResponse(BaseModel):
-    """MCP response model."""
-    jsonrpc: str = Field(default="2.0")
-    id: Optional[str] = None
-    result: Optional[Dict[str, Any]] = None
-    error: Optional[Dict[str, Any]] = None
-
-
-class MCPError(BaseModel):
-    """MCP error model."""
-    code: int
-    message: str
-    data: Optional[Any] = None
+# Worker processes for the HTTP server started by main()
+DEFAULT_WORKERS = int(os.environ.get('LINKEDIN_MCP_WORKERS', '1'))
 
 
 class LinkedInMCPServer:
     """MCP Server for LinkedIn post text extraction."""
     
-    def __init__(self):
-        self.app = FastAPI(
-            title="LinkedIn Post Text Extractor MCP Server",
-            description="MCP server for extracting text content from LinkedIn posts",
-            version="1.0.0"
+    def __init__(
+        self,
+        max_concurrent_extractions: int = DEFAULT_MAX_CONCURRENT_EXTRACTIONS,
+        max_queued_extractions: int = DEFAULT_MAX_QUEUED_EXTRACTIONS,
+        queue_wait: float = DEFAULT_QUEUE_WAIT,
+        max_browser_pages: int = 2,
+        job_workers: int = DEFAULT_JOB_WORKERS,
+        max_queued_jobs: int = DEFAULT_MAX_QUEUED_JOBS,
+        job_ttl: float = DEFAULT_JOB_TTL,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+        share_jobs: bool = False,
+    ):
+        """
+        Args:
+            max_concurrent_extractions: Extractions running at once across all requests and jobs
+            max_queued_extractions: Requests waiting for an extraction slot before new ones get "Server busy"
+            queue_wait: Longest a request waits for an extraction slot
+            max_browser_pages: Concurrent Playwright fallbacks, a separate and usually smaller cap
+            job_workers: Background jobs extracted at once
+            max_queued_jobs: Jobs waiting for a worker before POST /jobs answers 503
+            job_ttl: Seconds a finished job stays retrievable
+            cache_path: SQLite file for cached results, or None to disable caching
+            share_jobs: Also keep job state in `cache_path`, so other worker processes can answer for jobs
+        """
+        self.admission = AdmissionController(max_concurrent_extractions, max_queued_extractions, queue_wait)
+        extractor = LinkedInExtractor(max_browser_pages=max_browser_pages, cache_path=cache_path)
+        self.core = MCPDispatcher(extractor, admission=self.admission)
+        self.jobs = JobManager(
+            self._run_job,
+            workers=job_workers,
+            max_queued=max_queued_jobs,
+            ttl=job_ttl,
+            store=JobStore(cache_path) if share_jobs and cache_path else None,
         )
-        self.extractor = LinkedInExtractor()
-        self._setup_routes()
+        self._app = None
     
-    def _setup_routes(self):
-        """Set up FastAPI routes for MCP protocol."""
-        
-        @self.app.post("/mcp", response_model=MCPResponse)
-        async def handle_mcp_request(request: MCPRequest) -> MCPResponse:
-            """Handle incoming MCP requests."""
-            try:
-                logger.info(f"Received MCP request: {request.method}")
-                
-                if request.method == "initialize":
-                    return await self._handle_initialize(request)
-                elif request.method == "get_linkedin_post_text":
-                    return await self._handle_get_post_text(request)
-                elif request.method == "list_tools":
-                    return await self._handle_list_tools(request)
-                elif request.method == "call_tool":
-                    return await self._handle_call_tool(request)
-                else:
-                    return MCPResponse(
-                        id=request.id,
-                        error={
-                            "code": -32601,
-                            "message": f"Method not found: {request.method}"
-                        }
-                    )
-                    
-            except Exception as e:
-                logger.error(f"Error handling MCP request: {e}")
-                return MCPResponse(
-                    id=request.id,
-                    error={
-                        "code": -32603,
-                        "message": "Internal error",
-                        "data": str(e)
-                    }
-                )
-        
-        @self.app.get("/health")
-        async def health_check():
-            """Health check endpoint."""
-            return {"status": "healthy", "service": "linkedin-mcp-server"}
+    @property
+    def extractor(self) -> LinkedInExtractor:
+        return self.core.extractor
     
-    async def _handle_initialize(self, request: MCPRequest) -> MCPResponse:
-        """Handle MCP initialize request."""
-        return MCPResponse(
-            id=request.id,
-            result={
-                "protocolVersion": "2024-11-05",
-                "serverInfo": {
-                    "name": "linkedin-post-extractor",
-                    "version": "1.0.0"
-                },
-                "capabilities": {
-                    "tools": {}
-                }
-            }
-        )
+    @extractor.setter
+    def extractor(self, extractor: LinkedInExtractor):
+        self.core.extractor = extractor
     
-    async def _handle_list_tools(self, request: MCPRequest) -> MCPResponse:
-        """Handle list_tools request."""
-        return MCPResponse(
-            id=request.id,
-            result={
-                "tools": [
-                    {
-                        "name": "get_linkedin_post_text",
-                        "description": "Extract text content from a LinkedIn post URL",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "url": {
-                                    "type": "string",
-                                    "description": "The LinkedIn post URL to extract text from"
-                                }
-                            },
-                            "required": ["url"]
-                        }
-                    }
-                ]
-            }
-        )
+    async def _run_job(self, url: str, timeout: Optional[float]) -> Dict[str, Any]:
+        # Jobs are already bounded by their own queue, so they wait for a slot instead of being refused.
+        # The extractor is looked up per job, so swapping `extractor` also applies to jobs
+        async with self.admission.slot(shed=False):
+            return await self.extractor.extract_post_text(url, timeout)
     
-    async def _handle_call_tool(self, request: MCPRequest) -> MCPResponse:
-        """Handle call_tool request."""
-        if not request.params:
-            return MCPResponse(
-                id=request.id,
-                error={
-                    "code": -32602,
-                    "message": "Invalid params: params required"
-                }
+    @property
+    def app(self):
+        """The FastAPI application, built on first access so stdio mode never constructs it."""
+        if self._app is None:
+            from fastapi import FastAPI
+            self._app = FastAPI(
+                title="LinkedIn Post Text Extractor MCP Server",
+                description="MCP server for extracting text content from LinkedIn posts",
+                version="1.0.0",
+                lifespan=self._lifespan
             )
+            self._setup_routes(self._app)
+        return self._app
+    
+    @contextlib.asynccontextmanager
+    async def _lifespan(self, app):
+        """Stop the job workers, then shut down the shared browser and HTTP connections when the server exits."""
+        yield
+        await self.jobs.aclose()
+        await self.extractor.aclose()
+    
+    def _setup_routes(self, app):
+        """Set up FastAPI routes for MCP protocol."""
+        from fastapi import HTTPException, Request, Response
+        from fastapi.responses import StreamingResponse
         
-        tool_name = request.params.get("name")
-        arguments = request.params.get("arguments", {})
+        serializer = self.core.serializer
         
-        if tool_name == "get_linkedin_post_text":
-            return await self._handle_get_post_text_tool(request.id, arguments)
-        else:
-            return MCPResponse(
-                id=request.id,
-                error={
-                    "code": -32601,
-                    "message": f"Unknown tool: {tool_name}"
-                }
-            )
-    
-    async def _handle_get_post_text_tool(self, request_id: Optional[str], arguments: Dict[str, Any]) -> MCPResponse:
-        """Handle the get_linkedin_post_text tool call."""
-        url = arguments.get("url")
-        if not url:
-            return MCPResponse(
-                id=request_id,
-                error={
-                    "code": -32602,
-                    "message": "Invalid params: url required"
-                }
+        def json_response(content, status_code: int = 200, headers=None) -> Response:
+            return Response(
+                content=serializer.dumps_bytes(content),
+                status_code=status_code,
+                media_type="application/json",
+                headers=headers,
             )
         
-        try:
-            result = await self.extractor.extract_post_text(url)
-            return MCPResponse(
-                id=request_id,
-                result={
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps(result, indent=2)
-                        }
-                    ]
-                }
-            )
-        except Exception as e:
-            logger.error(f"Error extracting post text: {e}")
-            return MCPResponse(
-                id=request_id,
-                error={
-                    "code": -32603,
-                    "message": "Failed to extract post text",
-                    "data": str(e)
-                }
-            )
-    
-    async def _handle_get_post_text(self, request: MCPRequest) -> MCPResponse:
-        """Handle direct get_linkedin_post_text method call (legacy support)."""
-        if not request.params:
-            return MCPResponse(
-                id=request.id,
-                error={
-                    "code": -32602,
-                    "message": "Invalid params: url required"
-                }
-            )
+        async def find_job(job_id: str) -> Dict[str, Any]:
+            snapshot = await self.jobs.snapshot(job_id)
+            if snapshot is None:
+                raise HTTPException(status_code=404, detail="Unknown or expired job")
+            return snapshot
         
-        url = request.params.get("url")
-        if not url:
-            return MCPResponse(
-                id=request.id,
-                error={
-                    "code": -32602,
-                    "message": "Invalid params: url required"
-                }
-            )
+        @app.post("/mcp")
+        async def handle_mcp_request(request: Request):
+            """Handle incoming MCP requests (a single request or a JSON-RPC batch array)."""
+            try:
+                payload = serializer.loads(await request.body())
+            except ValueError as e:
+                logger.error(f"Invalid JSON request: {e}")
+                response = error_response(None, -32700, "Parse error")
+            else:
+                response = await self.core.handle_message(payload)
+                if response is None:
+                    # A batch made up only of notifications gets no response body
+                    return Response(status_code=204)
+                error = response.get("error") if isinstance(response, dict) else None
+                if error and error["code"] == SERVER_BUSY:
+                    # The JSON-RPC error carries the hint too; this is for HTTP-level retry logic
+                    return json_response(response, headers={"Retry-After": str(error["data"]["retry_after"])})
+            return json_response(response)
         
-        try:
-            result = await self.extractor.extract_post_text(url)
-            return MCPResponse(
-                id=request.id,
-                result=result
-            )
-        except Exception as e:
-            logger.error(f"Error extracting post text: {e}")
-            return MCPResponse(
-                id=request.id,
-                error={
-                    "code": -32603,
-                    "message": "Failed to extract post text",
-                    "data": str(e)
-                }
+        @app.post("/jobs", status_code=202)
+        async def submit_job(request: Request):
+            """Queue a post extraction and return its job ID without waiting for it."""
+            try:
+                url, timeout = parse_job_request(serializer.loads(await request.body()))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            try:
+                job = self.jobs.submit(url, timeout)
+            except JobQueueFull as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+            return json_response({
+                "job_id": job.id,
+                "status": job.status,
+                "poll": f"/jobs/{job.id}",
+                "events": f"/jobs/{job.id}/events",
+            }, status_code=202)
+        
+        @app.get("/jobs/{job_id}")
+        async def get_job(job_id: str):
+            """Current status, stages so far and (once finished) the result of a job."""
+            return json_response(await find_job(job_id))
+        
+        @app.get("/jobs/{job_id}/events")
+        async def follow_job(job_id: str, request: Request):
+            """
+            Server-Sent Events: one `stage` event per stage as the job reaches it, then a
+            `result` event with the finished job. A reconnecting client sends Last-Event-ID
+            and only gets the stages it missed.
+            """
+            await find_job(job_id)
+            last_event_id = request.headers.get("last-event-id", "")
+            after = int(last_event_id) + 1 if last_event_id.isdigit() else 0
+            
+            async def stream():
+                async for update in self.jobs.follow(job_id, after):
+                    if update is None:
+                        # Comment line that keeps proxies from closing an idle stream
+                        yield ": keep-alive\n\n"
+                        continue
+                    index, event = update
+                    yield f"id: {index}\nevent: stage\ndata: {serializer.dumps(event)}\n\n"
+                finished = await self.jobs.snapshot(job_id)
+                if finished is not None:
+                    yield f"event: result\ndata: {serializer.dumps(finished)}\n\n"
+            
+            return StreamingResponse(
+                stream(),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
             )
+        
+        @app.get("/health")
+        async def health_check():
+            """Health check endpoint."""
+            return {
+                "status": "healthy",
+                "service": "linkedin-mcp-server",
+                # Each worker process reports its own counters; the caches are shared
+                "worker_pid": os.getpid(),
+                "stats": {**self.core.get_stats(), "jobs": self.jobs.get_stats()}
+            }
     
     def run(self, host: str = "0.0.0.0", port: int = 8000):
-        """Run the MCP server."""
+        """Run the MCP server in this process."""
+        import uvicorn
+        
         logger.info(f"Starting LinkedIn MCP Server on {host}:{port}")
         uvicorn.run(self.app, host=host, port=port)
 
 
-async def run_stdio():
-    """Run the MCP server using stdio communication for IDE integration."""
-    import sys
-    import concurrent.futures
-    
-    # Configure logging to stderr so it doesn't interfere with stdio communication
-    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
-    logger = logging.getLogger(__name__)
+def create_app(**kwargs):
+    """
+    Application factory for multi-process serving; each worker process calls it once:
     
-    server = LinkedInMCPServer()
-    logger.info("Starting LinkedIn MCP Server in stdio mode")
+        uvicorn mcp_server:create_app --factory --workers 4
     
-    # Use a thread executor for stdin reading on Windows
-    loop = asyncio.get_event_loop()
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    Every worker has its own server, extractor and admission limits. Extraction and redirect
+    caches and job state live in the shared SQLite file, so a post extracted by one worker
+    is a cache hit for the others and any worker can answer for any job.
+    """
+    kwargs.setdefault("share_jobs", True)
+    return LinkedInMCPServer(**kwargs).app
+
+
+def run_workers(workers: int, host: str = "0.0.0.0", port: int = 8000):
+    """Run the HTTP server as `workers` processes behind one listening socket."""
+    import uvicorn
     
-    def read_line():
-        """Read a line from stdin in a thread."""
-        try:
-            return sys.stdin.readline()
-        except EOFError:
-            return None
+    logger.info(f"Starting LinkedIn MCP Server on {host}:{port} with {workers} workers")
+    uvicorn.run("mcp_server:create_app", factory=True, host=host, port=port, workers=workers)
+
+
+async def run_stdio():
+    """Run the MCP server using stdio communication for IDE integration."""
+    # The stdio server handles the same methods and tools without building the FastAPI app,
+    # so the IDE gets its `initialize` response sooner
+    from mcp_stdio_server import LinkedInMCPStdioServer
     
-    try:
-        while True:
-            try:
-                # Read request from stdin asynchronously using thread executor
-                line = await loop.run_in_executor(executor, read_line)
-                if not line:
-                    break
-                
-                line = line.strip()
-                if not line:
-                    continue
-                
-                # Parse JSON request
-                request_data = json.loads(line)
-                
-                # Create MCPRequest object
-                request = MCPRequest(**request_data)
-                
-                # Handle request using existing FastAPI handler logic
-                if request.method == "initialize":
-                    response = await server._handle_initialize(request)
-                elif request.method == "get_linkedin_post_text":
-                    response = await server._handle_get_post_text(request)
-                elif request.method == "list_tools":
-                    response = await server._handle_list_tools(request)
-                elif request.method == "call_tool":
-                    response = await server._handle_call_tool(request)
-                else:
-                    response = MCPResponse(
-                        id=request.id,
-                        error={
-                            "code": -32601,
-                            "message": f"Method not found: {request.method}"
-                        }
-                    )
-                
-                # Convert response to dict and send to stdout
-                if hasattr(response, 'dict'):
-                    response_dict = response.dict(exclude_none=True)
-                else:
-                    response_dict = response
-                
-                print(json.dumps(response_dict), flush=True)
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON request: {e}")
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {
-                        "code": -32700,
-                        "message": "Parse error"
-                    }
-                }
-                print(json.dumps(error_response), flush=True)
-            except Exception as e:
-                logger.error(f"Unexpected error: {e}")
-                break
-    finally:
-        executor.shutdown(wait=True)
+    server = LinkedInMCPStdioServer()
+    await server.run_stdio()
 
 
 def main():
@@ -333,8 +259,11 @@ def main():
     # Check if stdin is available (IDE integration) or if we should run HTTP server
     if sys.stdin.isatty():
         # Running interactively, start HTTP server
-        server = LinkedInMCPServer()
-        server.run()
+        if DEFAULT_WORKERS > 1:
+            run_workers(DEFAULT_WORKERS)
+        else:
+            server = LinkedInMCPServer()
+            server.run()
     else:
         # Running via IDE/MCP client, use stdio
         asyncio.run(run_stdio())
@@ -2,216 +2,101 @@
 """
 MCP Server stdio launcher for LinkedIn post text extraction.
 This version communicates via stdin/stdout for IDE integration.
+Requests are handled by the shared dispatch core (mcp_dispatch.py); this module is the stdio adapter.
 """
 
 import asyncio
 import sys
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Set, Union
 
+from batch_tool import Notify
+from cache import DEFAULT_CACHE_PATH
 from linkedin_extractor import LinkedInExtractor
+from mcp_dispatch import MCPDispatcher
+from stdio_transport import MessageTooLarge, open_stdio_transport
 
 # Configure logging to stderr so it doesn't interfere with stdio communication
 logging.basicConfig(level=logging.INFO, stream=sys.stderr)
 logger = logging.getLogger(__name__)
 
+# Requests handled at once; reading stdin pauses while this many are in flight
+DEFAULT_MAX_IN_FLIGHT = 8
+
 
 class LinkedInMCPStdioServer:
     """MCP Server for LinkedIn post text extraction via stdio."""
     
-    def __init__(self):
-        self.extractor = LinkedInExtractor()
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
+        """
+        Args:
+            max_in_flight: Requests handled at once
+            cache_path: SQLite file for cached results, or None to disable caching
+        """
+        self.core = MCPDispatcher(LinkedInExtractor(cache_path=cache_path))
+        self.max_in_flight = max(1, max_in_flight)
     
-    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle incoming MCP requests."""
-        try:
-            logger.info(f"Received MCP request: {request.get('method', 'unknown')}")
-            
-            if request.get("method") == "initialize":
-                return await self._handle_initialize(request)
-            elif request.get("method") == "get_linkedin_post_text":
-                return await self._handle_get_post_text(request)
-            elif request.get("method") == "list_tools":
-                return await self._handle_list_tools(request)
-            elif request.get("method") == "call_tool":
-                return await self._handle_call_tool(request)
-            else:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "error": {
-                        "code": -32601,
-                        "message": f"Method not found: {request.get('method', 'unknown')}"
-                    }
-                }
-        except Exception as e:
-            logger.error(f"Error handling MCP request: {e}")
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "error": {
-                    "code": -32603,
-                    "message": "Internal error",
-                    "data": str(e)
-                }
-            }
+    @property
+    def extractor(self) -> LinkedInExtractor:
+        return self.core.extractor
     
-    async def _handle_initialize(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle MCP initialize request."""
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id"),
-            "result": {
-                "protocolVersion": "2024-11-05",
-                "serverInfo": {
-                    "name": "linkedin-post-extractor",
-                    "version": "1.0.0"
-                },
-                "capabilities": {
-                    "tools": {}
-                }
-            }
-        }
+    @extractor.setter
+    def extractor(self, extractor: LinkedInExtractor):
+        self.core.extractor = extractor
     
-    async def _handle_list_tools(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle list_tools request."""
-        return {
-            "jsonrpc": "2.0",
-            "id": request.get("id"),
-            "result": {
-                "tools": [
-                    {
-                        "name": "get_linkedin_post_text",
-                        "description": "Extract text content from a LinkedIn post URL",
-                        "inputSchema": {
-                            "type": "object",
-                            "properties": {
-                                "url": {
-                                    "type": "string",
-                                    "description": "The LinkedIn post URL to extract text from"
-                                }
-                            },
-                            "required": ["url"]
-                        }
-                    }
-                ]
-            }
-        }
+    async def handle_request(self, request: Dict[str, Any], notify: Optional[Notify] = None) -> Dict[str, Any]:
+        """Handle incoming MCP requests. `notify` sends progress notifications while a tool runs."""
+        return await self.core.handle_request(request, notify)
     
-    async def _handle_call_tool(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle call_tool request."""
-        params = request.get("params", {})
-        tool_name = params.get("name")
-        arguments = params.get("arguments", {})
-        
-        if tool_name == "get_linkedin_post_text":
-            return await self._handle_get_post_text_tool(request.get("id"), arguments)
-        else:
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "error": {
-                    "code": -32601,
-                    "message": f"Unknown tool: {tool_name}"
-                }
-            }
+    async def handle_message(
+        self, payload: Any, notify: Optional[Notify] = None
+    ) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Handle a single request object or a batch array (None when nothing needs an answer).
+        Every request object goes through handle_request, so subclasses can override it.
+        """
+        return await self.core.handle_message(payload, notify, self.handle_request)
     
-    async def _handle_get_post_text_tool(self, request_id: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle the get_linkedin_post_text tool call."""
-        url = arguments.get("url")
-        if not url:
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {
-                    "code": -32602,
-                    "message": "Invalid params: url required"
-                }
-            }
-        
-        try:
-            result = await self.extractor.extract_post_text(url)
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "result": {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps(result, indent=2)
-                        }
-                    ]
-                }
-            }
-        except Exception as e:
-            logger.error(f"Error extracting post text: {e}")
-            return {
-                "jsonrpc": "2.0",
-                "id": request_id,
-                "error": {
-                    "code": -32603,
-                    "message": "Failed to extract post text",
-                    "data": str(e)
-                }
-            }
+    async def _write_responses(self, queue: asyncio.Queue, transport):
+        """Single stdout writer: each response goes out as one whole line, in completion order."""
+        while True:
+            response = await queue.get()
+            if response is None:
+                break
+            try:
+                await transport.write_message(self.core.serializer.dumps_bytes(response))
+            except Exception as e:
+                logger.error(f"Failed to write response: {e}")
     
-    async def _handle_get_post_text(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle direct get_linkedin_post_text method call (legacy support)."""
-        params = request.get("params", {})
-        url = params.get("url")
-        if not url:
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "error": {
-                    "code": -32602,
-                    "message": "Invalid params: url required"
-                }
-            }
-        
+    async def _dispatch(self, request: Any, queue: asyncio.Queue, slots: asyncio.Semaphore):
+        """Handle one request (or batch) as its own task and queue the response for the writer."""
         try:
-            result = await self.extractor.extract_post_text(url)
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "result": result
-            }
-        except Exception as e:
-            logger.error(f"Error extracting post text: {e}")
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "error": {
-                    "code": -32603,
-                    "message": "Failed to extract post text",
-                    "data": str(e)
-                }
-            }
+            response = await self.handle_message(request, notify=queue.put)
+            if response is not None:
+                await queue.put(response)
+        finally:
+            slots.release()
     
-    async def run_stdio(self):
-        """Run the MCP server using stdio communication."""
-        logger.info("Starting LinkedIn MCP Server in stdio mode")
-        
-        # Use a thread executor for stdin reading on Windows
-        import concurrent.futures
-        import threading
+    async def serve(self, transport):
+        """
+        Read JSON-RPC requests from `transport` and dispatch each one as an independent task.
         
-        loop = asyncio.get_event_loop()
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
-        
-        def read_line():
-            """Read a line from stdin in a thread."""
-            try:
-                return sys.stdin.readline()
-            except EOFError:
-                return None
+        Up to `max_in_flight` requests run at once, so a long extraction doesn't hold up
+        `initialize` or `list_tools`. Responses are written as they complete (clients match
+        them by `id`) through a single writer task, so lines never interleave. At end of
+        input, requests still running are allowed to finish. A batch array is one request
+        here; its entries then run concurrently inside it.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(self._write_responses(queue, transport))
+        slots = asyncio.Semaphore(self.max_in_flight)
+        in_flight: Set[asyncio.Task] = set()
         
         try:
             while True:
                 try:
-                    # Read request from stdin asynchronously using thread executor
-                    line = await loop.run_in_executor(executor, read_line)
+                    line = await transport.read_message()
                     if not line:
                         break
                     
@@ -220,13 +105,13 @@ class LinkedInMCPStdioServer:
                         continue
                     
                     # Parse JSON request
-                    request = json.loads(line)
+                    request = self.core.serializer.loads(line)
                     
-                    # Handle request
-                    response = await self.handle_request(request)
-                    
-                    # Send response to stdout
-                    print(json.dumps(response), flush=True)
+                    # Wait for a free slot, then handle the request in the background
+                    await slots.acquire()
+                    task = asyncio.create_task(self._dispatch(request, queue, slots))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
                     
                 except json.JSONDecodeError as e:
                     logger.error(f"Invalid JSON request: {e}")
@@ -238,12 +123,44 @@ class LinkedInMCPStdioServer:
                             "message": "Parse error"
                         }
                     }
-                    print(json.dumps(error_response), flush=True)
+                    await queue.put(error_response)
+                except MessageTooLarge as e:
+                    logger.error(f"Skipping oversized request: {e}")
+                    await queue.put({
+                        "jsonrpc": "2.0",
+                        "id": None,
+                        "error": {
+                            "code": -32600,
+                            "message": f"Invalid Request: {e}"
+                        }
+                    })
                 except Exception as e:
                     logger.error(f"Unexpected error: {e}")
                     break
+            
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+        finally:
+            # Only reached with tasks still running if serve() itself was cancelled
+            for task in in_flight:
+                task.cancel()
+            await queue.put(None)
+            await writer
+    
+    async def _open_transport(self):
+        """Attach to stdin/stdout (asyncio pipes where supported, a reader thread otherwise)."""
+        return await open_stdio_transport()
+    
+    async def run_stdio(self):
+        """Run the MCP server using stdio communication."""
+        logger.info("Starting LinkedIn MCP Server in stdio mode")
+        
+        transport = await self._open_transport()
+        try:
+            await self.serve(transport)
         finally:
-            executor.shutdown(wait=True)
+            await transport.close()
+            await self.extractor.aclose()
 
 
 async def main():
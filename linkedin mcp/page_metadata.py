@@ -0,0 +1,178 @@
+"""
+Structured metadata tier for LinkedIn post pages.
+Reads og:* meta tags and application/ld+json blocks from the page <head>, which usually carry
+the post text, image and shared link, so most pages never need a full DOM walk.
+"""
+
+import html
+import json
+import logging
+import re
+from typing import Any, Iterator, List, Optional
+
+from extraction_plan import select_image, select_link
+
+logger = logging.getLogger(__name__)
+
+_HEAD_END_RE = re.compile(rb'</head\s*>', re.IGNORECASE)
+_META_TAG_RE = re.compile(r'<meta\b([^>]*)>', re.IGNORECASE)
+_ATTR_RE = re.compile(r'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_LD_JSON_RE = re.compile(
+    r'<script\b[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+_URL_RE = re.compile(r'https?://[^\s"\'<>]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# JSON-LD types that describe a post or article
+_POST_TYPES = {'SocialMediaPosting', 'DiscussionForumPosting', 'Article', 'NewsArticle', 'BlogPosting'}
+
+# Where PostMetadata.text came from
+TEXT_FROM_JSON_LD = 'json-ld'
+TEXT_FROM_OG_DESCRIPTION = 'og:description'
+
+
+class PostMetadata:
+    """Post fields found in the page head. Any field may be None."""
+
+    def __init__(
+        self,
+        text: Optional[str] = None,
+        link: Optional[str] = None,
+        image: Optional[str] = None,
+        text_source: Optional[str] = None,
+    ):
+        self.text = text
+        self.link = link
+        self.image = image
+        # TEXT_FROM_JSON_LD for the full post body, TEXT_FROM_OG_DESCRIPTION for the summary
+        self.text_source = text_source
+
+    @property
+    def has_full_text(self) -> bool:
+        """True when the text is the JSON-LD post body rather than the often truncated og:description."""
+        return bool(self.text) and self.text_source == TEXT_FROM_JSON_LD
+
+    @property
+    def complete(self) -> bool:
+        """True when no DOM extraction is needed."""
+        return bool(self.has_full_text and self.link and self.image)
+
+
+def find_head_end(content: bytes, start: int = 0) -> int:
+    """Return the offset just past </head>, or -1 if the head hasn't been closed yet."""
+    match = _HEAD_END_RE.search(content, start)
+    return match.end() if match else -1
+
+
+class HeadScanner:
+    """
+    Incremental head reader for streamed pages.
+    
+    Called with the body read so far after every chunk; parses the head metadata once
+    </head> arrives and returns True when it already has every field, so the rest of
+    the page does not need to be downloaded.
+    """
+
+    # Enough bytes to catch a </head> split across two chunks
+    _OVERLAP = 16
+
+    def __init__(self):
+        self.head_end = -1
+        self.metadata: Optional[PostMetadata] = None
+
+    def __call__(self, body: bytes, start: int = 0) -> bool:
+        if self.head_end == -1:
+            self.head_end = find_head_end(body, max(0, start - self._OVERLAP))
+            if self.head_end == -1:
+                return False
+            self.metadata = extract_head_metadata(bytes(body[:self.head_end]))
+        return self.metadata is not None and self.metadata.complete
+
+
+def _meta_properties(head: str) -> dict:
+    """Map meta property/name attributes (og:*, twitter:*, ...) to their content values."""
+    properties = {}
+    for tag in _META_TAG_RE.finditer(head):
+        attrs = {name.lower(): html.unescape(dq if dq else sq) for name, dq, sq in _ATTR_RE.findall(tag.group(1))}
+        name = attrs.get('property') or attrs.get('name')
+        if name and 'content' in attrs:
+            properties.setdefault(name.lower(), attrs['content'])
+    return properties
+
+
+def _json_ld_posts(head: str) -> Iterator[dict]:
+    """Yield JSON-LD objects that describe a post."""
+    for block in _LD_JSON_RE.finditer(head):
+        try:
+            data = json.loads(block.group(1))
+        except ValueError as e:
+            logger.debug(f"Skipping invalid JSON-LD block: {e}")
+            continue
+        stack: List[Any] = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(reversed(item))
+            elif isinstance(item, dict):
+                item_type = item.get('@type')
+                types = item_type if isinstance(item_type, list) else [item_type]
+                if any(t in _POST_TYPES for t in types):
+                    yield item
+                if '@graph' in item:
+                    stack.append(item['@graph'])
+
+
+def _image_url(value: Any) -> Optional[str]:
+    """Pull a URL out of a JSON-LD image value (string, ImageObject or list of them)."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get('url') or value.get('contentUrl')
+    if isinstance(value, list):
+        for item in value:
+            url = _image_url(item)
+            if url:
+                return url
+    return None
+
+
+def extract_head_metadata(head: bytes) -> PostMetadata:
+    """Extract post text, link and image from the page <head>."""
+    head_text = head.decode('utf-8', errors='replace')
+    properties = _meta_properties(head_text)
+
+    text = None
+    text_source = None
+    images = []
+    links = []
+    for post in _json_ld_posts(head_text):
+        body = post.get('articleBody') or post.get('text')
+        if isinstance(body, str) and body and not text:
+            text = body
+            text_source = TEXT_FROM_JSON_LD
+        image = _image_url(post.get('image'))
+        if image:
+            images.append(image)
+        shared = post.get('sharedContent')
+        if isinstance(shared, dict) and isinstance(shared.get('url'), str):
+            links.append(shared['url'])
+
+    # og:description is often truncated, so it only fills in when JSON-LD has no body
+    if not text and properties.get('og:description'):
+        text = properties['og:description']
+        text_source = TEXT_FROM_OG_DESCRIPTION
+    if text:
+        text = _WHITESPACE_RE.sub(' ', text).strip() or None
+        links.extend(url.rstrip('.,;:!?)') for url in _URL_RE.findall(text or ''))
+
+    for name in ('og:image', 'og:image:url', 'twitter:image'):
+        if properties.get(name):
+            images.append(properties[name])
+
+    return PostMetadata(
+        text=text,
+        link=select_link([links]),
+        image=select_image([[(src, None, None) for src in images]], check_size=False),
+        text_source=text_source if text else None,
+    )
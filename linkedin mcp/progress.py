@@ -0,0 +1,70 @@
+"""
+Stage reporting for long-running extractions.
+The extractor calls report_stage() as it moves through an extraction (cache hit, HTTP fetch,
+Playwright fallback, link resolution). Whoever started the extraction listens by wrapping the
+call in stage_listener(). The listener lives in a context variable, so it follows the
+extraction into the tasks it starts without being passed through every call. An extraction
+shared by several callers (see singleflight.py) reports to a StageFanout, which passes each
+stage on to every caller still waiting on it.
+"""
+
+import contextlib
+import logging
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Called with (stage, detail) each time the extraction reaches a new stage
+StageListener = Callable[[str, Dict[str, Any]], None]
+
+_listener: ContextVar[Optional[StageListener]] = ContextVar('linkedin_mcp_stage_listener', default=None)
+
+
+def report_stage(stage: str, **detail: Any):
+    """Tell the current listener, if any, that the extraction reached `stage`."""
+    listener = _listener.get()
+    if listener is None:
+        return
+    try:
+        listener(stage, detail)
+    except Exception as e:
+        # Progress reporting must never break the extraction it reports on
+        logger.debug(f"Stage listener failed for {stage}: {e}")
+
+
+@contextlib.contextmanager
+def stage_listener(listener: StageListener) -> Iterator[None]:
+    """Send the stages of extractions started inside this block to `listener`."""
+    token = _listener.set(listener)
+    try:
+        yield
+    finally:
+        _listener.reset(token)
+
+
+def current_listener() -> Optional[StageListener]:
+    """Return the listener the current context reports to, if any."""
+    return _listener.get()
+
+
+class StageFanout:
+    """Listener for a shared extraction that forwards every stage to each caller waiting on it."""
+
+    def __init__(self):
+        self._listeners: List[StageListener] = []
+
+    def add(self, listener: StageListener):
+        self._listeners.append(listener)
+
+    def remove(self, listener: StageListener):
+        """Stop forwarding to a caller that is no longer waiting."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def __call__(self, stage: str, detail: Dict[str, Any]):
+        for listener in list(self._listeners):
+            try:
+                listener(stage, detail)
+            except Exception as e:
+                logger.debug(f"Stage listener failed for {stage}: {e}")
@@ -0,0 +1,177 @@
+"""
+Per-host rate limiting for the LinkedIn extractor's HTTP client.
+Token buckets keep batch runs under LinkedIn's throttling thresholds and back off adaptively
+when linkedin.com or lnkd.in answer with 429/999, Retry-After or an auth wall.
+"""
+
+import email.utils
+import logging
+import random
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# host suffix -> (requests per second, burst size)
+DEFAULT_HOST_RATES: Dict[str, Tuple[float, int]] = {
+    'linkedin.com': (2.0, 4),
+    'lnkd.in': (5.0, 10),
+}
+
+# LinkedIn answers 999 ("request denied") when it thinks it is being scraped
+THROTTLE_STATUSES = frozenset({429, 999})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def is_throttled(status_code: int, final_url: str) -> bool:
+    """Check whether a response means the host is slowing us down."""
+    return status_code in THROTTLE_STATUSES or '/authwall' in final_url
+
+
+class TokenBucket:
+    """
+    Token bucket whose rate adapts to throttling (AIMD).
+
+    A throttle halves the rate (down to `min_rate`) and pauses the bucket for the backoff
+    delay; every successful response adds back a tenth of the configured rate.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float = 0.1):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.consecutive_throttles = 0
+        self.requests = 0
+        self.throttle_events = 0
+        self.last_throttled: Optional[float] = None
+        self.total_wait = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before sending."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        self.requests += 1
+        # A negative balance queues the caller behind earlier reservations
+        wait = max(0.0, -self.tokens / self.rate, self.paused_until - now)
+        self.total_wait += wait
+        return wait
+
+    def on_success(self):
+        self.consecutive_throttles = 0
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+    def on_throttle(self, delay: float):
+        now = time.monotonic()
+        self._refill(now)
+        self.consecutive_throttles += 1
+        self.throttle_events += 1
+        self.last_throttled = now
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        self.paused_until = max(self.paused_until, now + delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "requests": self.requests,
+            "throttle_events": self.throttle_events,
+            "seconds_since_throttle": (
+                round(time.monotonic() - self.last_throttled, 1) if self.last_throttled is not None else None
+            ),
+            "total_wait_s": round(self.total_wait, 2),
+        }
+
+
+class HostRateLimiter:
+    """Token bucket per rate-limited host; other hosts pass straight through."""
+
+    def __init__(
+        self,
+        host_rates: Mapping[str, Tuple[float, int]] = DEFAULT_HOST_RATES,
+        base_backoff: float = 2.0,
+        max_backoff: float = 30.0,
+    ):
+        self.host_rates = dict(host_rates)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        """Return the bucket for the configured suffix `host` falls under, if any."""
+        for suffix, (rate, burst) in self.host_rates.items():
+            if host == suffix or host.endswith('.' + suffix):
+                bucket = self._buckets.get(suffix)
+                if bucket is None:
+                    bucket = self._buckets[suffix] = TokenBucket(rate, burst)
+                return bucket
+        return None
+
+    def reserve(self, host: str) -> float:
+        """Take a token for `host`, returning the seconds to wait before sending (0 for unlimited hosts)."""
+        bucket = self._bucket(host)
+        return bucket.reserve() if bucket is not None else 0.0
+
+    def record_response(
+        self, host: str, status_code: int, final_url: str, retry_after: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Feed a response back into the host's bucket.
+
+        Returns:
+            None if the response was not throttled (or the host is not rate-limited),
+            otherwise the jittered delay to wait before retrying. A Retry-After the server
+            sent is honoured in full, so the delay can exceed `max_backoff`; callers should
+            give up instead of retrying early in that case (see `should_retry`).
+        """
+        bucket = self._bucket(host)
+        if bucket is None:
+            return None
+        if not is_throttled(status_code, final_url):
+            bucket.on_success()
+            return None
+
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            # Never retry earlier than the server asked
+            delay = requested * random.uniform(1.0, 1.2)
+        else:
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** bucket.consecutive_throttles)
+            delay = random.uniform(backoff / 2, backoff)
+        bucket.on_throttle(delay)
+        logger.warning(
+            f"Throttled by {host} (HTTP {status_code}); rate now {bucket.rate:.2f}/s, retrying in {delay:.1f}s"
+        )
+        return delay
+
+    def should_retry(self, delay: float, time_left: Optional[float] = None) -> bool:
+        """Whether a throttled request is worth retrying after `delay`, given the caller's `time_left`."""
+        return delay <= self.max_backoff and (time_left is None or delay < time_left)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return current rate and throttle counters per host."""
+        return {suffix: bucket.get_stats() for suffix, bucket in self._buckets.items()}
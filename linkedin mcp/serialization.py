@@ -0,0 +1,96 @@
+"""
+JSON encoding for MCP messages and tool results.
+orjson is used when it is installed and the standard library otherwise. Both write compact
+UTF-8: Hebrew and other non-ASCII post text is kept as-is instead of as \\uXXXX escapes, which
+would triple its size. Indented output is only produced on request.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+from typing import Any, Union
+
+logger = logging.getLogger(__name__)
+
+SERIALIZER_BACKENDS = ('json', 'orjson')
+
+# 'auto' uses orjson when it is installed
+DEFAULT_SERIALIZER = os.environ.get('LINKEDIN_MCP_JSON', 'auto')
+
+
+class StdlibSerializer:
+    """Serializer built on the standard library json module."""
+
+    name = 'json'
+
+    @staticmethod
+    def _encode(obj: Any, pretty: bool, ensure_ascii: bool) -> str:
+        if pretty:
+            return json.dumps(obj, ensure_ascii=ensure_ascii, indent=2)
+        return json.dumps(obj, ensure_ascii=ensure_ascii, separators=(',', ':'))
+
+    def dumps(self, obj: Any, pretty: bool = False) -> str:
+        return self._encode(obj, pretty, ensure_ascii=False)
+
+    def dumps_bytes(self, obj: Any, pretty: bool = False) -> bytes:
+        try:
+            return self._encode(obj, pretty, ensure_ascii=False).encode('utf-8')
+        except UnicodeEncodeError:
+            # Lone surrogates can't be written as UTF-8; \u escapes can
+            return self._encode(obj, pretty, ensure_ascii=True).encode('ascii')
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    """Serializer built on orjson, falling back to the standard library for what orjson rejects."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        self._fallback = StdlibSerializer()
+
+    def dumps(self, obj: Any, pretty: bool = False) -> str:
+        return self.dumps_bytes(obj, pretty).decode('utf-8')
+
+    def dumps_bytes(self, obj: Any, pretty: bool = False) -> bytes:
+        try:
+            return self._orjson.dumps(obj, option=self._orjson.OPT_INDENT_2 if pretty else 0)
+        except self._orjson.JSONEncodeError:
+            # e.g. non-string dict keys, integers above 64 bits or lone surrogates
+            return self._fallback.dumps_bytes(obj, pretty)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            # orjson rejects some JSON the standard library accepts (e.g. lone surrogate escapes);
+            # input that is really malformed raises json.JSONDecodeError from there
+            return self._fallback.loads(data)
+
+
+def resolve_serializer(name: str = DEFAULT_SERIALIZER):
+    """Return a serializer for a configured backend name, falling back to the standard library."""
+    orjson_installed = importlib.util.find_spec('orjson') is not None
+    if name == 'auto':
+        return OrjsonSerializer() if orjson_installed else StdlibSerializer()
+    if name not in SERIALIZER_BACKENDS:
+        logger.warning(f"Unknown JSON serializer '{name}', using json")
+    elif name == 'orjson':
+        if orjson_installed:
+            return OrjsonSerializer()
+        logger.warning("JSON serializer 'orjson' is not installed, using json")
+    return StdlibSerializer()
+
+
+def parse_pretty(value: Any) -> bool:
+    """Validate a client-supplied `pretty` flag. Raises ValueError for anything but a boolean."""
+    if value is None:
+        return False
+    if not isinstance(value, bool):
+        raise ValueError('pretty must be a boolean')
+    return value
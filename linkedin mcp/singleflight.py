@@ -0,0 +1,81 @@
+"""
+In-process request coalescing for the LinkedIn extractor.
+Concurrent callers asking for the same key share one in-flight task instead of repeating the work.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from progress import StageFanout, current_listener, report_stage, stage_listener
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; callers that arrive while it is running await its result.
+
+    The shared task is shielded from its callers: a caller that gives up (is cancelled or
+    runs out of its own timeout) does not cancel the work for the others, and the result
+    still lands in any caches it fills. Stages the shared task reports (see progress.py)
+    reach every caller waiting on it; a caller that joins late gets a "joined" stage and
+    the stages from then on.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, Tuple[asyncio.Task, StageFanout]] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        """Drop a finished task, retrieving its exception so an unawaited failure isn't reported as lost."""
+        if key in self._in_flight and self._in_flight[key][0] is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Shared call for {key!r} failed: {task.exception()}")
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """
+        Return the result of `func()`, sharing it with every concurrent caller using the same key.
+
+        The caller that starts the call waits for it to finish, since `func` carries its own
+        budget. Callers that join it wait at most `timeout` seconds (None for no limit) and
+        then get asyncio.TimeoutError, while the shared call keeps running for the others.
+        """
+        self.calls += 1
+        listener = current_listener()
+        flight = self._in_flight.get(key)
+        joined = flight is not None
+        if joined:
+            task, fanout = flight
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight call for {key!r}")
+            report_stage("joined")
+        else:
+            fanout = StageFanout()
+            # The task reports to the fanout rather than to whoever happened to start it
+            with stage_listener(fanout):
+                task = asyncio.ensure_future(func())
+            self._in_flight[key] = (task, fanout)
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+
+        if listener is not None:
+            fanout.add(listener)
+        try:
+            if joined:
+                return await asyncio.wait_for(asyncio.shield(task), timeout)
+            return await asyncio.shield(task)
+        finally:
+            if listener is not None:
+                fanout.remove(listener)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return call counters for monitoring."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,180 @@
+"""
+stdin/stdout transport for the stdio MCP servers.
+Messages are newline-delimited JSON-RPC. stdin and stdout are attached to the event loop as
+asyncio pipes; where that is not possible (Windows, or stdin redirected from a regular file)
+a thread-based transport with the same interface is used instead.
+
+Attaching the pipes puts the stdin and stdout file descriptors in non-blocking mode, for this
+process and for anything sharing them. While the pipe transport is in use, nothing else may
+write to stdout (print(), a library writing to sys.stdout or to fd 1): such a write can fail
+with BlockingIOError when the pipe is full, besides corrupting the message stream. Log to
+stderr, or select the thread transport, which leaves both descriptors blocking.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import sys
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Longest accepted message; larger ones are skipped and answered with an error
+DEFAULT_MAX_MESSAGE_BYTES = 32 * 1024 * 1024
+
+# 'auto' uses asyncio pipes where supported, 'pipes' requires them, 'thread' forces the fallback
+DEFAULT_TRANSPORT = os.environ.get('LINKEDIN_MCP_STDIO_TRANSPORT', 'auto')
+
+# Pending output above which write_message waits for stdout to drain
+_WRITE_HIGH_WATER = 1024 * 1024
+
+
+class MessageTooLarge(Exception):
+    """An incoming message exceeded the transport's size limit and was skipped."""
+
+
+class PipeTransport:
+    """
+    Newline-framed messages over stdin/stdout attached to the event loop as pipes.
+
+    Leaves stdin and stdout in non-blocking mode (see the module docstring).
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_message_bytes: int):
+        self._reader = reader
+        self._writer = writer
+        self.max_message_bytes = max_message_bytes
+
+    @classmethod
+    async def connect(cls, stdin=None, stdout=None, max_message_bytes: int = DEFAULT_MAX_MESSAGE_BYTES):
+        loop = asyncio.get_running_loop()
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+
+        reader = asyncio.StreamReader(limit=max_message_bytes, loop=loop)
+        read_transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader, loop=loop), stdin
+        )
+        # StreamReaderProtocol gives the write side flow control (drain) and wait_closed()
+        # through public asyncio APIs; its reader is never read from
+        try:
+            write_transport, write_protocol = await loop.connect_write_pipe(
+                lambda: asyncio.StreamReaderProtocol(asyncio.StreamReader(loop=loop), loop=loop), stdout
+            )
+        except Exception:
+            read_transport.close()
+            raise
+        write_transport.set_write_buffer_limits(high=_WRITE_HIGH_WATER)
+        writer = asyncio.StreamWriter(write_transport, write_protocol, None, loop)
+        return cls(reader, writer, max_message_bytes)
+
+    async def _discard_line(self):
+        """Skip the rest of an oversized message, up to and including its newline."""
+        while True:
+            try:
+                await self._reader.readuntil(b'\n')
+                return
+            except asyncio.LimitOverrunError as e:
+                await self._reader.readexactly(e.consumed)
+            except asyncio.IncompleteReadError:
+                return
+
+    async def read_message(self) -> Optional[str]:
+        """Return the next line (newline included), or None at end of input."""
+        try:
+            line = await self._reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as e:
+            # Last message without a trailing newline
+            line = e.partial
+            if not line:
+                return None
+        except asyncio.LimitOverrunError:
+            await self._discard_line()
+            raise MessageTooLarge(f"Message exceeds {self.max_message_bytes} bytes")
+        return line.decode('utf-8', errors='replace')
+
+    async def write_message(self, message: Union[str, bytes]):
+        """Queue one message; only waits when stdout is not keeping up."""
+        if isinstance(message, str):
+            message = message.encode('utf-8')
+        self._writer.write(message + b'\n')
+        await self._writer.drain()
+
+    async def close(self):
+        try:
+            self._writer.close()
+            await self._writer.wait_closed()
+        except Exception as e:
+            logger.debug(f"Error closing stdout pipe: {e}")
+
+
+class ThreadTransport:
+    """Fallback transport: blocking stdin reads in a worker thread, direct writes to stdout."""
+
+    def __init__(self, stdin=None, stdout=None, max_message_bytes: int = DEFAULT_MAX_MESSAGE_BYTES):
+        stdin = stdin or sys.stdin
+        self._stdin = getattr(stdin, 'buffer', stdin)
+        self._stdout = stdout or sys.stdout
+        self.max_message_bytes = max_message_bytes
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def _read_line(self) -> Optional[bytes]:
+        try:
+            return self._stdin.readline(self.max_message_bytes + 1)
+        except EOFError:
+            return None
+
+    def _skip_rest_of_line(self):
+        while True:
+            chunk = self._stdin.readline(self.max_message_bytes)
+            if not chunk or chunk.endswith(b'\n'):
+                return
+
+    async def read_message(self) -> Optional[str]:
+        """Return the next line (newline included), or None at end of input."""
+        loop = asyncio.get_running_loop()
+        line = await loop.run_in_executor(self._executor, self._read_line)
+        if not line:
+            return None
+        if len(line) > self.max_message_bytes and not line.endswith(b'\n'):
+            await loop.run_in_executor(self._executor, self._skip_rest_of_line)
+            raise MessageTooLarge(f"Message exceeds {self.max_message_bytes} bytes")
+        if isinstance(line, str):
+            return line
+        return line.decode('utf-8', errors='replace')
+
+    async def write_message(self, message: Union[str, bytes]):
+        buffer = getattr(self._stdout, 'buffer', None)
+        if buffer is not None:
+            # Write UTF-8 directly so non-ASCII text doesn't depend on the console encoding
+            self._stdout.flush()
+            buffer.write((message.encode('utf-8') if isinstance(message, str) else message) + b'\n')
+            buffer.flush()
+            return
+        if isinstance(message, bytes):
+            message = message.decode('utf-8')
+        self._stdout.write(message + '\n')
+        self._stdout.flush()
+
+    async def close(self):
+        self._executor.shutdown(wait=False)
+
+
+async def open_stdio_transport(
+    stdin=None,
+    stdout=None,
+    mode: str = DEFAULT_TRANSPORT,
+    max_message_bytes: int = DEFAULT_MAX_MESSAGE_BYTES,
+):
+    """Attach to stdin/stdout, preferring asyncio pipes and falling back to a reader thread."""
+    if mode == 'thread' or (mode == 'auto' and sys.platform == 'win32'):
+        return ThreadTransport(stdin, stdout, max_message_bytes)
+    try:
+        return await PipeTransport.connect(stdin, stdout, max_message_bytes)
+    except (NotImplementedError, ValueError, OSError) as e:
+        # e.g. stdin redirected from a regular file, which epoll cannot watch
+        if mode == 'pipes':
+            raise
+        logger.info(f"asyncio stdio pipes unavailable ({e}), using a reader thread")
+        return ThreadTransport(stdin, stdout, max_message_bytes)
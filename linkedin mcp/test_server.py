@@ -3,6 +3,7 @@ Test script for the LinkedIn MCP server.
 """
 
 import asyncio
+import contextlib
 import json
 import logging
 from linkedin_extractor import LinkedInExtractor
@@ -14,7 +15,7 @@ logger = logging.getLogger(__name__)
 
 async def test_url_validation():
     """Test URL validation functionality."""
-    extractor = LinkedInExtractor()
+    extractor = LinkedInExtractor(cache_path=None)
     
     # Valid URLs
     valid_urls = [
@@ -49,7 +50,7 @@ async def test_url_validation():
 
 async def test_extraction_with_invalid_url():
     """Test extraction with invalid URL."""
-    extractor = LinkedInExtractor()
+    extractor = LinkedInExtractor(cache_path=None)
     
     print("Testing extraction with invalid URL...")
     
@@ -66,7 +67,7 @@ async def test_extraction_with_invalid_url():
 
 async def test_extraction_with_nonexistent_post():
     """Test extraction with a valid LinkedIn URL format but nonexistent post."""
-    extractor = LinkedInExtractor()
+    extractor = LinkedInExtractor(cache_path=None)
     
     # This is a valid URL format but likely doesn't exist
     test_url = "https://www.linkedin.com/posts/nonexistentuser_activity-1111111111111111111-aaaa"
@@ -85,11 +86,696 @@ async def test_extraction_with_nonexistent_post():
     print("Nonexistent post test passed!\n")
 
 
+async def test_extract_many():
+    """Test batch extraction keeps input order and captures per-URL errors."""
+    extractor = LinkedInExtractor(cache_path=None)
+    
+    print("Testing batch extraction...")
+    
+    failing_url = "https://www.linkedin.com/posts/broken_activity-2222222222222222222-bbbb"
+    urls = ["https://invalid-url.com/1", failing_url, "https://invalid-url.com/2"]
+    original_extract = extractor.extract_post_text
+    
+    async def fake_extract(url, timeout=None):
+        if url == failing_url:
+            raise RuntimeError("boom")
+        return await original_extract(url, timeout)
+    
+    extractor.extract_post_text = fake_extract
+    results = await extractor.extract_many(urls, concurrency=2)
+    
+    assert [r['url'] for r in results] == urls
+    assert results[0]['error'] == "Invalid LinkedIn post URL"
+    assert results[1]['error'] == "boom"
+    assert not any(r['success'] for r in results)
+    
+    print("Batch extraction test passed!\n")
+
+
+async def test_hedged_extraction():
+    """Test a slow HTTP tier is hedged with Playwright and the losing tier is cancelled."""
+    print("Testing hedged extraction...")
+    
+    url = "https://www.linkedin.com/posts/someone_activity-3333333333333333333-cccc"
+    http_cancelled = asyncio.Event()
+    
+    async def slow_http(url, deadline=None):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            http_cancelled.set()
+            raise
+        return "HTTP text that arrives too late", None, None
+    
+    async def fast_browser(url, deadline=None):
+        await asyncio.sleep(0.01)
+        return "Post text rendered by the browser", None, None
+    
+    extractor = LinkedInExtractor(cache_path=None, hedge_after=0.05)
+    extractor._extract_with_requests = slow_http
+    extractor._extract_with_playwright = fast_browser
+    try:
+        result = await asyncio.wait_for(extractor.extract_post_text(url), timeout=2)
+        assert result["success"] and result["text"] == "Post text rendered by the browser"
+        assert http_cancelled.is_set(), "the losing HTTP tier is cancelled"
+        
+        # A fast HTTP tier is never hedged
+        async def fast_http(url, deadline=None):
+            return "Post text from plain HTTP", None, None
+        
+        extractor._extract_with_requests = fast_http
+        result = await extractor.extract_post_text(url)
+        assert result["text"] == "Post text from plain HTTP"
+        
+        hedging = extractor.get_stats()["hedging"]
+        assert hedging["extractions"] == 2 and hedging["hedged"] == 1, hedging
+        assert hedging["playwright_won"] == 1 and hedging["hedge_rate"] == 0.5, hedging
+    finally:
+        await extractor.aclose()
+    
+    print("Hedged extraction test passed!\n")
+
+
+async def test_deadline():
+    """Test an overall deadline returns partial results instead of waiting on slow stages."""
+    import time
+    import httpx
+    
+    print("Testing extraction deadline...")
+    
+    url = "https://www.linkedin.com/posts/someone_activity-4444444444444444444-dddd"
+    ld_json = json.dumps({
+        "@type": "SocialMediaPosting",
+        "articleBody": "Post text that arrives in time",
+        "image": "https://media.licdn.com/post-image.jpg",
+        "sharedContent": {"url": "https://lnkd.in/slow"},
+    })
+    
+    async def handler(request):
+        if request.url.host == "lnkd.in":
+            await asyncio.sleep(10)
+        return httpx.Response(200, content=f'<html><head><script type="application/ld+json">{ld_json}</script></head></html>')
+    
+    extractor = LinkedInExtractor(cache_path=None)
+    extractor.http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        started = time.perf_counter()
+        result = await extractor.extract_post_text(url, timeout=0.3)
+        assert time.perf_counter() - started < 2, "slow redirect resolution is cut at the deadline"
+        assert result["success"] and result["timed_out"]
+        assert result["text"] == "Post text that arrives in time"
+        assert result["link"] == "https://lnkd.in/slow", "the short link is returned unresolved"
+        assert extractor.redirect_cache.get("https://lnkd.in/slow") is None, "a cut-short chain is not memoized"
+        
+        # Neither tier finishes: the call still returns shortly after the deadline
+        async def hanging_tier(url, deadline=None):
+            await asyncio.sleep(10)
+            return None, None, None
+        
+        extractor._extract_with_requests = hanging_tier
+        extractor._extract_with_playwright = hanging_tier
+        started = time.perf_counter()
+        result = await extractor.extract_post_text(url, timeout=0.2)
+        assert time.perf_counter() - started < 2
+        assert not result["success"] and result["timed_out"]
+        assert result["error"] == "Extraction timed out after 0.2s", result["error"]
+    finally:
+        await extractor.aclose()
+    
+    print("Extraction deadline test passed!\n")
+
+
+async def test_request_coalescing():
+    """Test concurrent extractions of the same post and short link share one in-flight call."""
+    print("Testing request coalescing...")
+    
+    post = "https://www.linkedin.com/posts/someone_activity-5555555555555555555-eeee"
+    urls = [post, post + "?utm_source=share", post + "?rcm=XYZ"]
+    tier_calls = []
+    chain_calls = []
+    
+    async def slow_tiers(url, deadline=None):
+        tier_calls.append(url)
+        await asyncio.sleep(0.05)
+        return "Shared post text from one extraction", None, None, "HTTP requests"
+    
+    async def slow_chain(url, deadline=None):
+        chain_calls.append(url)
+        await asyncio.sleep(0.05)
+        return "https://example.com/final", False
+    
+    extractor = LinkedInExtractor(cache_path=None)
+    extractor._extract_with_tiers = slow_tiers
+    extractor._follow_redirect_chain = slow_chain
+    try:
+        results = await asyncio.gather(*(extractor.extract_post_text(url) for url in urls))
+        assert len(tier_calls) == 1, tier_calls
+        assert [r["url"] for r in results] == urls, "every caller gets the result under its own URL"
+        assert all(r["text"] == "Shared post text from one extraction" for r in results)
+        
+        links = await asyncio.gather(*(extractor._resolve_linkedin_redirect("https://lnkd.in/same") for _ in range(3)))
+        assert links == ["https://example.com/final"] * 3
+        assert len(chain_calls) == 1, chain_calls
+        
+        coalescing = extractor.get_stats()["coalescing"]
+        assert coalescing["posts"] == {"calls": 3, "coalesced": 2, "in_flight": 0}, coalescing
+        assert coalescing["redirects"]["coalesced"] == 2, coalescing
+        
+        # A caller that gives up does not cancel the shared extraction for the others
+        tier_calls.clear()
+        first = asyncio.create_task(extractor.extract_post_text(post))
+        second = asyncio.create_task(extractor.extract_post_text(post))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert (await second)["success"]
+        assert len(tier_calls) == 1
+        
+        # A caller that joins waits no longer than its own timeout; the shared extraction keeps going
+        async def budgeted_tiers(url, deadline):
+            tier_calls.append(deadline.seconds)
+            await asyncio.sleep(0.2)
+            if deadline.expired:
+                return None, None, None, None
+            return "Post text from a full budget", None, None, "HTTP requests"
+        
+        extractor._extract_with_tiers = budgeted_tiers
+        tier_calls.clear()
+        unbounded = asyncio.create_task(extractor.extract_post_text(post))
+        await asyncio.sleep(0.01)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        joined = await extractor.extract_post_text(post, timeout=0.05)
+        assert loop.time() - started < 0.15, "the joiner is bounded by its own deadline"
+        assert joined["timed_out"] and joined["error"] == "Extraction timed out after 0.05s", joined
+        assert (await unbounded)["success"]
+        
+        # A joiner with a longer budget than the caller that started the extraction runs it again
+        tier_calls.clear()
+        short = asyncio.create_task(extractor.extract_post_text(post, timeout=0.05))
+        await asyncio.sleep(0.01)
+        patient = await extractor.extract_post_text(post, timeout=5)
+        assert (await short)["timed_out"]
+        assert patient["success"] and patient["text"] == "Post text from a full budget", patient
+        assert tier_calls == [0.05, 5], tier_calls
+    finally:
+        await extractor.aclose()
+    
+    print("Request coalescing test passed!\n")
+
+
+async def test_rate_limiter():
+    """Test throttled LinkedIn responses are retried with backoff and slow the host's rate."""
+    import httpx
+    from http_client import AsyncHTTPClient
+    from rate_limit import HostRateLimiter
+    
+    print("Testing per-host rate limiter...")
+    
+    responses = {"www.linkedin.com": [429, 999, 200], "lnkd.in": [999, 999, 999, 999]}
+    retry_after = {}
+    
+    def handler(request):
+        status = responses[request.url.host].pop(0)
+        headers = {"Retry-After": retry_after.get(request.url.host, "0")} if status == 429 else {}
+        return httpx.Response(status, headers=headers, content=b"<html></html>")
+    
+    client = AsyncHTTPClient(max_retries=2)
+    client.rate_limiter.base_backoff = 0.01
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        response = await client.get("https://www.linkedin.com/posts/x", timeout=5)
+        assert response.status_code == 200, "throttled responses are retried"
+        
+        response = await client.get("https://lnkd.in/abc", timeout=5)
+        assert response.status_code == 999, "the last throttled response is returned once retries run out"
+        assert len(responses["lnkd.in"]) == 1
+        
+        hosts = client.get_stats()["hosts"]
+        assert hosts["linkedin.com"]["throttle_events"] == 2
+        assert hosts["linkedin.com"]["rate"] < hosts["linkedin.com"]["max_rate"], "rate backs off after throttling"
+        assert hosts["lnkd.in"]["throttle_events"] == 3
+        
+        # Other hosts are not limited
+        assert client.rate_limiter.reserve("example.com") == 0
+        # Once the burst is used up, callers are spaced out at the host's rate
+        waits = [client.rate_limiter.reserve("www.linkedin.com") for _ in range(10)]
+        assert waits[-1] > waits[0], waits
+        
+        # A Retry-After beyond max_backoff or the caller's time left is honoured, not retried early
+        client.rate_limiter = HostRateLimiter()
+        responses["www.linkedin.com"] = [429, 200]
+        retry_after["www.linkedin.com"] = "120"
+        response = await client.get("https://www.linkedin.com/posts/y", timeout=5)
+        assert response.status_code == 429 and responses["www.linkedin.com"] == [200]
+        assert client.rate_limiter.reserve("www.linkedin.com") >= 119, "the host stays paused as asked"
+        client.rate_limiter = HostRateLimiter()
+        retry_after["www.linkedin.com"] = "2"
+        responses["www.linkedin.com"] = [429, 200]
+        response = await client.get("https://www.linkedin.com/posts/z", timeout=1)
+        assert response.status_code == 429, "the retry would land after the caller's timeout"
+    finally:
+        await client.aclose()
+    
+    print("Per-host rate limiter test passed!\n")
+
+
+async def test_extraction_cache():
+    """Test cached results are keyed by post identity and evicted by size."""
+    import os
+    import tempfile
+    from cache import ExtractionCache, canonical_post_key
+    
+    print("Testing extraction cache...")
+    
+    shared = "https://www.linkedin.com/posts/someone_title-activity-7366052540108406785-2tgF?utm_source=share&rcm=ABC"
+    plain = "https://linkedin.com/posts/someone_other-slug-activity-7366052540108406785-xyz1/"
+    assert canonical_post_key(shared) == canonical_post_key(plain) == "activity:7366052540108406785"
+    assert (canonical_post_key("https://www.linkedin.com/pulse/title/?utm_medium=x&a=1") ==
+            canonical_post_key("https://linkedin.com/pulse/title?a=1"))
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "cache.sqlite3")
+        extractor = LinkedInExtractor(cache_path=cache_path)
+        cached_result = {"url": plain, "text": "Cached post text", "link": None,
+                         "link_img": None, "success": True}
+        extractor.cache.set(canonical_post_key(plain), cached_result)
+        
+        # Served from cache without touching the network
+        result = await extractor.extract_post_text(shared)
+        assert result["text"] == "Cached post text"
+        assert result["url"] == shared
+        assert extractor.get_stats()["cache"]["hits"] == 1
+        await extractor.aclose()
+        
+        small = ExtractionCache(os.path.join(tmp, "small.sqlite3"), max_bytes=150, touch_interval=0)
+        small.set("a", {"text": "x" * 60})
+        small.set("b", {"text": "y" * 60})
+        small.get("a")  # "a" is now more recently used than "b"
+        small.set("c", {"text": "z" * 60})
+        assert small.get("a") is not None
+        assert small.get("b") is None
+        
+        # Stats come from memory, so /health never waits on the database
+        def no_database():
+            raise AssertionError("get_stats should not query the database")
+        small._connect = no_database
+        stats = small.get_stats()
+        assert stats["entries"] == 2 and stats["evictions"] == 1, stats
+        assert stats["size_bytes"] == small._conn.execute("SELECT SUM(size) FROM extractions").fetchone()[0]
+        small.close()
+        
+        # Within touch_interval a hit is a pure read and leaves the access time alone
+        lazy = ExtractionCache(os.path.join(tmp, "lazy.sqlite3"), touch_interval=60)
+        lazy.set("a", {"text": "x"})
+        touched = "SELECT accessed_at FROM extractions WHERE key = 'a'"
+        accessed_at = lazy._conn.execute(touched).fetchone()[0]
+        assert await lazy.aget("a") == {"text": "x"}
+        assert lazy._conn.execute(touched).fetchone()[0] == accessed_at
+        lazy.close()
+        
+        expiring = ExtractionCache(os.path.join(tmp, "ttl.sqlite3"), ttl=0)
+        expiring.set("a", {"text": "x"})
+        assert expiring.get("a") is None
+        expiring.close()
+    
+    print("Extraction cache test passed!\n")
+
+
+async def test_redirect_cache():
+    """Test redirect resolutions are memoized and failures expire quickly."""
+    import os
+    import tempfile
+    
+    print("Testing redirect cache...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        extractor = LinkedInExtractor(cache_path=os.path.join(tmp, "cache.sqlite3"))
+        calls = []
+        
+        async def fake_chain(url, deadline=None):
+            calls.append(url)
+            if "broken" in url:
+                return url, True
+            return "https://www.youtube.com/watch?v=dQw4w9WgXcQ", False
+        
+        extractor._follow_redirect_chain = fake_chain
+        first = await extractor._resolve_linkedin_redirect("https://lnkd.in/abc123")
+        second = await extractor._resolve_linkedin_redirect("https://lnkd.in/abc123")
+        assert first == second == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        assert calls == ["https://lnkd.in/abc123"], "Repeat resolution should not hit the network"
+        
+        # Failures are cached for negative_ttl only
+        extractor.redirect_cache.negative_ttl = 0
+        await extractor._resolve_linkedin_redirect("https://lnkd.in/broken")
+        await extractor._resolve_linkedin_redirect("https://lnkd.in/broken")
+        assert calls.count("https://lnkd.in/broken") == 2
+        await extractor.aclose()
+        
+        # Positive entries persist across extractor instances
+        restarted = LinkedInExtractor(cache_path=os.path.join(tmp, "cache.sqlite3"))
+        restarted._follow_redirect_chain = fake_chain
+        await restarted._resolve_linkedin_redirect("https://lnkd.in/abc123")
+        assert len(calls) == 3
+        await restarted.aclose()
+    
+    page = '<script>var data = {"videoId": "dQw4w9WgXcQ"};</script>'
+    assert extractor._find_youtube_video_id(page) == "dQw4w9WgXcQ"
+    
+    print("Redirect cache test passed!\n")
+
+
+async def test_extraction_plan():
+    """Test the single-pass plan keeps selector priority for text, links and images."""
+    from bs4 import BeautifulSoup
+    from extraction_plan import POST_PLAN
+    from html_parsers import available_backends, parse_html, strip_non_content
+    
+    print("Testing extraction plan...")
+    
+    html = """
+    <html><body>
+      <nav><a href="https://www.linkedin.com/in/someone">Profile</a>
+           <a href="https://example.com/outside">Outside</a></nav>
+      <div class="break-words"><span dir="ltr">Lower priority text block</span></div>
+      <div data-test-id="main-feed-activity-card">
+        <img src="https://media.licdn.com/profile-displayphoto-1.jpg">
+        <img src="https://media.licdn.com/tiny.jpg" width="20" height="20">
+        <div class="feed-shared-text">The actual   post text <a href="https://example.com/article">article</a></div>
+        <img src="https://media.licdn.com/post-image.jpg" width="800" height="400">
+      </div>
+      <footer><a href="https://lnkd.in/abcdef">short link</a></footer>
+    </body></html>
+    """
+    text, link, image = POST_PLAN.extract(BeautifulSoup(html, 'html.parser'))
+    
+    assert text == "The actual post textarticle", text
+    assert link == "https://lnkd.in/abcdef", "lnkd.in links take priority over other external links"
+    assert image == "https://media.licdn.com/post-image.jpg", image
+    
+    # Every installed parser backend must agree with html.parser
+    for backend in available_backends():
+        document, tree = parse_html(strip_non_content(html.encode('utf-8')), backend)
+        assert POST_PLAN.extract(document, tree) == (text, link, image), backend
+    
+    print("Extraction plan test passed!\n")
+
+
+async def test_head_metadata():
+    """Test og:/JSON-LD metadata in the head is used before the DOM walk."""
+    from page_metadata import extract_head_metadata, find_head_end
+    
+    print("Testing head metadata tier...")
+    
+    ld_json = json.dumps({
+        "@context": "http://schema.org",
+        "@type": "SocialMediaPosting",
+        "articleBody": "Full post   body from JSON-LD",
+        "image": {"@type": "ImageObject", "url": "https://media.licdn.com/post-image.jpg"},
+        "sharedContent": {"@type": "WebPage", "url": "https://lnkd.in/abcdef"},
+    })
+    page = (
+        '<html><head><meta property="og:description" content="Truncated &amp; short">'
+        '<meta property="og:image" content="https://media.licdn.com/og-image.jpg">'
+        f'<script type="application/ld+json">{ld_json}</script></head>'
+        '<body><div class="feed-shared-text">DOM text that should not be needed</div></body></html>'
+    ).encode('utf-8')
+    
+    head_end = find_head_end(page)
+    assert page[:head_end].endswith(b'</head>')
+    metadata = extract_head_metadata(page[:head_end])
+    assert metadata.complete
+    assert metadata.text == "Full post body from JSON-LD", metadata.text
+    assert metadata.link == "https://lnkd.in/abcdef"
+    assert metadata.image == "https://media.licdn.com/post-image.jpg"
+    
+    extractor = LinkedInExtractor(cache_path=None)
+    try:
+        assert extractor._extract_from_page(page) == (metadata.text, metadata.link, metadata.image)
+        
+        # Only og:description in the head: the page is still walked and the full DOM text wins
+        partial = (
+            '<html><head><meta property="og:description" content="Short &amp; sweet summary text">'
+            '<meta property="og:image" content="https://media.licdn.com/og-image.jpg"></head>'
+            '<body><div class="feed-shared-text">Longer DOM post text that the summary cut short '
+            '<a href="https://example.com/article">article</a></div></body></html>'
+        ).encode('utf-8')
+        summary = extract_head_metadata(partial[:find_head_end(partial)])
+        assert summary.text_source == "og:description" and not summary.complete
+        text, link, image = extractor._extract_from_page(partial)
+        assert text == "Longer DOM post text that the summary cut shortarticle", text
+        assert link == "https://example.com/article", link
+        assert image == "https://media.licdn.com/og-image.jpg", image
+        
+        # ...and og:description only fills in when the DOM walk finds no text
+        empty_body = partial.split(b'<body>')[0] + b'<body></body></html>'
+        text, _, _ = extractor._extract_from_page(empty_body)
+        assert text == "Short & sweet summary text", text
+        
+        assert extractor.get_stats()["tiers"] == {"metadata_only": 1, "metadata_and_dom": 2, "dom_only": 0}
+    finally:
+        await extractor.aclose()
+    
+    print("Head metadata tier test passed!\n")
+
+
+async def test_streaming_fetch():
+    """Test post pages and lnkd.in pages stop downloading once the needed fields are read."""
+    import httpx
+    
+    print("Testing streaming fetch...")
+    
+    ld_json = json.dumps({
+        "@type": "SocialMediaPosting",
+        "articleBody": "Streamed post body text",
+        "image": "https://media.licdn.com/post-image.jpg",
+        "sharedContent": {"url": "https://example.com/article"},
+    })
+    post_page = [
+        b'<html><head><script type="application/ld+json">',
+        ld_json.encode('utf-8'),
+        b'</script></he', b'ad><body>',
+    ] + [b'<p class="comment">filler</p>' * 50] * 20 + [b'</body></html>']
+    short_page = [b'<html><body>redirecting', b' to https://youtu.be/dQw4w9', b'WgXcQ ...'] + [b'x' * 1000] * 20
+    chunks_sent = {}
+    
+    def handler(request):
+        chunks = post_page if request.url.path.startswith('/posts/') else short_page
+        path = request.url.path
+        
+        async def body():
+            for chunk in chunks:
+                chunks_sent[path] = chunks_sent.get(path, 0) + 1
+                yield chunk
+        
+        return httpx.Response(200, content=body())
+    
+    extractor = LinkedInExtractor(cache_path=None)
+    extractor.http._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        text, link, image = await extractor._extract_with_requests("https://www.linkedin.com/posts/a_activity-1-x")
+        assert (text, link, image) == (
+            "Streamed post body text", "https://example.com/article", "https://media.licdn.com/post-image.jpg"
+        )
+        assert chunks_sent["/posts/a_activity-1-x"] == 4, "reading stops right after </head>"
+        
+        assert await extractor._scan_lnkd_in_page("https://lnkd.in/abc") == "dQw4w9WgXcQ"
+        assert chunks_sent["/abc"] == 3, "reading stops at the first YouTube ID"
+        
+        stats = extractor.get_stats()["http"]
+        assert stats["streamed"] == 2 and stats["stopped_early"] == 2, stats
+    finally:
+        await extractor.aclose()
+    
+    print("Streaming fetch test passed!\n")
+
+
+class _FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def evaluate(self, script):
+        return 0
+
+
+class _FakeContext:
+    def __init__(self):
+        self.page = _FakePage()
+        self.route_handler = None
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+    async def new_page(self):
+        return self.page
+
+    async def close(self):
+        self.page.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        return _FakeContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class _FakeRequest:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class _FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = _FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = 'aborted'
+
+    async def continue_(self):
+        self.outcome = 'continued'
+
+
+class _FakePlaywright:
+    def __init__(self):
+        self.chromium = self
+
+    async def start(self):
+        return self
+
+    async def launch(self, **kwargs):
+        return _FakeBrowser()
+
+    async def stop(self):
+        pass
+
+
+async def test_browser_pool():
+    """Test the shared browser is launched once and pages are reused, then recycled."""
+    import browser_pool
+    
+    print("Testing browser pool...")
+    
+    original = browser_pool.async_playwright
+    browser_pool.async_playwright = _FakePlaywright
+    try:
+        pool = browser_pool.BrowserPool(max_pages=2, max_navigations_per_page=2)
+        async with pool.page() as first:
+            pass
+        async with pool.page() as second:
+            pass
+        async with pool.page() as third:
+            pass
+        
+        assert first is second, "Page should be reused from the pool"
+        assert third is not first, "Page should be recycled after max navigations"
+        assert first.is_closed()
+        stats = pool.get_stats()
+        assert stats['launches'] == 1
+        assert stats['pages_created'] == 2
+        
+        # Every context routes requests through the blocking policy
+        for url, resource_type, expected in [
+            ("https://www.linkedin.com/posts/x", "document", "continued"),
+            ("https://static.licdn.com/app.js", "script", "continued"),
+            ("https://media.licdn.com/post.jpg", "image", "aborted"),
+            ("https://static.licdn.com/font.woff2", "font", "aborted"),
+            ("https://www.google-analytics.com/collect", "xhr", "aborted"),
+            ("https://px.ads.linkedin.com/collect", "script", "aborted"),
+        ]:
+            route = _FakeRoute(url, resource_type)
+            await pool._idle[0].context.route_handler(route)
+            assert route.outcome == expected, url
+        assert pool.get_stats()['requests_blocked'] == 4
+        
+        await pool.close()
+        assert not pool.get_stats()['browser_running']
+    finally:
+        browser_pool.async_playwright = original
+    
+    print("Browser pool test passed!\n")
+
+
+class _FakeHarvestPage:
+    """Live-page stand-in that records every call made over the browser connection."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+
+    async def goto(self, url, **kwargs):
+        self.calls.append(('goto', kwargs.get('wait_until')))
+
+    async def wait_for_selector(self, selector, **kwargs):
+        self.calls.append(('wait_for_selector', kwargs.get('timeout')))
+
+    async def evaluate(self, script, arg=None):
+        self.calls.append(('evaluate', None))
+        return self.payload
+
+
+class _FakeHarvestPool:
+    def __init__(self, page):
+        self._page = page
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        yield self._page
+
+    def get_stats(self):
+        return {}
+
+    async def close(self):
+        pass
+
+
+async def test_playwright_harvest():
+    """Test the Playwright fallback gathers all candidates in one evaluate round trip."""
+    print("Testing Playwright DOM harvest...")
+    
+    payload = {
+        "text": [[], ["short", "The rendered post text from the browser"], [], [], [], []],
+        "links": [["https://www.linkedin.com/in/author", "https://example.com/other"],
+                  [], [], [], [], ["https://lnkd.in/abc"], []],
+        "images": [[["https://media.licdn.com/profile-displayphoto.jpg", "56", "56"]],
+                   [["https://media.licdn.com/post.jpg", "800", "450"]], [], [], [], [], []],
+    }
+    page = _FakeHarvestPage(payload)
+    extractor = LinkedInExtractor(cache_path=None, content_wait_ms=500)
+    extractor.browser_pool = _FakeHarvestPool(page)
+    extractor.redirect_cache.set("https://lnkd.in/abc", "https://example.com/article")
+    try:
+        text, link, image = await extractor._extract_with_playwright("https://www.linkedin.com/posts/a_activity-1-x")
+        assert text == "The rendered post text from the browser", text
+        assert link == "https://example.com/article", link
+        assert image == "https://media.licdn.com/post.jpg", image
+        assert page.calls == [('goto', 'domcontentloaded'), ('wait_for_selector', 500), ('evaluate', None)]
+        
+        timings = extractor.get_stats()["playwright_fallback"]
+        assert timings["runs"] == 1 and timings["content_wait_timeouts"] == 0
+        assert set(timings["phases"]) == {"lease", "navigation", "content_wait", "harvest"}
+    finally:
+        await extractor.aclose()
+    
+    print("Playwright DOM harvest test passed!\n")
+
+
 async def test_mcp_server_import():
     """Test that the MCP server can be imported and initialized."""
     try:
         from mcp_server import LinkedInMCPServer
-        server = LinkedInMCPServer()
+        server = LinkedInMCPServer(cache_path=None)
         print("✓ MCP server can be imported and initialized")
         print(f"✓ FastAPI app created: {server.app.title}")
         print("MCP server import test passed!\n")
@@ -98,6 +784,772 @@ async def test_mcp_server_import():
         raise
 
 
+async def test_stdio_concurrent_dispatch():
+    """Test the stdio server answers control messages while an extraction is still running."""
+    from mcp_stdio_server import LinkedInMCPStdioServer
+    
+    print("Testing stdio concurrent dispatch...")
+    
+    server = LinkedInMCPStdioServer(max_in_flight=4, cache_path=None)
+    
+    async def slow_extract(url, timeout=None):
+        await asyncio.sleep(0.2)
+        return {"url": url, "text": "Slow post text", "success": True}
+    
+    server.extractor.extract_post_text = slow_extract
+    lines = [
+        json.dumps({"jsonrpc": "2.0", "id": 1, "method": "call_tool",
+                    "params": {"name": "get_linkedin_post_text",
+                               "arguments": {"url": "https://www.linkedin.com/posts/x_activity-1-a"}}}),
+        json.dumps({"jsonrpc": "2.0", "id": 2, "method": "list_tools"}),
+        "not json",
+        json.dumps({"jsonrpc": "2.0", "id": 3, "method": "initialize"}),
+    ]
+    written = []
+    
+    class FakeTransport:
+        async def read_message(self):
+            return lines.pop(0) + "\n" if lines else None
+        
+        async def write_message(self, message):
+            written.append(message)
+    
+    try:
+        await asyncio.wait_for(server.serve(FakeTransport()), timeout=5)
+    finally:
+        await server.extractor.aclose()
+    
+    responses = [json.loads(line) for line in written]
+    ids = [response["id"] for response in responses]
+    assert ids[-1] == 1, f"the slow extraction is answered last: {ids}"
+    assert sorted(ids, key=str) == sorted([1, 2, None, 3], key=str), ids
+    assert next(r for r in responses if r["id"] is None)["error"]["code"] == -32700
+    
+    print("Stdio concurrent dispatch test passed!\n")
+
+
+async def test_stdio_transport():
+    """Test the asyncio pipe transport frames messages and skips oversized ones."""
+    import os
+    from stdio_transport import MessageTooLarge, PipeTransport
+    
+    print("Testing stdio pipe transport...")
+    
+    in_read, in_write = os.pipe()
+    out_read, out_write = os.pipe()
+    stdin = os.fdopen(in_read, 'rb', buffering=0)
+    stdout = os.fdopen(out_write, 'wb', buffering=0)
+    transport = await PipeTransport.connect(stdin, stdout, max_message_bytes=1024)
+    try:
+        os.write(in_write, b'{"id": 1}\n' + b'x' * 5000 + b'\n{"id": 2}\n{"id": 3}')
+        os.close(in_write)
+        
+        assert await transport.read_message() == '{"id": 1}\n'
+        try:
+            await transport.read_message()
+            assert False, "oversized message should raise"
+        except MessageTooLarge:
+            pass
+        assert await transport.read_message() == '{"id": 2}\n', "reading resumes after the oversized message"
+        assert await transport.read_message() == '{"id": 3}', "a final message without newline is returned"
+        assert await transport.read_message() is None
+        
+        for i in range(3):
+            await transport.write_message(json.dumps({"id": i}))
+    finally:
+        await transport.close()
+    
+    with os.fdopen(out_read, 'rb') as output:
+        assert output.read().splitlines() == [b'{"id": 0}', b'{"id": 1}', b'{"id": 2}']
+    
+    print("Stdio pipe transport test passed!\n")
+
+
+async def test_jsonrpc_batch():
+    """Test both servers run batch entries concurrently and answer in request order."""
+    import time
+    import httpx
+    from mcp_server import LinkedInMCPServer
+    from mcp_stdio_server import LinkedInMCPStdioServer
+    
+    print("Testing JSON-RPC batch requests...")
+    
+    async def staggered_extract(url, timeout=None):
+        # Later posts finish first, so completion order is the reverse of request order
+        await asyncio.sleep(0.1 * (4 - int(url.rsplit("-", 1)[-1])))
+        return {"url": url, "text": f"Post {url[-1]}", "success": True}
+    
+    def call(request_id, index):
+        return {"jsonrpc": "2.0", "id": request_id, "method": "call_tool",
+                "params": {"name": "get_linkedin_post_text",
+                           "arguments": {"url": f"https://www.linkedin.com/posts/x_activity-1-{index}"}}}
+    
+    batch = [
+        call(10, 1),
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+        call("b", 2),
+        42,
+        call(30, 3),
+    ]
+    
+    stdio_server = LinkedInMCPStdioServer(cache_path=None)
+    http_server = LinkedInMCPServer(cache_path=None)
+    for server in (stdio_server, http_server):
+        server.extractor.extract_post_text = staggered_extract
+    
+    try:
+        start = time.perf_counter()
+        stdio_responses = await stdio_server.handle_message(batch)
+        elapsed = time.perf_counter() - start
+        
+        transport = httpx.ASGITransport(app=http_server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            http_responses = (await client.post("/mcp", json=batch)).json()
+            single = (await client.post("/mcp", json=call(7, 1))).json()
+            empty = (await client.post("/mcp", json=[])).json()
+            notifications_only = await client.post("/mcp", json=[batch[1]])
+            single_notification = await client.post("/mcp", json=batch[1])
+        assert await stdio_server.handle_message(batch[1]) is None, "a single notification gets no response"
+    finally:
+        await stdio_server.extractor.aclose()
+        await http_server.extractor.aclose()
+    
+    assert elapsed < 0.5, f"batch entries should run concurrently, took {elapsed:.2f}s"
+    for responses in (stdio_responses, http_responses):
+        assert [r["id"] for r in responses] == [10, "b", None, 30], "request order, notification omitted"
+        assert json.loads(responses[0]["result"]["content"][0]["text"])["text"] == "Post 1"
+        assert responses[2]["error"]["code"] == -32600
+    
+    assert single["id"] == 7 and "result" in single, "single requests still work"
+    assert empty["error"]["code"] == -32600
+    assert notifications_only.status_code == 204
+    assert single_notification.status_code == 204 and not single_notification.content
+    
+    print("JSON-RPC batch test passed!\n")
+
+
+async def test_posts_batch_tool():
+    """Test the batch tool reports progress per post and survives a failing URL."""
+    from mcp_stdio_server import LinkedInMCPStdioServer
+    
+    print("Testing get_linkedin_posts_batch tool...")
+    
+    server = LinkedInMCPStdioServer(cache_path=None)
+    
+    async def fake_extract(url, timeout=None):
+        index = int(url.rsplit("-", 1)[-1])
+        await asyncio.sleep(0.05 * (3 - index))
+        if index == 2:
+            raise RuntimeError("post unavailable")
+        return {"url": url, "text": f"Post {index}", "link": None,
+                "link_img": f"https://media.licdn.com/post-{index}.jpg", "success": True}
+    
+    server.extractor.extract_post_text = fake_extract
+    urls = [f"https://www.linkedin.com/posts/x_activity-1-{i}" for i in range(3)]
+    lines = [
+        json.dumps({"jsonrpc": "2.0", "id": 1, "method": "list_tools"}),
+        json.dumps({"jsonrpc": "2.0", "id": 2, "method": "call_tool",
+                    "params": {"name": "get_linkedin_posts_batch", "arguments": {"urls": urls},
+                               "_meta": {"progressToken": "issue-42"}}}),
+        json.dumps({"jsonrpc": "2.0", "id": 3, "method": "call_tool",
+                    "params": {"name": "get_linkedin_posts_batch", "arguments": {"urls": []}}}),
+    ]
+    written = []
+    
+    class FakeTransport:
+        async def read_message(self):
+            return lines.pop(0) + "\n" if lines else None
+        
+        async def write_message(self, message):
+            written.append(message)
+    
+    try:
+        await asyncio.wait_for(server.serve(FakeTransport()), timeout=5)
+    finally:
+        await server.extractor.aclose()
+    
+    messages = [json.loads(line) for line in written]
+    tools = next(m for m in messages if m.get("id") == 1)["result"]["tools"]
+    assert "get_linkedin_posts_batch" in [tool["name"] for tool in tools]
+    
+    progress = [m["params"] for m in messages if m.get("method") == "notifications/progress"]
+    assert [p["progress"] for p in progress] == [1, 2, 3], progress
+    assert all(p["progressToken"] == "issue-42" and p["total"] == 3 for p in progress)
+    
+    response = next(m for m in messages if m.get("id") == 2)
+    assert messages.index(response) > max(i for i, m in enumerate(messages) if m.get("method")), \
+        "the combined result follows every progress notification"
+    text = response["result"]["content"][0]["text"]
+    assert ": " not in text.replace("post unavailable", ""), "combined result is compact"
+    combined = json.loads(text)
+    assert (combined["total"], combined["succeeded"], combined["failed"]) == (3, 2, 1)
+    assert [post["url"] for post in combined["posts"]] == urls, "posts keep request order"
+    assert combined["posts"][2] == {"url": urls[2], "success": False, "error": "post unavailable"}
+    assert "link" not in combined["posts"][0], "null fields are dropped"
+    assert combined["posts"][0]["link_img"] == "https://media.licdn.com/post-0.jpg", "the post image is kept"
+    
+    assert next(m for m in messages if m.get("id") == 3)["error"]["code"] == -32602
+    
+    print("get_linkedin_posts_batch tool test passed!\n")
+
+
+async def test_lazy_imports():
+    """Test that starting the servers and answering initialize doesn't import heavy dependencies."""
+    import os
+    import subprocess
+    import sys
+    
+    print("Testing lazy imports at server startup...")
+    
+    script = """
+import asyncio, json, sys
+from mcp_stdio_server import LinkedInMCPStdioServer
+from mcp_server import LinkedInMCPServer
+
+async def main():
+    stdio_server = LinkedInMCPStdioServer(cache_path=None)
+    response = await stdio_server.handle_request({"jsonrpc": "2.0", "id": 1, "method": "initialize"})
+    assert "result" in response
+    LinkedInMCPServer(cache_path=None)
+    print(json.dumps(sorted(m for m in ("playwright", "bs4", "lxml", "selectolax", "httpx", "fastapi", "uvicorn")
+                            if m in sys.modules)))
+
+asyncio.run(main())
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=60,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    assert result.returncode == 0, result.stderr
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    assert loaded == [], f"imported before the first extraction or HTTP request: {loaded}"
+    
+    print("Lazy import test passed!\n")
+
+
+async def test_debug_server_logging():
+    """Test the debug server logs every request, single or batched, that it answers over stdio."""
+    import os
+    import subprocess
+    import sys
+    import tempfile
+    
+    print("Testing debug server request logging...")
+    
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize"},
+        [{"jsonrpc": "2.0", "id": 2, "method": "list_tools"},
+         {"jsonrpc": "2.0", "method": "notifications/initialized"}],
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = os.path.join(tmp, "mcp_debug.log")
+        env = {**os.environ, "LINKEDIN_MCP_DEBUG_LOG": log_file, "LINKEDIN_MCP_CACHE_DIR": tmp}
+        here = os.path.dirname(os.path.abspath(__file__))
+        result = subprocess.run(
+            [sys.executable, os.path.join(here, "debug_mcp_server.py")],
+            input="".join(json.dumps(message) + "\n" for message in messages),
+            capture_output=True, text=True, timeout=60, cwd=here, env=env,
+        )
+        assert result.returncode == 0, result.stderr
+        with open(log_file, encoding="utf-8") as f:
+            log = f.read()
+    
+    responses = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+    assert responses[0]["id"] == 1 and [r["id"] for r in responses[1]] == [2], responses
+    assert log.count("INCOMING REQUEST") == 3, "the single request and both batch entries are logged"
+    for method in ("initialize", "list_tools", "notifications/initialized"):
+        assert f"Processing method: {method}" in log, method
+    assert log.count("OUTGOING RESPONSE") == 2 and "OUTGOING ERROR RESPONSE" in log
+    
+    print("Debug server logging test passed!\n")
+
+
+async def test_dispatch_core():
+    """Test that tools registered once on the dispatch core are served by every adapter."""
+    import httpx
+    from mcp_dispatch import RPCError
+    from mcp_server import LinkedInMCPServer
+    from mcp_stdio_server import LinkedInMCPStdioServer
+    
+    print("Testing shared dispatch core...")
+    
+    async def echo_tool(arguments, on_progress=None):
+        if arguments.get("fail") == "rpc":
+            raise RPCError(-32602, "Invalid params: bad echo")
+        if arguments.get("fail") == "crash":
+            raise RuntimeError("echo crashed")
+        return {"content": [{"type": "text", "text": arguments.get("say", "")}]}
+    
+    echo_schema = {"name": "echo", "description": "Echo", "inputSchema": {"type": "object"}}
+    
+    def call(request_id, **arguments):
+        return {"jsonrpc": "2.0", "id": request_id, "method": "call_tool",
+                "params": {"name": "echo", "arguments": arguments}}
+    
+    stdio_server = LinkedInMCPStdioServer(cache_path=None)
+    http_server = LinkedInMCPServer(cache_path=None)
+    try:
+        for server in (stdio_server, http_server):
+            server.core.register_tool(echo_schema, echo_tool)
+        
+        transport = httpx.ASGITransport(app=http_server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            async def over_http(request):
+                return (await client.post("/mcp", json=request)).json()
+            
+            for send in (stdio_server.handle_request, over_http):
+                tools = (await send({"jsonrpc": "2.0", "id": 1, "method": "list_tools"}))["result"]["tools"]
+                assert [tool["name"] for tool in tools] == [
+                    "get_linkedin_post_text", "get_linkedin_posts_batch", "echo"
+                ], tools
+                assert (await send(call(2, say="hi")))["result"]["content"][0]["text"] == "hi"
+                assert (await send(call(3, fail="rpc")))["error"]["code"] == -32602
+                crashed = await send(call(4, fail="crash"))
+                assert crashed["error"] == {"code": -32603, "message": "Internal error", "data": "echo crashed"}
+                assert (await send({"jsonrpc": "2.0", "id": 5, "method": "nope"}))["error"]["code"] == -32601
+                assert (await send({"jsonrpc": "2.0", "id": 6}))["error"]["code"] == -32600
+                assert (await send({"jsonrpc": "2.0", "id": 7, "method": "call_tool",
+                                    "params": {"name": "missing"}}))["error"]["code"] == -32601
+                bad_meta = await send({"jsonrpc": "2.0", "id": 7, "method": "call_tool",
+                                       "params": {"name": "echo", "_meta": "token"}})
+                assert bad_meta["error"]["code"] == -32602, bad_meta
+            
+            health = (await client.get("/health")).json()
+        
+        first = await stdio_server.handle_request({"jsonrpc": "2.0", "id": 8, "method": "initialize"})
+        second = await stdio_server.handle_request({"jsonrpc": "2.0", "id": 9, "method": "initialize"})
+        assert first["result"] is second["result"], "initialize result is built once"
+        
+        stats = (await stdio_server.handle_request({"jsonrpc": "2.0", "id": 10, "method": "get_stats"}))["result"]
+        assert stats["dispatch"]["call_tool"]["calls"] == 5
+        assert stats["dispatch"]["call_tool"]["errors"] == 4
+        assert stats["dispatch"]["initialize"]["calls"] == 2
+        assert "nope" not in stats["dispatch"], "only registered methods are tracked"
+        assert health["stats"]["dispatch"]["list_tools"]["calls"] == 1
+    finally:
+        await stdio_server.extractor.aclose()
+        await http_server.extractor.aclose()
+    
+    print("Dispatch core test passed!\n")
+
+
+async def test_serialization():
+    """Test compact UTF-8 tool results, pretty output on request and the stdlib fallback."""
+    import httpx
+    from mcp_server import LinkedInMCPServer
+    from serialization import OrjsonSerializer, StdlibSerializer, resolve_serializer
+    
+    print("Testing JSON serialization...")
+    
+    hebrew = "שלום עולם! פוסט ארוך בעברית"
+    post = {"url": "https://www.linkedin.com/posts/x_activity-1-a", "text": hebrew, "success": True}
+    
+    serializers = [StdlibSerializer()]
+    with contextlib.suppress(ImportError):
+        serializers.append(OrjsonSerializer())
+    for serializer in serializers:
+        compact = serializer.dumps(post)
+        assert hebrew in compact and "\\u05" not in compact, f"{serializer.name} keeps Hebrew as UTF-8"
+        assert ": " not in compact and "\n" not in compact, f"{serializer.name} is compact by default"
+        assert "\n  " in serializer.dumps(post, pretty=True)
+        assert serializer.loads(serializer.dumps_bytes(post)) == post
+        # What the fast path can't encode still goes out through the standard library
+        assert serializer.loads(serializer.dumps_bytes({1: "\ud800"})) == {"1": "\ud800"}
+    assert resolve_serializer("json").name == "json"
+    assert resolve_serializer("no-such-backend").name == "json"
+    
+    server = LinkedInMCPServer(cache_path=None)
+    
+    extracted = []
+    
+    async def fake_extract(url, timeout=None):
+        extracted.append(url)
+        return {**post, "url": url}
+    
+    server.extractor.extract_post_text = fake_extract
+    
+    def call(request_id, tool="get_linkedin_post_text", **arguments):
+        target = {"urls": [post["url"]]} if tool == "get_linkedin_posts_batch" else {"url": post["url"]}
+        return {"jsonrpc": "2.0", "id": request_id, "method": "call_tool",
+                "params": {"name": tool, "arguments": {**target, **arguments}}}
+    
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/mcp", json=call(1))
+            assert hebrew.encode("utf-8") in response.content, "response body is not \\u-escaped"
+            text = response.json()["result"]["content"][0]["text"]
+            assert json.loads(text) == post and ": " not in text
+            
+            text = (await client.post("/mcp", json=call(2, pretty=True))).json()["result"]["content"][0]["text"]
+            assert json.loads(text) == post and "\n  " in text
+            
+            extracted.clear()
+            assert (await client.post("/mcp", json=call(3, pretty="yes"))).json()["error"]["code"] == -32602
+            batch = await client.post("/mcp", json=call(4, tool="get_linkedin_posts_batch", pretty="yes"))
+            assert batch.json()["error"]["code"] == -32602
+            assert extracted == [], "pretty is validated before any extraction starts"
+            
+            bad = await client.post("/mcp", content=b"{not json", headers={"Content-Type": "application/json"})
+            assert bad.status_code == 200 and bad.json()["error"]["code"] == -32700
+    finally:
+        await server.extractor.aclose()
+    
+    print("Serialization test passed!\n")
+
+
+async def test_extraction_jobs():
+    """Test background jobs: immediate job ID, bounded queue, SSE stage events, resume and TTL."""
+    import httpx
+    from mcp_server import LinkedInMCPServer
+    from progress import report_stage
+    
+    print("Testing extraction jobs...")
+    
+    server = LinkedInMCPServer(job_workers=1, max_queued_jobs=1, job_ttl=0.3, cache_path=None)
+    release = asyncio.Event()
+    
+    async def slow_extract(url, timeout=None):
+        report_stage("http")
+        await release.wait()
+        report_stage("playwright", reason="fallback")
+        return {"url": url, "text": "Post text from the browser", "success": True}
+    
+    server.extractor.extract_post_text = slow_extract
+    url = "https://www.linkedin.com/posts/x_activity-1-a"
+    
+    def parse_sse(body):
+        events = []
+        for block in body.strip().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+        return events
+    
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            submitted = await client.post("/jobs", json={"url": url, "timeout": 120})
+            assert submitted.status_code == 202, submitted.text
+            job_id = submitted.json()["job_id"]
+            await asyncio.sleep(0.05)
+            
+            job = (await client.get(f"/jobs/{job_id}")).json()
+            assert job["status"] == "running" and job["stage"] == "http", job
+            assert [event["stage"] for event in job["events"]] == ["queued", "running", "http"]
+            
+            # One worker busy and one job waiting: the next submission is refused right away
+            assert (await client.post("/jobs", json={"url": url})).status_code == 202
+            full = await client.post("/jobs", json={"url": url})
+            assert full.status_code == 503 and full.headers["retry-after"], full.text
+            assert (await client.post("/jobs", json={"timeout": 5})).status_code == 400
+            assert (await client.get("/jobs/no-such-job")).status_code == 404
+            
+            stream = asyncio.create_task(client.get(f"/jobs/{job_id}/events"))
+            await asyncio.sleep(0.05)
+            release.set()
+            response = await asyncio.wait_for(stream, timeout=5)
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = parse_sse(response.text)
+            stages = [data["stage"] for _, kind, data in events if kind == "stage"]
+            assert stages == ["queued", "running", "http", "playwright", "succeeded"], stages
+            assert events[3][2]["reason"] == "fallback"
+            assert events[-1][1] == "result" and events[-1][2]["result"]["text"] == "Post text from the browser"
+            
+            # A reconnecting client only gets what it missed
+            resumed = await client.get(f"/jobs/{job_id}/events", headers={"Last-Event-ID": "2"})
+            assert [data["stage"] for _, kind, data in parse_sse(resumed.text) if kind == "stage"] == [
+                "playwright", "succeeded"
+            ]
+            
+            assert (await client.get(f"/jobs/{job_id}")).json()["status"] == "succeeded"
+            await asyncio.sleep(0.4)
+            assert (await client.get(f"/jobs/{job_id}")).status_code == 404, "finished jobs expire after the TTL"
+            
+            jobs = (await client.get("/health")).json()["stats"]["jobs"]
+            assert jobs["submitted"] == 2 and jobs["rejected"] == 1 and jobs["expired"] >= 1, jobs
+    finally:
+        await server.jobs.aclose()
+        await server.extractor.aclose()
+    
+    print("Extraction jobs test passed!\n")
+
+
+async def test_coalesced_jobs():
+    """Test two jobs for the same post share one extraction and both record its stages."""
+    from jobs import JobManager
+    from progress import report_stage
+    
+    print("Testing coalesced extraction jobs...")
+    
+    extractor = LinkedInExtractor(cache_path=None)
+    manager = JobManager(extractor.extract_post_text, workers=3)
+    release = asyncio.Event()
+    tier_calls = []
+    
+    async def slow_tiers(url, deadline):
+        tier_calls.append(url)
+        report_stage("http")
+        await release.wait()
+        report_stage("playwright", reason="fallback")
+        return "Shared post text", None, None, "Playwright"
+    
+    extractor._extract_with_tiers = slow_tiers
+    url = "https://www.linkedin.com/posts/x_activity-6666666666666666666-a"
+    try:
+        first = manager.submit(url, timeout=30)
+        await asyncio.sleep(0.02)
+        second = manager.submit(url + "?utm_source=share", timeout=30)
+        # A joined job is still bounded by its own timeout
+        impatient = manager.submit(url, timeout=0.05)
+        await asyncio.sleep(0.15)
+        assert impatient.status == "failed" and impatient.result["timed_out"], impatient.to_dict()
+        
+        release.set()
+        for _ in range(50):
+            if first.finished and second.finished:
+                break
+            await asyncio.sleep(0.01)
+        assert len(tier_calls) == 1, tier_calls
+        assert [event["stage"] for event in first.events] == [
+            "queued", "running", "http", "playwright", "succeeded"
+        ], first.events
+        assert [event["stage"] for event in second.events] == [
+            "queued", "running", "joined", "playwright", "succeeded"
+        ], second.events
+        assert second.result["text"] == "Shared post text"
+        assert [event["stage"] for event in impatient.events] == ["queued", "running", "joined", "failed"]
+    finally:
+        await manager.aclose()
+        await extractor.aclose()
+    
+    print("Coalesced extraction jobs test passed!\n")
+
+
+async def test_admission_control():
+    """Test the extraction cap, bounded wait queue and fast "Server busy" errors."""
+    import httpx
+    from admission import SERVER_BUSY, AdmissionController
+    from mcp_server import LinkedInMCPServer
+    
+    print("Testing admission control...")
+    
+    # Weighted slots are granted in order; a cancelled waiter leaves the queue
+    admission = AdmissionController(max_concurrent=2, max_queued=2, queue_wait=5)
+    order = []
+    
+    async def hold(name, weight, release):
+        async with admission.slot(weight):
+            order.append(name)
+            await release.wait()
+    
+    first, second, third = asyncio.Event(), asyncio.Event(), asyncio.Event()
+    running = asyncio.create_task(hold("a", 1, first))
+    await asyncio.sleep(0)
+    big = asyncio.create_task(hold("big", 2, second))
+    await asyncio.sleep(0)
+    small = asyncio.create_task(hold("small", 1, third))
+    await asyncio.sleep(0.01)
+    assert order == ["a"], "the small request doesn't overtake the big one queued before it"
+    assert admission.get_stats()["queued"] == 2
+    small.cancel()
+    await asyncio.gather(small, return_exceptions=True)
+    assert admission.get_stats()["queued"] == 1
+    first.set()
+    await asyncio.sleep(0.01)
+    assert order == ["a", "big"] and admission.active == 2
+    second.set()
+    await asyncio.gather(running, big)
+    assert admission.active == 0 and admission.get_stats()["queued"] == 0
+    
+    server = LinkedInMCPServer(
+        max_concurrent_extractions=1, max_queued_extractions=1, queue_wait=0.3, cache_path=None
+    )
+    release = asyncio.Event()
+    
+    async def slow_extract(url, timeout=None):
+        await release.wait()
+        return {"url": url, "text": "Post text", "success": True}
+    
+    server.extractor.extract_post_text = slow_extract
+    
+    def call(request_id, **arguments):
+        return {"jsonrpc": "2.0", "id": request_id, "method": "call_tool",
+                "params": {"name": "get_linkedin_post_text",
+                           "arguments": {"url": "https://www.linkedin.com/posts/x_activity-1-a", **arguments}}}
+    
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            running = asyncio.create_task(client.post("/mcp", json=call(1)))
+            await asyncio.sleep(0.05)
+            waiting = asyncio.create_task(client.post("/mcp", json=call(2)))
+            await asyncio.sleep(0.05)
+            
+            # One extraction running and one waiting: the next request is refused without waiting
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            refused = await client.post("/mcp", json=call(3))
+            assert loop.time() - started < 0.2, "refused straight away"
+            error = refused.json()["error"]
+            assert error["code"] == SERVER_BUSY and error["data"]["retry_after"] >= 1, error
+            assert refused.headers["retry-after"] == str(error["data"]["retry_after"])
+            
+            admission_stats = (await client.get("/health")).json()["stats"]["admission"]
+            assert admission_stats["active"] == 1 and admission_stats["queued"] == 1, admission_stats
+            assert admission_stats["rejected_queue_full"] == 1
+            
+            # The waiting request gives up after queue_wait, or sooner when its own timeout is shorter
+            timed_out = (await waiting).json()["error"]
+            assert timed_out["code"] == SERVER_BUSY and "0.3s" in timed_out["message"], timed_out
+            started = loop.time()
+            assert (await client.post("/mcp", json=call(4, timeout=0.1))).json()["error"]["code"] == SERVER_BUSY
+            assert loop.time() - started < 0.25
+            
+            release.set()
+            assert json.loads((await running).json()["result"]["content"][0]["text"])["success"]
+            
+            # Background jobs wait for a slot instead of being refused
+            submitted = await client.post("/jobs", json={"url": "https://www.linkedin.com/posts/x_activity-1-a"})
+            job_id = submitted.json()["job_id"]
+            for _ in range(50):
+                job = (await client.get(f"/jobs/{job_id}")).json()
+                if job["status"] not in ("queued", "running"):
+                    break
+                await asyncio.sleep(0.02)
+            assert job["status"] == "succeeded", job
+            
+            admission_stats = (await client.get("/health")).json()["stats"]["admission"]
+            assert admission_stats["rejected"] == 3 and admission_stats["active"] == 0, admission_stats
+    finally:
+        await server.jobs.aclose()
+        await server.extractor.aclose()
+    
+    print("Admission control test passed!\n")
+
+
+async def test_multi_worker_mode():
+    """Test that worker processes share the extraction and redirect caches and job state."""
+    import os
+    import sqlite3
+    import subprocess
+    import sys
+    import tempfile
+    import threading
+    import time
+    import httpx
+    import jobs
+    from mcp_server import LinkedInMCPServer, create_app
+    from progress import report_stage
+    
+    print("Testing multi-worker mode...")
+    
+    post_url = "https://www.linkedin.com/posts/someone_activity-7366052540108406785-2tgF"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        
+        # Another process extracts a post and resolves a short link...
+        script = (
+            "from cache import ExtractionCache, RedirectCache, canonical_post_key; "
+            f"ExtractionCache({path!r}).set(canonical_post_key({post_url!r}), "
+            "{'text': 'Extracted by another worker', 'link': None, 'link_img': None, 'success': True}); "
+            f"RedirectCache({path!r}).set('https://lnkd.in/abc', 'https://example.com/article')"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=60,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        
+        # ...and both are hits here
+        extractor = LinkedInExtractor(cache_path=path)
+        try:
+            result = await extractor.extract_post_text(post_url + "?utm_source=share")
+            assert result["text"] == "Extracted by another worker", result
+            assert extractor.redirect_cache.get("https://lnkd.in/abc") == "https://example.com/article"
+            assert extractor.get_stats()["cache"]["hits"] == 1
+        finally:
+            await extractor.aclose()
+        with contextlib.closing(sqlite3.connect(path)) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        
+        # Snapshots are written by a worker thread, latest state per job
+        store = jobs.JobStore(path)
+        job = jobs.Job(post_url, timeout=30)
+        for stage in ("running", "http", "playwright"):
+            job.add_event(stage)
+            store.save(job, ttl=60)
+        for _ in range(50):
+            saved = await store.aload(job.id)
+            if saved is not None and saved["stage"] == "playwright":
+                break
+            await asyncio.sleep(0.01)
+        assert saved["stage"] == "playwright", saved
+        assert not store._pending
+        
+        # A flush that is slow to get the connection can't overwrite a newer snapshot
+        class GatedLock:
+            """The first thread to enter waits at the door until released."""
+            def __init__(self, lock):
+                self.lock, self.waiting, self.release = lock, threading.Event(), threading.Event()
+            def __enter__(self):
+                if not self.waiting.is_set():
+                    self.waiting.set()
+                    self.release.wait(5)
+                return self.lock.__enter__()
+            def __exit__(self, *exc_info):
+                return self.lock.__exit__(*exc_info)
+        
+        store._lock = GatedLock(store._lock)
+        job.add_event("finished")
+        store._pending[job.id] = (json.dumps({**job.to_dict(), "stage": "stale"}), time.time() + 60)
+        slow_flush = threading.Thread(target=store.flush)
+        slow_flush.start()
+        assert store._lock.waiting.wait(5)
+        await asyncio.to_thread(store.save, job, 60)  # no event loop in that thread: flushed straight away
+        store._lock.release.set()
+        slow_flush.join(5)
+        assert store.load(job.id)["stage"] == "finished"
+        store.close()
+        
+        # A job submitted to one worker can be polled and followed through another
+        workers = [LinkedInMCPServer(cache_path=path, share_jobs=True) for _ in range(2)]
+        
+        async def slow_extract(url, timeout=None):
+            report_stage("http")
+            await asyncio.sleep(0.2)
+            return {"url": url, "text": "Post text", "success": True}
+        
+        poll_interval = jobs.STORE_POLL_INTERVAL
+        jobs.STORE_POLL_INTERVAL = 0.02
+        try:
+            for worker in workers:
+                worker.extractor.extract_post_text = slow_extract
+            first, second = (
+                httpx.AsyncClient(transport=httpx.ASGITransport(app=worker.app), base_url="http://test")
+                for worker in workers
+            )
+            async with first, second:
+                job_id = (await first.post("/jobs", json={"url": post_url})).json()["job_id"]
+                await asyncio.sleep(0.05)
+                job = (await second.get(f"/jobs/{job_id}")).json()
+                assert job["status"] == "running" and job["stage"] == "http", job
+                
+                body = (await asyncio.wait_for(second.get(f"/jobs/{job_id}/events"), timeout=5)).text
+                assert body.count("event: stage") == 4 and "event: result" in body, body
+                assert (await second.get(f"/jobs/{job_id}")).json()["result"]["text"] == "Post text"
+                
+                health = [(await client.get("/health")).json() for client in (first, second)]
+                assert health[0]["worker_pid"] == os.getpid()
+                assert health[0]["stats"]["jobs"]["submitted"] == 1
+                assert health[1]["stats"]["jobs"]["submitted"] == 0
+        finally:
+            jobs.STORE_POLL_INTERVAL = poll_interval
+            for worker in workers:
+                await worker.jobs.aclose()
+                await worker.extractor.aclose()
+        
+        assert create_app(cache_path=None).title == "LinkedIn Post Text Extractor MCP Server"
+    
+    print("Multi-worker mode test passed!\n")
+
+
 async def run_all_tests():
     """Run all tests."""
     print("=" * 60)
@@ -108,7 +1560,31 @@ async def run_all_tests():
         await test_url_validation()
         await test_extraction_with_invalid_url()
         await test_extraction_with_nonexistent_post()
+        await test_extract_many()
+        await test_hedged_extraction()
+        await test_deadline()
+        await test_request_coalescing()
+        await test_rate_limiter()
+        await test_browser_pool()
+        await test_playwright_harvest()
+        await test_extraction_cache()
+        await test_redirect_cache()
+        await test_extraction_plan()
+        await test_head_metadata()
+        await test_streaming_fetch()
         await test_mcp_server_import()
+        await test_lazy_imports()
+        await test_stdio_concurrent_dispatch()
+        await test_stdio_transport()
+        await test_debug_server_logging()
+        await test_dispatch_core()
+        await test_jsonrpc_batch()
+        await test_posts_batch_tool()
+        await test_serialization()
+        await test_extraction_jobs()
+        await test_coalesced_jobs()
+        await test_admission_control()
+        await test_multi_worker_mode()
         
         print("=" * 60)
         print("ALL TESTS PASSED! ✅")